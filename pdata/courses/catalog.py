@@ -0,0 +1,327 @@
+# pdata/courses/catalog.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Binary index of the catalog, shared between processes by mmap.
+
+import typing
+import os
+import re
+import mmap
+import bisect
+import struct
+import collections
+
+from django.conf import settings
+from django.db import transaction
+
+from pdata import versions, files
+from courses import models
+
+# An index is a header, the table of contents of its tables, then each table:
+# a sorted array of fixed-width records (a key, then a value). Strings are
+# stored in a separate table of UTF-8 bytes, which records refer to by offset
+# and length. All integers are big-endian.
+#
+#   header:    magic (4s), format (H), dataset version (I), tables (I)
+#   contents:  per table: name (4s), number of records (I), offset (I)
+
+MAGIC = b'PDCI'
+FORMAT = 1
+
+_HEADER = struct.Struct('>4sHII')
+_CONTENTS = struct.Struct('>4sII')
+
+#: Table of an index: its name, and the format of the key and the value of its
+#: records.
+Table = collections.namedtuple('Table', ('name', 'key', 'value'))
+
+#: Courses by code (department, number, letter): ID, and offset and length of
+#: the title.
+COURSES = Table(b'CRSE', '3sH1s', 'IIH')
+#: Crosslistings by code: ID of the course.
+CROSSLISTINGS = Table(b'XLST', '3sH1s', 'I')
+#: Sections by (term ID, class number): ID, offering ID, course ID, and
+#: section (such as 'L01').
+SECTIONS = Table(b'SECT', 'II', 'III3s')
+#: Strings which records refer to.
+STRINGS = Table(b'STRS', '', 's')
+
+#: Course found in an index.
+Course = collections.namedtuple('Course', ('id', 'title'))
+#: Section found in an index.
+Section = collections.namedtuple('Section',
+  ('id', 'offering_id', 'course_id', 'section'))
+
+#: Index file, such as 'catalog-12.idx' for version 12 of the dataset.
+_INDEX = re.compile(r'^catalog-(?P<version>\d+)\.idx$')
+
+def _code(
+    department: str,
+    number: int,
+    letter: str
+    ) -> typing.Tuple[bytes, int, bytes]:
+  '''
+  Get the key of a course code, as it is read from an index.
+
+  :param department: department, such as 'COS'
+  :param number: number, such as 126
+  :param letter: letter, such as 'A' (or '')
+
+  :return: key, such as (b'COS', 126, b'\x00')
+  '''
+  return (department.encode('ascii').ljust(3, b'\0'), number,
+    letter.encode('ascii').ljust(1, b'\0'))
+
+def build(version: int) -> bytes:
+  '''
+  Build an index of the catalog.
+
+  :param version: version of the dataset, which the index is tagged with
+
+  :return: index
+  '''
+  strings = bytearray()
+  def string(value: str) -> typing.Tuple[int, int]:
+    encoded = value.encode('utf-8')
+    strings.extend(encoded)
+    return (len(strings) - len(encoded), len(encoded))
+
+  rows = {
+    COURSES: [_code(department, number, letter) + (course_id, *string(title))
+      for (course_id, department, number, letter, title)
+      in models.Course.objects.values_list('id', 'department', 'number',
+        'letter', 'title')],
+    CROSSLISTINGS: [_code(department, number, letter) + (course_id,)
+      for (course_id, department, number, letter)
+      in models.CrossListing.objects.values_list('course_id', 'department',
+        'number', 'letter')],
+    SECTIONS: [(term_id, number, section_id, offering_id, course_id,
+        section.encode('utf-8'))
+      for (term_id, number, section_id, offering_id, course_id, section)
+      in models.Section.objects.values_list('offering__semester__term_id',
+        'number', 'id', 'offering_id', 'offering__course_id',
+        'section_id')],
+    }
+
+  tables = [COURSES, CROSSLISTINGS, SECTIONS, STRINGS]
+  offset = _HEADER.size + _CONTENTS.size * len(tables)
+  contents = []
+  content = []
+  for table in tables:
+    if table is STRINGS:
+      data = bytes(strings)
+    else:
+      record = struct.Struct('>' + table.key + table.value)
+      data = b''.join(record.pack(*row) for row in sorted(rows[table]))
+    contents.append(_CONTENTS.pack(table.name,
+      len(data) // struct.calcsize('>' + table.key + table.value), offset))
+    content.append(data)
+    offset += len(data)
+
+  return b''.join([_HEADER.pack(MAGIC, FORMAT, version, len(tables)),
+    *contents, *content])
+
+class _Records(object):
+  '''
+  Sorted records of a table of an index, read in place. Records are a
+  sequence of their keys, so that they may be searched with `bisect`.
+
+  :param buffer: index
+  :param table: table
+  :param offset: offset of the first record
+  :param count: number of records
+  '''
+  def __init__(self,
+      buffer: mmap.mmap,
+      table: Table,
+      offset: int,
+      count: int
+      ) -> None:
+    self.buffer = buffer
+    self.offset = offset
+    self.count = count
+    self.key = struct.Struct('>' + table.key)
+    self.value = struct.Struct('>' + table.value)
+    self.size = self.key.size + self.value.size
+
+  def __len__(self) -> int:
+    return self.count
+
+  def __getitem__(self, i: int) -> tuple:
+    return self.key.unpack_from(self.buffer, self.offset + i * self.size)
+
+  def find(self, key: tuple) -> typing.Iterator[tuple]:
+    '''
+    Find the records with a key.
+
+    :param key: key
+
+    :return: iterator of the value of each record with the key
+    '''
+    i = bisect.bisect_left(self, key)
+    while i < self.count and self[i] == key:
+      yield self.value.unpack_from(self.buffer,
+        self.offset + i * self.size + self.key.size)
+      i += 1
+
+class CatalogIndex(object):
+  '''
+  Index of the catalog, read from a file mapped into memory. Every process
+  mapping the same file shares a single copy of it (in the page cache), and
+  records are read from it in place, by binary search.
+
+  :param path: path of the index
+
+  :raise ValueError: if the file is not an index
+  '''
+  def __init__(self, path: str) -> None:
+    with open(path, 'rb') as f:
+      self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, self.version, count = _HEADER.unpack_from(self.buffer)
+    if magic != MAGIC or version != FORMAT:
+      raise ValueError('%s is not a catalog index (format %d)' % (path,
+        FORMAT))
+
+    self.path = path
+    self.tables = {}
+    for i in range(count):
+      name, records, offset = _CONTENTS.unpack_from(self.buffer,
+        _HEADER.size + i * _CONTENTS.size)
+      self.tables[name] = (records, offset)
+
+    self._courses = self._records(COURSES)
+    self._crosslistings = self._records(CROSSLISTINGS)
+    self._sections = self._records(SECTIONS)
+    self._strings = self.tables[STRINGS.name][1]
+
+  def _records(self, table: Table) -> _Records:
+    count, offset = self.tables[table.name]
+    return _Records(self.buffer, table, offset, count)
+
+  def _string(self, offset: int, length: int) -> str:
+    start = self._strings + offset
+    return self.buffer[start:start + length].decode('utf-8')
+
+  def course(self,
+      department: str,
+      number: int,
+      letter: str = ''
+      ) -> typing.Optional[Course]:
+    '''
+    Find a course by its code.
+
+    :param department: department, such as 'COS'
+    :param number: number, such as 126
+    :param letter: letter, such as 'A' (default: none)
+
+    :return: course, or None if there is none
+    '''
+    for (course_id, offset, length) in self._courses.find(
+        _code(department, number, letter)):
+      return Course(course_id, self._string(offset, length))
+    return None
+
+  def crosslisted(self,
+      department: str,
+      number: int,
+      letter: str = ''
+      ) -> typing.List[int]:
+    '''
+    Find the courses which are crosslisted under a code.
+
+    :param department: department, such as 'MAT'
+    :param number: number, such as 375
+    :param letter: letter, such as 'A' (default: none)
+
+    :return: IDs of the courses
+    '''
+    return [course_id for (course_id,) in self._crosslistings.find(
+      _code(department, number, letter))]
+
+  def section(self, term_id: int, number: int) -> typing.Optional[Section]:
+    '''
+    Find a section by its class number.
+
+    :param term_id: term ID of the semester
+    :param number: class number, such as 40160
+
+    :return: section, or None if there is none
+    '''
+    for (section_id, offering_id, course_id, section) in self._sections.find(
+        (term_id, number)):
+      return Section(section_id, offering_id, course_id,
+        section.rstrip(b'\0').decode('utf-8'))
+    return None
+
+def _link() -> str:
+  return os.path.join(settings.COURSES_CATALOG_INDEX_DIR, 'catalog.idx')
+
+def write() -> typing.Optional[str]:
+  '''
+  Write an index of the current catalog, tagged with the dataset's version.
+  The index is written to a temporary file, which is renamed once complete,
+  then the current index's link is atomically replaced to point to it (see
+  `pdata.files.publish`). Processes which mapped an older index keep reading
+  it until they next call `get`.
+
+  :return: path of the index, or None if the dataset has no version (or the
+    index is disabled)
+  '''
+  if settings.COURSES_CATALOG_INDEX_DIR is None:
+    return None
+
+  from courses import data
+
+  with transaction.atomic():
+    version = versions.get(data.DATASET)
+    if version is None:
+      return None
+    content = build(version.version)
+
+  os.makedirs(settings.COURSES_CATALOG_INDEX_DIR, exist_ok=True)
+  path = os.path.join(settings.COURSES_CATALOG_INDEX_DIR,
+    'catalog-%d.idx' % version.version)
+  with files.atomic_write(path) as f:
+    f.write(content)
+  files.publish(path, _link(), _INDEX)
+  return path
+
+_current = None
+
+def get() -> typing.Optional[CatalogIndex]:
+  '''
+  Get the current index of the catalog, without querying the database. The
+  index is mapped on first use, and remapped once a newer index is written.
+
+  The index is written once each update of the catalog is committed, so it
+  may briefly lag behind the database.
+
+  :return: index, or None if none was written
+  '''
+  global _current
+
+  if settings.COURSES_CATALOG_INDEX_DIR is None:
+    return None
+
+  # The index may be replaced (and removed) between reading the link and
+  # mapping its target, in which case the new link is read.
+  for _ in range(3):
+    name = files.published(_link())
+    if name is None:
+      return None
+
+    current = _current
+    path = os.path.join(settings.COURSES_CATALOG_INDEX_DIR, name)
+    if current is not None and current.path == path:
+      return current
+
+    try:
+      # The previous index is unmapped once no lookup refers to it.
+      _current = CatalogIndex(path)
+    except FileNotFoundError:
+      continue
+    return _current
+
+  return None
@@ -0,0 +1,172 @@
+# pdata/courses/conflicts.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Detection of time conflicts between sections.
+
+import typing
+import heapq
+import datetime
+import collections
+
+from pdata.versions import VersionedIndex
+from courses import models, data
+
+#: Conflict between two meetings, on a day, from `start` to `end`.
+Conflict = collections.namedtuple('Conflict',
+  ('day', 'sections', 'start', 'end'))
+
+#: Minutes in each slot of the week which meetings are encoded in (see
+#: `mask`).
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+def mask(day: int, start: datetime.time, end: datetime.time) -> int:
+  '''
+  Encode a meeting as a bitmask of the slots of the week which it occupies,
+  so that meetings may only overlap if their masks intersect. A meeting
+  occupies every slot which it overlaps at all, so meetings which share a
+  slot without overlapping (such as one ending at 10:52, and another
+  starting at 10:53) are considered to conflict.
+
+  :param day: day of the week (see `models.Meeting.day`)
+  :param start: start time
+  :param end: end time
+
+  :return: bitmask
+  '''
+  first = (start.hour * 60 + start.minute) // SLOT_MINUTES
+  last = -(-(end.hour * 60 + end.minute) // SLOT_MINUTES)
+  if last <= first:
+    return 0
+  return ((1 << (last - first)) - 1) << (day * SLOTS_PER_DAY + first)
+
+class MeetingIndex(object):
+  '''
+  Index of a semester's meetings, by section. Each section's meetings are
+  kept as (day, start, end) intervals, so that conflicts between sections
+  are found by sweeping over their intervals (see `conflicts`) rather than by
+  comparing every pair of meetings. Each section's meetings are also encoded
+  as a bitmask (see `mask`), so that whether two sections conflict is
+  checked with a single AND.
+
+  :param sections: (section ID, class number) of each section
+  :param meetings: (section ID, day, start time, end time) of each meeting
+  '''
+  def __init__(self,
+      sections: typing.Iterable[typing.Tuple[int, int]],
+      meetings: typing.Iterable[typing.Tuple]
+      ) -> None:
+    # Map of class number to section ID.
+    self.class_numbers = {}
+    # Map of section ID to its (day, start, end) intervals.
+    self.meetings = {}
+    # Map of section ID to the bitmask of its meetings.
+    self.masks = {}
+
+    for (section_id, number) in sections:
+      self.class_numbers[number] = section_id
+      self.meetings[section_id] = []
+      self.masks[section_id] = 0
+    for (section_id, day, start, end) in meetings:
+      self.meetings[section_id].append((day, start, end))
+      self.masks[section_id] |= mask(day, start, end)
+
+  @classmethod
+  def build(cls, scope: str) -> 'MeetingIndex':
+    '''
+    Build the index of a semester's meetings.
+
+    :param scope: version scope of the semester's meetings (see
+      `data.meetings_scope`)
+
+    :return: index
+    '''
+    term_id = int(scope.partition('/')[0])
+    return cls(
+      (models.Section.objects
+        .filter(offering__semester__term_id=term_id)
+        .values_list('id', 'number')),
+      (models.Meeting.objects
+        .filter(section__offering__semester__term_id=term_id)
+        .values_list('section_id', 'day', 'start_time', 'end_time')))
+
+  def resolve(self,
+      section_ids: typing.Iterable[int] = (),
+      class_numbers: typing.Iterable[int] = ()
+      ) -> typing.Tuple[typing.List[int], typing.List[int]]:
+    '''
+    Resolve sections of the semester by ID or class number.
+
+    :param section_ids: IDs of sections
+    :param class_numbers: class numbers of sections
+
+    :return: IDs of the sections found (without duplicates, in the order
+      given), and the IDs and class numbers which were not found
+    '''
+    found = collections.OrderedDict()
+    missing = []
+
+    for section_id in section_ids:
+      if section_id in self.meetings:
+        found[section_id] = None
+      else:
+        missing.append(section_id)
+
+    for number in class_numbers:
+      if number in self.class_numbers:
+        found[self.class_numbers[number]] = None
+      else:
+        missing.append(number)
+
+    return list(found), missing
+
+  def conflicts(self, section_ids: typing.Iterable[int]) -> typing.List[
+      Conflict]:
+    '''
+    Find every pair of sections whose meetings overlap. Meetings which end
+    when another starts do not conflict, nor do meetings of the same
+    section.
+
+    :param section_ids: IDs of sections of the semester (see `resolve`)
+
+    :return: conflicts, ordered by day and start time
+    '''
+    # Intervals of each day, as (start, end, section ID).
+    days = collections.defaultdict(list)
+    for section_id in set(section_ids):
+      for (day, start, end) in self.meetings[section_id]:
+        days[day].append((start, end, section_id))
+
+    found = []
+    for day, intervals in sorted(days.items()):
+      intervals.sort()
+      # Heap of the (end, start, section ID) of the meetings which have
+      # started, and have not ended, by the current start time.
+      active = []
+      for (start, end, section_id) in intervals:
+        while active and active[0][0] <= start:
+          heapq.heappop(active)
+
+        for (other_end, _, other_id) in active:
+          if other_id != section_id:
+            found.append(Conflict(day, tuple(sorted((section_id, other_id))),
+              start, min(end, other_end)))
+
+        heapq.heappush(active, (end, start, section_id))
+
+    found.sort(key=lambda c: (c.day, c.start, c.end, c.sections))
+    return found
+
+# Indexes are built per semester, and rebuilt once its meetings change.
+_index = VersionedIndex(data.DATASET, MeetingIndex.build)
+
+def get_index(term_id: int) -> MeetingIndex:
+  '''
+  Get the index of the current meetings of a semester.
+
+  :param term_id: term ID of the semester
+
+  :return: index
+  '''
+  return _index.get(data.meetings_scope(term_id))
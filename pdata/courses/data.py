@@ -13,52 +13,124 @@ import datetime
 
 from django.db import transaction
 
+from pdata import metrics, versions
 from pdata.data import DataProvider
+from pdata.schedules import AdaptiveSchedule, has_changes
 from pdata.utils import bulk_upsert
-from courses import models
+from courses import models, snapshots, catalog, feed, history
 
 BASE_URL = 'https://etcweb.princeton.edu/webfeeds/courseofferings/?term={term}&subject=all&fmt=json'
 LOGGER = logging.getLogger('pdata.courses')
 
+#: Name of the dataset, whose version is bumped by changes to its data.
+DATASET = 'courses'
+
+#: Version scope of the codes of courses and crosslistings, which is only
+#: bumped when courses or crosslistings change.
+CODES_SCOPE = 'codes'
+
+#: Length of the add/drop period, starting from the first day of a semester.
+ADD_DROP_PERIOD = datetime.timedelta(days=14)
+
+def meetings_scope(term_id: typing.Union[int, str]) -> str:
+  '''
+  Get the version scope of a term's meetings. Unlike the term's own scope,
+  it is only bumped when sections are added or removed, or meetings change,
+  rather than whenever enrollment changes.
+
+  :param term_id: term ID of the semester
+
+  :return: scope, such as '1184/meetings'
+  '''
+  return '%s/meetings' % term_id
+
 class CourseDataProvider(DataProvider):
   '''
   Course dataset definition.
   '''
+  #: Enrollment data is the most time-sensitive of all datasets.
+  priority = 10
+
   @property
   def tasks(self) -> typing.List[dict]:
     return [
       {
-        'task': 'fetch_and_update_term_data',
+        'task': 'courses.data.update_term',
+        'kwargs': {'term': 'current'},
         'schedule': 60,
-        }
+        'adaptive': AdaptiveSchedule(60, 60 * 60,
+          windows=registration_windows),
+        },
+      {
+        'task': 'courses.history.downsample',
+        'schedule': 24 * 60 * 60,
+        },
       ]
 
+def registration_windows() -> typing.List[typing.Tuple[
+    datetime.date, datetime.date]]:
+  '''
+  Get the registration periods of all semesters, during which enrollment
+  changes constantly. Currently, this is the add/drop period at the start of
+  each semester.
+
+  :return: inclusive (start, end) date pairs of each registration period
+  '''
+  return [(start_date, start_date + ADD_DROP_PERIOD)
+    for start_date in models.Semester.objects.values_list(
+      'start_date', flat=True)]
+
 def update_term(
     term: typing.Union[str, int] = 'current'
-    ) -> None:
+    ) -> typing.Optional[typing.Dict[str, typing.Dict[str, int]]]:
   '''
   Fetch the data associated with the given term.
 
   :param term: term to obtain and update
+
+  :return: number of objects changed per model (see `update_term_data`), or
+    None if the data could not be fetched
   '''
   url = BASE_URL.format(term=term)
 
-  try:
-    req = urllib.request.urlopen(url)
-  except urllib.error.URLError as e:
-    LOGGER.error('Could not fetch term data: %s' % str(e))
-    return None
-  
-  data = json.load(req)
-  update_term_data(data)
+  with metrics.phase('fetch'):
+    try:
+      req = urllib.request.urlopen(url)
+      body = req.read()
+    except urllib.error.URLError as e:
+      LOGGER.error('Could not fetch term data: %s' % str(e))
+      metrics.fail('Could not fetch term data: %s' % str(e))
+      return None
+
+  metrics.add_bytes(len(body))
+
+  # Writes are timed separately, by `bulk_upsert`.
+  with metrics.phase('transform'):
+    data = json.loads(body)
+    return update_term_data(data)
 
 @transaction.atomic
-def update_term_data(data: dict) -> None:
+def update_term_data(data: dict) -> typing.Dict[str, typing.Dict[str, int]]:
   '''
   Update a term's data, if present, with new information. If not present, the
-  data is created. This is performed atomically.
+  data is created. This is performed atomically, and bumps the version of
+  the dataset and of the term if any object changed (and that of the term's
+  meetings, if they changed). The term's offerings, sections, and meetings
+  which are no longer listed are deleted. Created and changed objects are
+  tagged with the new version, and deleted objects recorded as tombstones
+  (see `pdata.models.Versioned`). The search index is rebuilt, and the
+  version of the course codes bumped, if any course or crosslisting changed.
+  The term's snapshot and the catalog index are rewritten once the update is
+  committed (see `snapshots.write` and `catalog.write`). Changes to the
+  enrollment of sections are recorded in their feed and their history (see
+  `feed.record` and `history.append`). Both are kept when a section is
+  deleted, and a section which is listed again is recreated with the same
+  ID.
 
   :param data: term data retrieved from webfeeds
+
+  :return: number of objects created, updated, and deleted, per model. For
+    example, {'section': {'created': 0, 'updated': 2, 'deleted': 0}, ...}
   '''
   # Updates are performed in the following order. All updates are performed
   # in bulk, as possible.
@@ -81,30 +153,83 @@ def update_term_data(data: dict) -> None:
   try:
     term_info = data['term'][0]
   except IndexError:
-    return
+    return {}
+
+  changes = {}
+  version = versions.reserve(DATASET)
 
   # 1.
-  term, _ = models.Semester.objects.update_or_create(
-    term_id=term_info['code'],
-    defaults={
+  changes['semester'] = _count_changes(bulk_upsert(
+    models.Semester.objects.filter(term_id=term_info['code']),
+    lambda d: hash(int(d['term_id'])),
+    [{
+      'term_id': term_info['code'],
       'term': (models.Semester.TERM_FALL if 'F' in term_info['suffix']
         else models.Semester.TERM_SPRING),
       'year': int(term_info['suffix'][1:]),
       'start_date': term_info['start_date'],
       'end_date': term_info['end_date']
-      })
+      }],
+    version=version))
+  term = models.Semester.objects.get(term_id=term_info['code'])
 
   # 2. and 3.
-  _update_instructors_and_courses(term_info['subjects'])
+  changes.update(_update_instructors_and_courses(term_info['subjects'],
+    version))
 
   # 4.
-  _update_crosslistings(term_info['subjects'])
+  changes.update(_update_crosslistings(term_info['subjects'], version))
 
   # 5.
-  _update_offerings(term_info['subjects'], term)
+  changes.update(_update_offerings(term_info['subjects'], term, version))
 
   # 6.
-  _update_sections(term_info['subjects'], term)
+  states = feed.section_states(term)
+  changes.update(_update_sections(term_info['subjects'], term, version))
+  history.append(term, feed.record(term, states))
+
+  codes_changed = has_changes({m: changes[m]
+    for m in ('course', 'crosslisting')})
+  if codes_changed:
+    # Imported here because the search index is keyed on this module's
+    # scopes, so it imports this module.
+    from courses import search
+    search.rebuild()
+
+  if has_changes(changes):
+    scopes = [str(term.term_id)]
+    if codes_changed:
+      scopes.append(CODES_SCOPE)
+    if (has_changes({'meeting': changes['meeting']})
+        or changes['section']['created'] or changes['section']['deleted']):
+      scopes.append(meetings_scope(term.term_id))
+    # The version was reserved above, so this allocates the same one.
+    versions.bump(DATASET, scopes=scopes)
+
+  # The snapshot and the catalog index are read from the committed data, so
+  # they are only written once the update is.
+  if has_changes(changes) or snapshots.current_version(term.term_id) is None:
+    transaction.on_commit(lambda: snapshots.write(term.term_id))
+  if has_changes(changes) or catalog.get() is None:
+    transaction.on_commit(catalog.write)
+
+  return changes
+
+def _count_changes(
+    result: typing.Dict[str, typing.Set[str]]
+    ) -> typing.Dict[str, int]:
+  '''
+  Count the objects created, updated, and deleted by a `bulk_upsert`.
+
+  :param result: result of `bulk_upsert`
+
+  :return: number of objects created, updated, and deleted
+  '''
+  return {
+    'created': len(result['created']),
+    'updated': len(result['updated']),
+    'deleted': len(result['deleted']),
+    }
 
 def _get_course_pk_map(**kwargs) -> typing.Dict[str, int]:
   '''
@@ -120,11 +245,17 @@ def _get_course_pk_map(**kwargs) -> typing.Dict[str, int]:
     .values_list('number', 'letter', 'id'))
   return {('%d%s' % (num, ltr)): pk for (num, ltr, pk) in courses}
 
-def _update_instructors_and_courses(subject_data: typing.List[dict]) -> None:
+def _update_instructors_and_courses(
+    subject_data: typing.List[dict],
+    version: int
+    ) -> typing.Dict[str, typing.Dict[str, int]]:
   '''
   Update all of the instructors and courses, for all departments.
 
   :param subject_data: all subject data
+  :param version: version of the dataset made by the update
+
+  :return: number of instructors and courses changed
   '''
   expected_emplid = set()
   expected_employees = []
@@ -164,22 +295,35 @@ def _update_instructors_and_courses(subject_data: typing.List[dict]) -> None:
             })
           expected_emplid.add(instructor_info['emplid'])
 
-  bulk_upsert(
+  instructors = bulk_upsert(
     models.Instructor.objects.all(),
     lambda d: hash(d['employee_id']),
     expected_employees,
+    version=version,
     )
 
-  bulk_upsert(
+  courses = bulk_upsert(
     models.Course.objects.all(),
     lambda d: hash('%s%d%s' % (d['department'], d['number'], d['letter'])),
-    expected_courses)
+    expected_courses,
+    version=version)
 
-def _update_crosslistings(subject_data: typing.List[dict]) -> None:
+  return {
+    'instructor': _count_changes(instructors),
+    'course': _count_changes(courses),
+    }
+
+def _update_crosslistings(
+    subject_data: typing.List[dict],
+    version: int
+    ) -> typing.Dict[str, typing.Dict[str, int]]:
   '''
   Update all subjects' crosslistings for all of their courses.
 
   :param subject_data: all subject data
+  :param version: version of the dataset made by the update
+
+  :return: number of crosslistings changed
   '''
   pk_map = _get_course_pk_map()
   expected = []
@@ -200,23 +344,31 @@ def _update_crosslistings(subject_data: typing.List[dict]) -> None:
           'course_id': course_pk,
           })
 
-  bulk_upsert(
+  crosslistings = bulk_upsert(
     models.CrossListing.objects.all(),
     lambda d: hash('%s%d%s-%d' % (
       d['department'], d['number'], d['letter'], d['course_id'])),
-    expected
+    expected,
+    version=version,
     )
 
+  return {'crosslisting': _count_changes(crosslistings)}
+
 def _update_offerings(
     subject_data: typing.List[dict],
-    semester: models.Semester
-    ) -> None:
+    semester: models.Semester,
+    version: int
+    ) -> typing.Dict[str, typing.Dict[str, int]]:
   '''
   Update all subjects' courses' offerings for all of the courses in that
   subject. This includes registering the many-to-many relationship between
-  instructors and offerings.
+  instructors and offerings. Offerings whose instructors changed are tagged
+  with the new version, as their instructors are part of them.
 
   :param subject_data: all subject data
+  :param version: version of the dataset made by the update
+
+  :return: number of offerings and instructor-offering relationships changed
   '''
   pk_map = _get_course_pk_map()
   expected_offerings = []
@@ -240,10 +392,12 @@ def _update_offerings(
           'end_date': arbitrary_class['schedule']['end_date'],
           })
 
-  bulk_upsert(
-    models.Offering.objects.all(),
+  offerings = bulk_upsert(
+    models.Offering.objects.filter(semester=semester),
     lambda d: hash('%d-%d' % (d['semester_id'], d['course_id'])),
-    expected_offerings
+    expected_offerings,
+    delete=True,
+    version=version,
     )
 
   # Create all of the m2m relationships between courses and instructors.
@@ -267,22 +421,42 @@ def _update_offerings(
             })
 
   m2m_model = models.Offering.instructor.through
-  bulk_upsert(
-    m2m_model.objects.all(),
+  existing_instructor_m2m = set(m2m_model.objects
+    .filter(offering__semester=semester)
+    .values_list('offering_id', 'instructor_id'))
+  offering_instructors = bulk_upsert(
+    m2m_model.objects.filter(offering__semester=semester),
     lambda d: hash('%d-%d' % (d['instructor_id'], d['offering_id'])),
-    expected_instructor_m2m
+    expected_instructor_m2m,
+    delete=True,
     )
 
+  changed_offerings = {offering_pk for (offering_pk, _) in
+    existing_instructor_m2m.symmetric_difference(
+      (d['offering_id'], d['instructor_id']) for d in expected_instructor_m2m)}
+  if changed_offerings:
+    models.Offering.objects.filter(pk__in=changed_offerings).update(
+      version=version)
+
+  return {
+    'offering': _count_changes(offerings),
+    'offering_instructor': _count_changes(offering_instructors),
+    }
+
 def _update_sections(
     subject_data: typing.List[dict],
-    semester: models.Semester
-    ) -> None:
+    semester: models.Semester,
+    version: int
+    ) -> typing.Dict[str, typing.Dict[str, int]]:
   '''
   Update all subjects' courses' sections. This does *not* include meeting
   times, which depend upon sections and locations; however, it does include
   the locations themselves.
 
   :param subject_data: all subject data
+  :param version: version of the dataset made by the update
+
+  :return: number of sections and meetings changed
   '''
   offering_pk_map = dict(
     models.Offering.objects
@@ -303,20 +477,27 @@ def _update_sections(
         offering_pk = offering_pk_map[int(course_info['guid'])]
 
         for section_info in course_info['classes']:
+          capacity = int(section_info['capacity'])
+          enrollment = int(section_info['enrollment'])
           expected_sections.append({
             'offering_id': offering_pk,
             'number': int(section_info['class_number']),
             'section_id': section_info['section'],
             'status': status_map[section_info['status'].lower()],
-            'capacity': int(section_info['capacity']),
-            'enrollment': int(section_info['enrollment']),
+            'capacity': capacity,
+            'enrollment': enrollment,
+            'has_open_seats': enrollment < capacity,
             })
 
-  bulk_upsert(
-    models.Section.objects.all(),
+  restored = _restore_section_ids(semester, expected_sections)
+  sections = bulk_upsert(
+    models.Section.objects.filter(offering__semester=semester),
     lambda d: hash('%d-%d' % (d['offering_id'], d['number'])),
     expected_sections,
+    delete=True,
+    version=version,
     )
+  versions.restore(models.Section, restored)
 
   day_map = {
     'm': models.Meeting.DAY_MONDAY,
@@ -352,12 +533,59 @@ def _update_sections(
                 'day': day_map[day.lower()],
                 })
 
-  bulk_upsert(
-    models.Meeting.objects.all(),
+  meetings = bulk_upsert(
+    models.Meeting.objects.filter(section__offering__semester=semester),
     lambda d: hash('%d-%d-%d' % (d['section_id'], d['number'], d['day'])),
-    expected_meetings
+    expected_meetings,
+    delete=True,
+    version=version,
     )
 
+  return {
+    'section': _count_changes(sections),
+    'meeting': _count_changes(meetings),
+    }
+
+def _restore_section_ids(
+    semester: models.Semester,
+    expected_sections: typing.List[dict]
+    ) -> typing.List[int]:
+  '''
+  Give sections which are listed again, after a sync deleted them, the IDs
+  they had before, so that their history and changes (which are kept, see
+  `models.EnrollmentHistory`) still refer to them. Sections are identified
+  by their class number, which is unique within a term.
+
+  :param semester: semester of the sections
+  :param expected_sections: expected sections (see `_update_sections`),
+    which are updated with their previous IDs
+
+  :return: IDs given to the sections
+  '''
+  existing = {(offering_id, number): pk
+    for (pk, offering_id, number) in models.Section.objects
+      .filter(offering__semester=semester)
+      .values_list('id', 'offering_id', 'number')}
+
+  # IDs which are still in use are not given out again, such as that of a
+  # section moved to another offering (which is only deleted once its
+  # replacement is created). The latest history of each number is used.
+  in_use = set(existing.values())
+  previous = {number: pk for (number, pk) in models.EnrollmentHistory.objects
+    .filter(term_id=semester.term_id)
+    .order_by('last_at')
+    .values_list('number', 'section_id')
+    if pk not in in_use}
+
+  restored = []
+  for section in expected_sections:
+    pk = previous.get(section['number'])
+    if (pk is not None
+        and (section['offering_id'], section['number']) not in existing):
+      section['id'] = pk
+      restored.append(pk)
+  return restored
+
 def _parse_time(time_str: str, fmt: str = '%I:%M %p') -> datetime.time:
   '''
   Parse a provided time string into a datetime.time object.
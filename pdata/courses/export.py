@@ -0,0 +1,189 @@
+# pdata/courses/export.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Streaming export of a semester's sections and meetings.
+
+import typing
+import io
+import csv
+import json
+import zlib
+import datetime
+import collections
+
+from courses import models
+
+#: Exported table: its model, the lookup of its semester's term ID, and the
+#: (name, lookup) of each of its columns.
+Table = collections.namedtuple('Table', ('model', 'semester', 'columns'))
+
+_COURSE_COLUMNS = (
+  ('course_id', 'offering__course_id'),
+  ('department', 'offering__course__department'),
+  ('number', 'offering__course__number'),
+  ('letter', 'offering__course__letter'),
+  )
+
+#: Exported tables, with the course of each row denormalized into it.
+TABLES = {
+  'sections': Table(models.Section, 'offering__semester__term_id', (
+    ('id', 'id'),
+    ('class_number', 'number'),
+    ('section', 'section_id'),
+    ('status', 'status'),
+    ('capacity', 'capacity'),
+    ('enrollment', 'enrollment'),
+    ) + _COURSE_COLUMNS + (
+    ('title', 'offering__course__title'),
+    )),
+  'meetings': Table(models.Meeting, 'section__offering__semester__term_id', (
+    ('id', 'id'),
+    ('section_id', 'section_id'),
+    ('class_number', 'section__number'),
+    ('section', 'section__section_id'),
+    ) + tuple((name, 'section__' + lookup)
+      for (name, lookup) in _COURSE_COLUMNS) + (
+    ('day', 'day'),
+    ('start_time', 'start_time'),
+    ('end_time', 'end_time'),
+    ('building', 'building'),
+    ('room', 'room'),
+    )),
+  }
+
+#: Content type of each format.
+CONTENT_TYPES = {
+  'ndjson': 'application/x-ndjson',
+  'csv': 'text/csv; charset=utf-8',
+  }
+
+def read_chunks(
+    table: Table,
+    term_id: int,
+    chunk_size: int
+    ) -> typing.Iterator[typing.List[tuple]]:
+  '''
+  Read the rows of a semester's table in chunks. Each chunk is a range query
+  on the primary key, after the last row of the previous chunk, so that no
+  more than one chunk is held in memory, whether or not the database
+  supports chunked reads (SQLite does not).
+
+  :param table: table to read
+  :param term_id: term ID of the semester
+  :param chunk_size: number of rows per chunk
+
+  :return: iterator of chunks of rows, with the columns of the table
+  '''
+  queryset = (table.model.objects
+    .filter(**{table.semester: term_id})
+    .order_by('id')
+    .values_list(*(lookup for (_, lookup) in table.columns)))
+
+  last = None
+  while True:
+    page = queryset if last is None else queryset.filter(id__gt=last)
+    rows = list(page[:chunk_size])
+    if not rows:
+      return
+    yield rows
+    if len(rows) < chunk_size:
+      return
+    last = rows[-1][0]
+
+def _value(value: typing.Any) -> typing.Any:
+  '''
+  Convert a value to its exported form.
+
+  :param value: value read from the database
+
+  :return: exported value
+  '''
+  if isinstance(value, (datetime.date, datetime.time)):
+    return value.isoformat()
+  return value
+
+def ndjson(
+    table: Table,
+    chunks: typing.Iterable[typing.List[tuple]]
+    ) -> typing.Iterator[str]:
+  '''
+  Encode rows as newline-delimited JSON objects.
+
+  :param table: table of the rows
+  :param chunks: chunks of rows (see `read_chunks`)
+
+  :return: iterator of the encoded chunks
+  '''
+  names = [name for (name, _) in table.columns]
+  for rows in chunks:
+    yield ''.join(json.dumps(dict(zip(names, map(_value, row)))) + '\n'
+      for row in rows)
+
+def csv_lines(
+    table: Table,
+    chunks: typing.Iterable[typing.List[tuple]]
+    ) -> typing.Iterator[str]:
+  '''
+  Encode rows as CSV, after a header of their column names.
+
+  :param table: table of the rows
+  :param chunks: chunks of rows (see `read_chunks`)
+
+  :return: iterator of the encoded chunks
+  '''
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+  writer.writerow(name for (name, _) in table.columns)
+
+  for rows in chunks:
+    writer.writerows(map(_value, row) for row in rows)
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+  if buffer.tell():
+    yield buffer.getvalue()
+
+#: Encoder of each format.
+ENCODERS = {
+  'ndjson': ndjson,
+  'csv': csv_lines,
+  }
+
+def gzipped(chunks: typing.Iterable[str]) -> typing.Iterator[bytes]:
+  '''
+  Compress encoded chunks with gzip, as they are produced.
+
+  :param chunks: encoded chunks
+
+  :return: iterator of compressed chunks
+  '''
+  compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)
+  for chunk in chunks:
+    compressed = compressor.compress(chunk.encode('utf-8'))
+    if compressed:
+      yield compressed
+  yield compressor.flush()
+
+def export(
+    table: str,
+    term_id: int,
+    output_format: str,
+    chunk_size: int,
+    compress: bool = False
+    ) -> typing.Iterator[typing.Union[str, bytes]]:
+  '''
+  Export a semester's table.
+
+  :param table: name of the table (see `TABLES`)
+  :param term_id: term ID of the semester
+  :param output_format: format (see `ENCODERS`)
+  :param chunk_size: number of rows read at once
+  :param compress: whether to compress the output with gzip
+
+  :return: iterator of encoded (or compressed, as bytes) chunks
+  '''
+  encoded = ENCODERS[output_format](TABLES[table],
+    read_chunks(TABLES[table], term_id, chunk_size))
+  return gzipped(encoded) if compress else encoded
@@ -0,0 +1,169 @@
+# pdata/courses/feed.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Feed of changes to the enrollment of sections.
+
+import typing
+import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from courses import models, filters
+
+#: Maximum number of sections, and of courses, followed at once.
+MAX_FOLLOWED = 100
+
+#: State of a section which changes are recorded for: (status, capacity,
+#: enrollment).
+State = typing.Tuple[int, int, int]
+
+def section_states(
+    semester: models.Semester
+    ) -> typing.Dict[int, typing.Tuple[int, State]]:
+  '''
+  Get the current state of each of a semester's sections.
+
+  :param semester: semester
+
+  :return: map of section ID to its course's ID and its state
+  '''
+  return {pk: (course_id, (status, capacity, enrollment))
+    for (pk, course_id, status, capacity, enrollment)
+    in models.Section.objects
+      .filter(offering__semester=semester)
+      .values_list('id', 'offering__course_id', 'status', 'capacity',
+        'enrollment')}
+
+def record(
+    semester: models.Semester,
+    previous: typing.Dict[int, typing.Tuple[int, State]]
+    ) -> typing.List[models.SectionChange]:
+  '''
+  Record the changes to a semester's sections since their previous states
+  were read (see `section_states`). New sections are recorded as changes,
+  while removed sections are not (their changes are kept, see
+  `models.SectionChange`).
+  Changes older than `settings.COURSES_FEED_RETENTION` are then discarded.
+
+  :param semester: semester
+  :param previous: previous states of the semester's sections
+
+  :return: recorded changes
+  '''
+  now = timezone.now()
+  changed = [models.SectionChange(section_id=pk, course_id=course_id,
+      status=state[0], capacity=state[1], enrollment=state[2],
+      changed_at=now)
+    for (pk, (course_id, state)) in sorted(section_states(semester).items())
+    if previous.get(pk, (None, None))[1] != state]
+
+  models.SectionChange.objects.bulk_create(changed)
+
+  # The latest change is always kept, so that sequence numbers are never
+  # reused (which some databases do once the highest key is deleted).
+  models.SectionChange.objects.filter(
+      changed_at__lt=now - datetime.timedelta(
+        seconds=settings.COURSES_FEED_RETENTION),
+      id__lt=latest()).delete()
+  return changed
+
+def latest() -> int:
+  '''
+  Get the sequence number of the latest change.
+
+  :return: sequence number, or 0 if no change was recorded
+  '''
+  change = models.SectionChange.objects.order_by('-id').only('id').first()
+  return change.id if change else 0
+
+def read(
+    since: int,
+    sections: typing.Iterable[int] = None,
+    courses: typing.Iterable[int] = None,
+    limit: int = 1000,
+    until: int = None
+    ) -> typing.List[dict]:
+  '''
+  Read the changes after a sequence number, in order.
+
+  :param since: sequence number of the last change already seen
+  :param sections: IDs of the sections to read the changes of
+  :param courses: IDs of the courses to read the changes of the sections of
+    (by default, the changes of all sections are read)
+  :param limit: maximum number of changes
+  :param until: sequence number of the last change to read (default: the
+    latest)
+
+  :return: changes, each with its sequence number ('seq')
+  '''
+  queryset = models.SectionChange.objects.filter(id__gt=since)
+  if until is not None:
+    queryset = queryset.filter(id__lte=until)
+
+  if sections is not None or courses is not None:
+    queryset = queryset.filter(Q(section_id__in=list(sections or ()))
+      | Q(course_id__in=list(courses or ())))
+
+  return [{
+      'seq': pk,
+      'section': section_id,
+      'course': course_id,
+      'status': status,
+      'capacity': capacity,
+      'enrollment': enrollment,
+      'changed_at': changed_at.isoformat(),
+      }
+    for (pk, section_id, course_id, status, capacity, enrollment, changed_at)
+    in queryset.order_by('id')[:limit].values_list('id', 'section_id',
+      'course_id', 'status', 'capacity', 'enrollment', 'changed_at')]
+
+def expired(since: int) -> bool:
+  '''
+  Whether changes after a sequence number may have been discarded (see
+  `record`), so that a client resuming from it may have missed some, and
+  should read the sections again.
+
+  :param since: sequence number of the last change seen
+
+  :return: whether changes may have been discarded
+  '''
+  first = (models.SectionChange.objects
+    .order_by('id')
+    .values_list('id', flat=True)
+    .first())
+  return first is not None and since < first - 1
+
+def parse_params(request: Request) -> typing.Dict[str, typing.Any]:
+  '''
+  Parse the parameters of a request for changes: the sequence number of the
+  last change seen ('since'), and the sections ('sections') and courses
+  ('courses') to follow, as comma-separated lists of IDs (of at most
+  `MAX_FOLLOWED` each). By default, all sections are followed.
+
+  :param request: request
+
+  :return: parameters, with the sections and courses followed as sets (both
+    None if all sections are followed)
+  '''
+  params = filters.parse_params(request, {
+    'since': filters.integer,
+    'sections': filters.integers,
+    'courses': filters.integers,
+    })
+
+  followed = False
+  for param in ('sections', 'courses'):
+    params[param] = set(params.get(param, ()))
+    if len(params[param]) > MAX_FOLLOWED:
+      raise ValidationError({param: 'expected at most %d IDs' %
+        MAX_FOLLOWED})
+    followed = followed or param in request.query_params
+
+  if not followed:
+    params['sections'] = params['courses'] = None
+  return params
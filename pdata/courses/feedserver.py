@@ -0,0 +1,449 @@
+# pdata/courses/feedserver.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Asynchronous server of the feed of changes to sections.
+
+import typing
+import json
+import asyncio
+import logging
+import functools
+import collections
+import urllib.parse
+import concurrent.futures
+
+from django import db
+from rest_framework.exceptions import ValidationError
+
+from courses import feed
+
+LOGGER = logging.getLogger('pdata.courses')
+
+#: Maximum number of changes read at once.
+BATCH_SIZE = 1000
+
+#: Maximum size of the headers of a request.
+MAX_HEADERS = 100
+
+class DatabaseExecutor(concurrent.futures.ThreadPoolExecutor):
+  '''
+  Executor of database queries, outside of the event loop. Connections which
+  were closed, or are past their maximum age, are replaced before each
+  query (as Django does between requests).
+  '''
+  def submit(self, function: typing.Callable, *args, **kwargs
+      ) -> concurrent.futures.Future:
+    def query():
+      db.close_old_connections()
+      return function(*args, **kwargs)
+    return super().submit(query)
+
+class Subscription(object):
+  '''
+  Subscription to the changes of some sections, which are queued as they are
+  read.
+
+  :param sections: IDs of the sections followed
+  :param courses: IDs of the courses whose sections are followed (both None
+    to follow all sections)
+  '''
+  def __init__(self,
+      sections: typing.Optional[typing.Set[int]],
+      courses: typing.Optional[typing.Set[int]]
+      ) -> None:
+    self.sections = sections
+    self.courses = courses
+    self.queue = asyncio.Queue()
+
+  def pending(self, since: int) -> typing.List[dict]:
+    '''
+    Get the queued changes after a sequence number.
+
+    :param since: sequence number of the last change sent
+
+    :return: changes
+    '''
+    changes = []
+    while not self.queue.empty():
+      change = self.queue.get_nowait()
+      if change['seq'] > since:
+        changes.append(change)
+    return changes
+
+class Feed(object):
+  '''
+  Feed of changes to sections. New changes are read once per interval, for
+  every subscription at once, so the load on the database does not depend on
+  the number of subscribers. Each change is then queued for the
+  subscriptions following its section (or its course).
+
+  Queries are run in an executor, so that they do not block the event loop.
+
+  :param interval: seconds between reads of new changes
+  :param executor: executor of queries (default: the event loop's)
+  '''
+  def __init__(self,
+      interval: float,
+      executor: concurrent.futures.Executor = None
+      ) -> None:
+    self.interval = interval
+    self.executor = executor
+
+    #: Sequence number of the last change read.
+    self.cursor = None
+
+    self._all = set()
+    self._sections = collections.defaultdict(set)
+    self._courses = collections.defaultdict(set)
+
+  async def query(self, function: typing.Callable, *args) -> typing.Any:
+    '''
+    Run a query in the executor.
+
+    :param function: function running the query
+    :param args: arguments of the function
+
+    :return: result of the function
+    '''
+    return await asyncio.get_event_loop().run_in_executor(self.executor,
+      functools.partial(function, *args))
+
+  async def start(self) -> None:
+    '''
+    Start reading from the latest change.
+    '''
+    if self.cursor is None:
+      self.cursor = await self.query(feed.latest)
+
+  async def poll(self) -> int:
+    '''
+    Read new changes, and queue each for its subscriptions.
+
+    :return: number of changes read
+    '''
+    changes = await self.query(feed.read, self.cursor, None, None,
+      BATCH_SIZE)
+    for change in changes:
+      for subscription in (self._all
+          | self._sections.get(change['section'], set())
+          | self._courses.get(change['course'], set())):
+        subscription.queue.put_nowait(change)
+
+    if changes:
+      self.cursor = changes[-1]['seq']
+    return len(changes)
+
+  async def run(self) -> None:
+    '''
+    Read new changes until cancelled. Reads which fail (such as while the
+    database is unavailable) are retried after the interval.
+    '''
+    while True:
+      try:
+        await self.start()
+        if await self.poll() == BATCH_SIZE:
+          continue
+      except asyncio.CancelledError:
+        raise
+      except Exception:
+        LOGGER.exception('Could not read changes to sections')
+      await asyncio.sleep(self.interval)
+
+  async def subscribe(self,
+      sections: typing.Optional[typing.Set[int]],
+      courses: typing.Optional[typing.Set[int]],
+      since: int = None
+      ) -> typing.Tuple[Subscription, typing.List[dict], bool]:
+    '''
+    Subscribe to the changes of sections. Changes after `since` which were
+    already read are returned, and those read later are queued.
+
+    :param sections: IDs of the sections to follow
+    :param courses: IDs of the courses whose sections to follow (both None to
+      follow all sections)
+    :param since: sequence number of the last change seen (default: the
+      last change read)
+
+    :return: subscription, changes already read, and whether changes after
+      `since` may have been discarded, or not all were returned (see
+      `feed.expired`)
+    '''
+    await self.start()
+    subscription = Subscription(sections, courses)
+    if sections is None and courses is None:
+      self._all.add(subscription)
+    else:
+      for pk in sections:
+        self._sections[pk].add(subscription)
+      for pk in courses:
+        self._courses[pk].add(subscription)
+
+    if since is None or since >= self.cursor:
+      return (subscription, [], False)
+
+    # Changes read meanwhile are queued, so the earlier ones are only read
+    # up to the current cursor.
+    try:
+      until = self.cursor
+      changes = await self.query(feed.read, since, sections, courses,
+        BATCH_SIZE, until)
+      expired = await self.query(feed.expired, since)
+    except BaseException:
+      self.unsubscribe(subscription)
+      raise
+    return (subscription, changes, expired or len(changes) == BATCH_SIZE)
+
+  def unsubscribe(self, subscription: Subscription) -> None:
+    '''
+    Cancel a subscription.
+
+    :param subscription: subscription
+    '''
+    self._all.discard(subscription)
+    for (followed, index) in ((subscription.sections, self._sections),
+        (subscription.courses, self._courses)):
+      for pk in followed or ():
+        index[pk].discard(subscription)
+        if not index[pk]:
+          del index[pk]
+
+#: Request read by the server: its method, path, query parameters, and
+#: headers (with lowercase names).
+HTTPRequest = collections.namedtuple('HTTPRequest',
+  ('method', 'path', 'query_params', 'headers'))
+
+class FeedServer(object):
+  '''
+  HTTP server of a feed of changes, which holds no thread per client, so that
+  thousands of clients may wait for changes at once. Clients either
+  long-poll or stream the changes of the sections they follow (see
+  `feed.parse_params`):
+
+    - GET /courses/changes/poll: respond once there are changes after
+      'since' (by default, the latest change), or after `timeout` seconds,
+      with the changes, the sequence number to resume from ('next'), and
+      whether changes were discarded ('expired'), as the changes endpoint
+      does.
+    - GET /courses/changes/stream: send each change as a Server-Sent Event,
+      with its sequence number as its ID (so browsers resume from it with
+      Last-Event-ID). If changes were discarded, an 'expired' event is sent
+      first. A comment is sent every `heartbeat` seconds without changes.
+
+  :param changes: feed of changes
+  :param timeout: seconds for which long-polling clients wait for changes
+  :param heartbeat: seconds between comments sent to idle streams
+  '''
+  def __init__(self,
+      changes: Feed,
+      timeout: float = 30,
+      heartbeat: float = 15
+      ) -> None:
+    self.feed = changes
+    self.timeout = timeout
+    self.heartbeat = heartbeat
+
+  async def handle(self,
+      reader: asyncio.StreamReader,
+      writer: asyncio.StreamWriter
+      ) -> None:
+    '''
+    Handle a connection (see `asyncio.start_server`).
+
+    :param reader: reader of the connection
+    :param writer: writer of the connection
+    '''
+    try:
+      request = await self.read_request(reader)
+      if request is None:
+        return
+
+      path = request.path.rstrip('/')
+      if path not in ('/courses/changes/poll', '/courses/changes/stream'):
+        self.respond(writer, 404, {'detail': 'Not found.'})
+      elif request.method != 'GET':
+        self.respond(writer, 405,
+          {'detail': 'Method "%s" not allowed.' % request.method})
+      else:
+        try:
+          params = feed.parse_params(request)
+        except ValidationError as e:
+          self.respond(writer, 400, e.detail)
+        else:
+          if path.endswith('/poll'):
+            await self.poll(writer, params)
+          else:
+            await self.stream(writer, request, params)
+      await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+      pass
+    finally:
+      writer.close()
+
+  async def read_request(self,
+      reader: asyncio.StreamReader
+      ) -> typing.Optional[HTTPRequest]:
+    '''
+    Read the request line and headers of a request.
+
+    :param reader: reader of the connection
+
+    :return: request, or None if it is malformed
+    '''
+    try:
+      method, target, _ = (await reader.readline()).decode('latin-1').split()
+    except ValueError:
+      return None
+
+    headers = {}
+    for _ in range(MAX_HEADERS):
+      line = (await reader.readline()).decode('latin-1').strip()
+      if not line:
+        break
+      name, _, value = line.partition(':')
+      headers[name.strip().lower()] = value.strip()
+    else:
+      return None
+
+    url = urllib.parse.urlsplit(target)
+    return HTTPRequest(method, url.path,
+      dict(urllib.parse.parse_qsl(url.query)), headers)
+
+  def respond(self,
+      writer: asyncio.StreamWriter,
+      status: int,
+      content: typing.Any
+      ) -> None:
+    '''
+    Send a JSON response.
+
+    :param writer: writer of the connection
+    :param status: status code
+    :param content: content, encoded as JSON
+    '''
+    body = json.dumps(content).encode('utf-8')
+    writer.write(('HTTP/1.1 %d %s\r\n'
+      'Content-Type: application/json\r\n'
+      'Content-Length: %d\r\n'
+      'Cache-Control: no-cache\r\n'
+      'Connection: close\r\n\r\n' % (status,
+        _REASONS.get(status, ''), len(body))).encode('latin-1') + body)
+
+  async def poll(self,
+      writer: asyncio.StreamWriter,
+      params: typing.Dict[str, typing.Any]
+      ) -> None:
+    '''
+    Respond to a long-polling client, once there are changes.
+
+    :param writer: writer of the connection
+    :param params: parameters of the request
+    '''
+    subscription, changes, expired = await self.feed.subscribe(
+      params['sections'], params['courses'], params.get('since'))
+    since = params.get('since', self.feed.cursor)
+
+    try:
+      if not changes:
+        try:
+          change = await asyncio.wait_for(subscription.queue.get(),
+            self.timeout)
+          subscription.queue.put_nowait(change)
+        except asyncio.TimeoutError:
+          pass
+        changes = subscription.pending(since)
+    finally:
+      self.feed.unsubscribe(subscription)
+
+    self.respond(writer, 200, {
+      'changes': changes,
+      'next': (changes[-1]['seq'] if changes
+        else max(since, self.feed.cursor)),
+      'expired': expired,
+      })
+
+  async def stream(self,
+      writer: asyncio.StreamWriter,
+      request: HTTPRequest,
+      params: typing.Dict[str, typing.Any]
+      ) -> None:
+    '''
+    Stream changes to a client, as Server-Sent Events, until it disconnects.
+
+    :param writer: writer of the connection
+    :param request: request
+    :param params: parameters of the request
+    '''
+    since = params.get('since')
+    try:
+      since = int(request.headers['last-event-id'])
+    except (KeyError, ValueError):
+      pass
+
+    subscription, changes, expired = await self.feed.subscribe(
+      params['sections'], params['courses'], since)
+    if since is None:
+      since = self.feed.cursor
+
+    try:
+      writer.write(b'HTTP/1.1 200 OK\r\n'
+        b'Content-Type: text/event-stream\r\n'
+        b'Cache-Control: no-cache\r\n'
+        b'Connection: close\r\n\r\n')
+      if expired:
+        writer.write(b'event: expired\ndata: {}\n\n')
+
+      while not writer.transport.is_closing():
+        for change in changes:
+          writer.write(('id: %d\nevent: change\ndata: %s\n\n' % (
+            change['seq'], json.dumps(change))).encode('utf-8'))
+          since = change['seq']
+        await writer.drain()
+
+        try:
+          change = await asyncio.wait_for(subscription.queue.get(),
+            self.heartbeat)
+        except asyncio.TimeoutError:
+          writer.write(b': heartbeat\n\n')
+          changes = []
+        else:
+          subscription.queue.put_nowait(change)
+          changes = subscription.pending(since)
+    finally:
+      self.feed.unsubscribe(subscription)
+
+_REASONS = {
+  200: 'OK',
+  400: 'Bad Request',
+  404: 'Not Found',
+  405: 'Method Not Allowed',
+  }
+
+def serve(
+    host: str,
+    port: int,
+    interval: float,
+    workers: int = 4
+    ) -> None:
+  '''
+  Serve the feed of changes until interrupted.
+
+  :param host: host to listen on
+  :param port: port to listen on
+  :param interval: seconds between reads of new changes
+  :param workers: number of threads running queries
+  '''
+  loop = asyncio.get_event_loop()
+  changes = Feed(interval, DatabaseExecutor(max_workers=workers))
+  server = loop.run_until_complete(asyncio.start_server(
+    FeedServer(changes).handle, host, port))
+  reader = loop.create_task(changes.run())
+
+  try:
+    loop.run_forever()
+  except KeyboardInterrupt:
+    pass
+  finally:
+    reader.cancel()
+    server.close()
+    loop.run_until_complete(server.wait_closed())
@@ -0,0 +1,177 @@
+# pdata/courses/filters.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Query parameter filtering and ordering of the courses API.
+
+import typing
+import datetime
+
+from django.db.models import QuerySet
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+def integer(value: str) -> int:
+  '''
+  Parse an integer query parameter.
+
+  :param value: integer, such as '126'
+
+  :return: parsed value
+  '''
+  try:
+    return int(value)
+  except ValueError:
+    raise ValueError('expected an integer')
+
+def integers(value: str) -> typing.List[int]:
+  '''
+  Parse a comma-separated list of integers.
+
+  :param value: integers, such as '126,226'
+
+  :return: parsed values
+  '''
+  try:
+    return [int(v) for v in value.split(',') if v.strip()]
+  except ValueError:
+    raise ValueError('expected comma-separated integers')
+
+def boolean(value: str) -> bool:
+  '''
+  Parse a boolean query parameter.
+
+  :param value: 'true' or 'false' (or '1' or '0')
+
+  :return: parsed value
+  '''
+  try:
+    return {'true': True, '1': True, 'false': False, '0': False}[
+      value.lower()]
+  except KeyError:
+    raise ValueError('expected true or false')
+
+def time(value: str) -> datetime.time:
+  '''
+  Parse a time query parameter.
+
+  :param value: 24-hour time, such as '13:30'
+
+  :return: parsed value
+  '''
+  try:
+    return datetime.datetime.strptime(value, '%H:%M').time()
+  except ValueError:
+    raise ValueError('expected a time, such as 13:30')
+
+def parse_params(
+    request: Request,
+    parsers: typing.Dict[str, typing.Callable[[str], typing.Any]]
+    ) -> typing.Dict[str, typing.Any]:
+  '''
+  Parse a request's query parameters. Invalid values are rejected with 400
+  (Bad Request).
+
+  :param request: request
+  :param parsers: map of query parameter to the function parsing it, which
+    raises `ValueError` if it is invalid
+
+  :return: map of each parameter present in the request to its parsed value
+  '''
+  params = {}
+  for param, parse in parsers.items():
+    if param in request.query_params:
+      try:
+        params[param] = parse(request.query_params[param])
+      except ValueError as e:
+        raise ValidationError({param: str(e)})
+  return params
+
+class Filter(object):
+  '''
+  Filter of a queryset by the value of a query parameter, such as:
+
+  .. code:: python
+
+    Filter('number', integer) # ?number=126 -> .filter(number=126)
+
+  :param lookup: field lookup to filter by
+  :param parse: function parsing the parameter's value, which raises
+    `ValueError` if it is invalid
+  '''
+  def __init__(self,
+      lookup: str,
+      parse: typing.Callable[[str], typing.Any] = str
+      ) -> None:
+    self.lookup = lookup
+    self.parse = parse
+
+  def filter(self, queryset: QuerySet, value: typing.Any) -> QuerySet:
+    '''
+    Filter a queryset.
+
+    :param queryset: queryset to filter
+    :param value: parsed value of the parameter
+
+    :return: filtered queryset
+    '''
+    return queryset.filter(**{self.lookup: value})
+
+class PrefixFilter(Filter):
+  '''
+  Filter of a string field by a (case-sensitive) prefix. The prefix is
+  matched as a range of values, rather than with LIKE, so that it is
+  answered by the field's index on every database.
+  '''
+  def filter(self, queryset: QuerySet, value: str) -> QuerySet:
+    if not value:
+      return queryset
+
+    # All strings with the prefix sort before the prefix with its last
+    # character incremented.
+    upper = value[:-1] + chr(ord(value[-1]) + 1)
+    return queryset.filter(**{
+      '%s__gte' % self.lookup: value,
+      '%s__lt' % self.lookup: upper,
+      })
+
+class QueryParameterFilter(filters.BaseFilterBackend):
+  '''
+  Filters a viewset's queryset by the query parameters declared in its
+  `filter_params` attribute, which maps each parameter to its `Filter`.
+  Invalid values are rejected with 400 (Bad Request).
+  '''
+  def filter_queryset(self,
+      request: Request,
+      queryset: QuerySet,
+      view: typing.Any
+      ) -> QuerySet:
+    for param, query_filter in getattr(view, 'filter_params', {}).items():
+      if param not in request.query_params:
+        continue
+
+      try:
+        value = query_filter.parse(request.query_params[param])
+      except ValueError as e:
+        raise ValidationError({param: str(e)})
+      queryset = query_filter.filter(queryset, value)
+
+    return queryset
+
+class OrderingFilter(filters.OrderingFilter):
+  '''
+  Orders a viewset's queryset by one of its `ordering_fields`, given by the
+  'ordering' query parameter (prefixed with '-' for descending order). The
+  primary key breaks ties, so that the order is always deterministic.
+  '''
+  def get_ordering(self,
+      request: Request,
+      queryset: QuerySet,
+      view: typing.Any
+      ) -> typing.Tuple[str]:
+    ordering = super().get_ordering(request, queryset, view)
+    field = ordering[0]
+    if field.lstrip('-') == 'id':
+      return (field,)
+    return (field, 'id')
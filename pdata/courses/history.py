@@ -0,0 +1,272 @@
+# pdata/courses/history.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: History of the enrollment of sections.
+
+import typing
+import datetime
+import collections
+
+from django.conf import settings
+from django.utils import timezone
+
+from courses import models
+
+# The history of a section is stored as a single array of samples. Each
+# sample is encoded relative to the previous one (the first, relative to
+# zero), as the differences of its time (in seconds since the epoch), status,
+# capacity, and enrollment. Differences are zigzag-encoded (so that small
+# negative differences are small), then written as variable-length integers
+# (7 bits per byte, least significant first). Most samples are therefore
+# only a few bytes.
+
+#: State of a section at a time (in seconds since the epoch).
+Sample = collections.namedtuple('Sample',
+  ('time', 'status', 'capacity', 'enrollment'))
+
+_ORIGIN = Sample(0, 0, 0, 0)
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+  '''
+  Write a zigzag-encoded variable-length integer.
+
+  :param buffer: buffer to write to
+  :param value: integer
+  '''
+  value = value * 2 if value >= 0 else -value * 2 - 1
+  while value >= 0x80:
+    buffer.append((value & 0x7f) | 0x80)
+    value >>= 7
+  buffer.append(value)
+
+def encode(
+    samples: typing.Iterable[Sample],
+    previous: Sample = _ORIGIN
+    ) -> bytes:
+  '''
+  Encode samples.
+
+  :param samples: samples
+  :param previous: sample preceding the samples (default: none, for the
+    start of a history)
+
+  :return: encoded samples
+  '''
+  buffer = bytearray()
+  for sample in samples:
+    for (value, last) in zip(sample, previous):
+      _write_varint(buffer, value - last)
+    previous = sample
+  return bytes(buffer)
+
+def decode(data: bytes) -> typing.List[Sample]:
+  '''
+  Decode a history.
+
+  :param data: encoded samples (see `encode`)
+
+  :return: samples
+  '''
+  samples = []
+  values = []
+  previous = _ORIGIN
+  value = shift = 0
+
+  for byte in data:
+    value |= (byte & 0x7f) << shift
+    shift += 7
+    if byte & 0x80:
+      continue
+
+    values.append(value >> 1 if not value & 1 else -(value >> 1) - 1)
+    value = shift = 0
+    if len(values) == len(_ORIGIN):
+      previous = Sample(*(last + delta
+        for (last, delta) in zip(previous, values)))
+      samples.append(previous)
+      values = []
+
+  return samples
+
+def _last(history: models.EnrollmentHistory) -> Sample:
+  '''
+  Get the last sample of a history.
+
+  :param history: history
+
+  :return: last sample
+  '''
+  return Sample(int(history.last_at.timestamp()), history.last_status,
+    history.last_capacity, history.last_enrollment)
+
+def _set_last(history: models.EnrollmentHistory, sample: Sample) -> None:
+  '''
+  Set the last sample of a history.
+
+  :param history: history
+  :param sample: last sample
+  '''
+  history.last_at = datetime.datetime.fromtimestamp(sample.time,
+    timezone.utc)
+  history.last_status = sample.status
+  history.last_capacity = sample.capacity
+  history.last_enrollment = sample.enrollment
+
+def append(
+    semester: models.Semester,
+    changes: typing.Iterable[models.SectionChange]
+    ) -> int:
+  '''
+  Append changes to a semester's sections (see `feed.record`) to their
+  histories. Each history is appended to without being decoded, as its last
+  sample is stored alongside it.
+
+  :param semester: semester of the sections
+  :param changes: changes, at most one per section
+
+  :return: number of samples appended
+  '''
+  changes = list(changes)
+  histories = models.EnrollmentHistory.objects.in_bulk(
+    [change.section_id for change in changes])
+  numbers = {}
+  if len(histories) < len(changes):
+    numbers = dict(models.Section.objects
+      .filter(offering__semester=semester)
+      .values_list('id', 'number'))
+
+  created = []
+  for change in changes:
+    sample = Sample(int(change.changed_at.timestamp()), change.status,
+      change.capacity, change.enrollment)
+
+    history = histories.get(change.section_id)
+    if history is None:
+      history = models.EnrollmentHistory(section_id=change.section_id,
+        term_id=semester.term_id, number=numbers[change.section_id],
+        samples=encode([sample]), count=1)
+      _set_last(history, sample)
+      created.append(history)
+    else:
+      history.samples = bytes(history.samples) + encode([sample],
+        _last(history))
+      history.count += 1
+      _set_last(history, sample)
+      history.save()
+
+  models.EnrollmentHistory.objects.bulk_create(created)
+  return len(changes)
+
+def resample(
+    samples: typing.Iterable[Sample],
+    resolution: int
+    ) -> typing.List[Sample]:
+  '''
+  Keep only the last of the samples in each window of time, so that the
+  state at the end of each window is kept.
+
+  :param samples: samples, in order
+  :param resolution: seconds per window
+
+  :return: kept samples
+  '''
+  if resolution <= 1:
+    return list(samples)
+
+  kept = []
+  for sample in samples:
+    if kept and kept[-1].time // resolution == sample.time // resolution:
+      kept[-1] = sample
+    else:
+      kept.append(sample)
+  return kept
+
+def samples(
+    section_ids: typing.Iterable[int],
+    resolution: int = 0
+    ) -> typing.Dict[int, typing.List[Sample]]:
+  '''
+  Get the history of sections.
+
+  :param section_ids: IDs of the sections
+  :param resolution: seconds between the samples to keep (see `resample`),
+    or 0 to keep every sample
+
+  :return: map of the ID of each section with a history to its samples
+  '''
+  return {pk: resample(decode(bytes(data)), resolution)
+    for (pk, data) in models.EnrollmentHistory.objects
+      .filter(section_id__in=list(section_ids))
+      .values_list('section_id', 'samples')}
+
+def total(
+    histories: typing.Iterable[typing.List[Sample]]
+    ) -> typing.List[typing.Tuple[int, int, int]]:
+  '''
+  Sum the capacity and enrollment of sections over time.
+
+  :param histories: samples of each section
+
+  :return: (time, capacity, enrollment) each time any section changed
+  '''
+  events = sorted((sample.time, i, sample)
+    for (i, history) in enumerate(histories) for sample in history)
+
+  current = {}
+  capacity = enrollment = 0
+  totals = []
+  for (time, i, sample) in events:
+    previous = current.get(i, _ORIGIN)
+    capacity += sample.capacity - previous.capacity
+    enrollment += sample.enrollment - previous.enrollment
+    current[i] = sample
+
+    point = (time, capacity, enrollment)
+    if totals and totals[-1][0] == time:
+      totals[-1] = point
+    else:
+      totals.append(point)
+  return totals
+
+def downsample(
+    resolution: int = None,
+    days: int = None
+    ) -> typing.Dict[str, typing.Dict[str, int]]:
+  '''
+  Downsample the histories of the sections of semesters which have ended,
+  keeping one sample per `resolution` seconds (see `resample`).
+
+  :param resolution: seconds between samples (default:
+    `settings.COURSES_HISTORY_RESOLUTION`)
+  :param days: days after the end of a semester after which its histories
+    are downsampled (default: `settings.COURSES_HISTORY_DOWNSAMPLE_AFTER`)
+
+  :return: number of histories downsampled, as a task's changes (see
+    `pdata.schedules.has_changes`)
+  '''
+  if resolution is None:
+    resolution = settings.COURSES_HISTORY_RESOLUTION
+  if days is None:
+    days = settings.COURSES_HISTORY_DOWNSAMPLE_AFTER
+
+  # Histories of deleted sections are downsampled as well.
+  ended = timezone.now().date() - datetime.timedelta(days=days)
+  histories = models.EnrollmentHistory.objects.filter(
+    term_id__in=models.Semester.objects
+      .filter(end_date__lt=ended)
+      .values('term_id'),
+    resolution__lt=resolution)
+
+  updated = 0
+  for history in histories.iterator():
+    kept = resample(decode(bytes(history.samples)), resolution)
+    history.samples = encode(kept)
+    history.count = len(kept)
+    history.resolution = resolution
+    _set_last(history, kept[-1])
+    history.save()
+    updated += 1
+
+  return {'enrollmenthistory': {'created': 0, 'updated': updated,
+    'deleted': 0}}
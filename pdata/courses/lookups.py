@@ -0,0 +1,120 @@
+# pdata/courses/lookups.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Batch lookups of objects by their keys.
+
+import typing
+import re
+import collections
+
+from django.db.models import Model, QuerySet
+
+from courses import filters
+
+class Key(object):
+  '''
+  Key which objects may be looked up by in batches, such as:
+
+  .. code:: python
+
+    Key('employee_id') # ?emplids=960000001,960000002
+
+  All requested keys are looked up with a single IN query.
+
+  :param field: field which the key is the value of
+  :param parse: function parsing each requested key, which raises
+    `ValueError` if it is invalid
+  '''
+  def __init__(self,
+      field: str,
+      parse: typing.Callable[[str], typing.Any] = str
+      ) -> None:
+    self.field = field
+    self.parse = parse
+
+    #: Fields which the key is read from.
+    self.columns = (field,)
+
+  def lookup(self,
+      queryset: QuerySet,
+      keys: typing.List[str]
+      ) -> typing.Tuple[typing.Dict[str, Model], typing.List[str]]:
+    '''
+    Look up objects by their keys.
+
+    :param queryset: queryset to look up objects in
+    :param keys: requested keys
+
+    :return: map of each requested key found to its object, in the order
+      requested, and the keys which were not found
+    '''
+    parsed = collections.OrderedDict((key, self.parse(key)) for key in keys)
+    objects = {self.value(obj): obj
+      for obj in self.filter(queryset, set(parsed.values()))}
+
+    results = collections.OrderedDict()
+    missing = []
+    for key, value in parsed.items():
+      if value in objects:
+        results[key] = objects[value]
+      else:
+        missing.append(key)
+    return results, missing
+
+  def filter(self, queryset: QuerySet, values: typing.Set) -> QuerySet:
+    '''
+    Filter a queryset to the objects which may have the parsed keys.
+
+    :param queryset: queryset to filter
+    :param values: parsed keys
+
+    :return: filtered queryset
+    '''
+    return queryset.filter(**{'%s__in' % self.field: values})
+
+  def value(self, obj: Model) -> typing.Any:
+    '''
+    Get the parsed key of an object.
+
+    :param obj: object
+
+    :return: key
+    '''
+    return getattr(obj, self.field)
+
+_COURSE_CODE = re.compile(r'^\s*([A-Za-z]{3})\s*(\d{3})\s*([A-Za-z]?)\s*$')
+
+def course_code(value: str) -> typing.Tuple[str, int, str]:
+  '''
+  Parse a course code.
+
+  :param value: course code, such as 'COS126', 'cos 126' or 'ISC233A'
+
+  :return: (department, number, letter), such as ('COS', 126, '')
+  '''
+  match = _COURSE_CODE.match(value)
+  if match is None:
+    raise ValueError('expected course codes, such as COS126')
+  department, number, letter = match.groups()
+  return (department.upper(), int(number), letter.upper())
+
+class CourseCodeKey(Key):
+  '''
+  Key of courses by their code (see `course_code`). Courses are looked up by
+  department and number with IN, then matched on their letter.
+  '''
+  def __init__(self) -> None:
+    super().__init__('department', course_code)
+    self.columns = ('department', 'number', 'letter')
+
+  def filter(self, queryset: QuerySet, values: typing.Set) -> QuerySet:
+    return queryset.filter(
+      department__in={v[0] for v in values},
+      number__in={v[1] for v in values})
+
+  def value(self, obj: Model) -> typing.Tuple[str, int, str]:
+    return (obj.department, obj.number, obj.letter)
+
+#: Key of objects by their primary key.
+ID = Key('id', filters.integer)
@@ -0,0 +1,76 @@
+# pdata/courses/management/commands/benchcatalog.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Benchmark lookups in the catalog index against the database.
+
+import time
+import random
+import tempfile
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from pdata import versions
+from courses import models, data, catalog
+from courses.management.commands.benchsearch import generate
+
+class Command(BaseCommand):
+  help = ('Time lookups of courses and crosslistings by code, in the catalog '
+    'index and with queries, on generated courses. The data is rolled back '
+    'afterwards.')
+
+  def add_arguments(self, parser) -> None:
+    parser.add_argument('--courses', type=int, default=20000,
+      help='number of courses to generate (default: 20000)')
+    parser.add_argument('--lookups', type=int, default=5000,
+      help='number of lookups of each kind (default: 5000)')
+
+  def handle(self, *args, **options) -> None:
+    with transaction.atomic(), tempfile.TemporaryDirectory() as directory, \
+        override_settings(COURSES_CATALOG_INDEX_DIR=directory):
+      generate(options['courses'])
+      models.CrossListing.objects.bulk_create((models.CrossListing(
+          course_id=course_id, department='X' + department[1:],
+          number=number, letter=letter)
+        for (course_id, department, number, letter)
+        in models.Course.objects.values_list('id', 'department', 'number',
+          'letter')), batch_size=100)
+      versions.bump(data.DATASET)
+
+      started = time.perf_counter()
+      catalog.write()
+      index = catalog.get()
+      written = time.perf_counter() - started
+
+      rng = random.Random(0)
+      codes = rng.choices(list(models.Course.objects.values_list('department',
+        'number', 'letter')), k=options['lookups'])
+      crosslisted = [('X' + department[1:], number, letter)
+        for (department, number, letter) in codes]
+
+      timings = (
+        ('course (index)', lambda: [index.course(*code) for code in codes]),
+        ('course (query)', lambda: [models.Course.objects
+          .filter(department=department, number=number, letter=letter)
+          .values_list('id', 'title').first()
+          for (department, number, letter) in codes]),
+        ('crosslisting (index)', lambda: [index.crosslisted(*code)
+          for code in crosslisted]),
+        ('crosslisting (query)', lambda: [list(models.CrossListing.objects
+          .filter(department=department, number=number, letter=letter)
+          .values_list('course_id', flat=True))
+          for (department, number, letter) in crosslisted]),
+        )
+
+      self.stdout.write('index: %d bytes, written in %.0f ms' % (
+        index.buffer.size(), written * 1000))
+      for name, lookups in timings:
+        started = time.perf_counter()
+        lookups()
+        elapsed = time.perf_counter() - started
+        self.stdout.write('%s: %.2f us per lookup' % (name,
+          elapsed * 1e6 / len(codes)))
+
+      transaction.set_rollback(True)
@@ -0,0 +1,84 @@
+# pdata/courses/management/commands/benchsearch.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Benchmark course search.
+
+import time
+import random
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from courses import models, search
+
+#: Words which generated titles and descriptions are made of.
+VOCABULARY = ('introduction advanced topics systems theory programming '
+  'analysis design history literature physics chemistry biology economics '
+  'politics philosophy music art architecture engineering mathematics '
+  'statistics computation networks security languages culture society '
+  'modern ancient european american african asian environment energy '
+  'molecular cellular quantum algorithms data learning research seminar '
+  'writing policy law ethics religion psychology neuroscience').split()
+
+#: Queries timed, from single words to prefixes of several words.
+QUERIES = ('programming', 'cos', 'quant', 'intro comp', 'advanced topics '
+  'in sys', 'molecular biology', 'ethics', 'art hist')
+
+class Command(BaseCommand):
+  help = ('Time course searches with each available backend, on generated '
+    'courses. The data is rolled back afterwards.')
+
+  def add_arguments(self, parser) -> None:
+    parser.add_argument('--courses', type=int, default=20000,
+      help='number of courses to generate (default: 20000)')
+    parser.add_argument('--repeat', type=int, default=20,
+      help='number of times to run each query (default: 20)')
+
+  def handle(self, *args, **options) -> None:
+    with transaction.atomic():
+      generate(options['courses'])
+      search.rebuild()
+
+      backends = ['memory']
+      if search.fts_available():
+        backends.insert(0, 'fts5')
+
+      for backend in backends:
+        with override_settings(COURSES_SEARCH_BACKEND=backend):
+          search._index.clear()
+          started = time.perf_counter()
+          search.search(QUERIES[0])
+          first = time.perf_counter() - started
+
+          started = time.perf_counter()
+          for _ in range(options['repeat']):
+            for query in QUERIES:
+              search.search(query)
+          elapsed = time.perf_counter() - started
+
+        self.stdout.write('%s: %.2f ms per query (first query: %.0f ms)' % (
+          backend, elapsed * 1000 / (options['repeat'] * len(QUERIES)),
+          first * 1000))
+
+      transaction.set_rollback(True)
+
+def generate(count: int) -> None:
+  '''
+  Generate courses with random titles and descriptions.
+
+  :param count: number of courses to generate
+  '''
+  rng = random.Random(0)
+  departments = ['%c%c%c' % (65 + i // 26 // 26 % 26, 65 + i // 26 % 26,
+    65 + i % 26) for i in range(max(count // 500, 1))]
+
+  models.Course.objects.bulk_create((models.Course(
+      title=' '.join(rng.sample(VOCABULARY, 4)).title(),
+      description=' '.join(rng.choice(VOCABULARY) for _ in range(80)),
+      department=departments[n % len(departments)],
+      number=n // len(departments),
+      letter='B',
+      track=models.Course.TRACK_UNDERGRAD)
+    for n in range(count)), batch_size=100)
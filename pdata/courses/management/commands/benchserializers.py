@@ -0,0 +1,139 @@
+# pdata/courses/management/commands/benchserializers.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Benchmark the serialization of list responses.
+
+import time
+import itertools
+import datetime
+import typing
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from courses import models, serializers
+
+#: Meetings generated per section, one per weekday.
+MEETINGS_PER_SECTION = 5
+
+#: Sections generated per offering.
+SECTIONS_PER_OFFERING = 20
+
+class Command(BaseCommand):
+  help = ('Compare the throughput of the ModelSerializer and values_list '
+    'serializers of sections and meetings, on generated data. The data is '
+    'rolled back afterwards.')
+
+  def add_arguments(self, parser) -> None:
+    parser.add_argument('--sections', type=int, default=10000,
+      help='number of sections to generate, each with %d meetings '
+        '(default: 10000)' % MEETINGS_PER_SECTION)
+    parser.add_argument('--repeat', type=int, default=3,
+      help='number of times to time each serializer, keeping the best '
+        '(default: 3)')
+
+  def handle(self, *args, **options) -> None:
+    with transaction.atomic():
+      generate(options['sections'])
+
+      for model, serializer_class in (
+          (models.Section, serializers.SectionSerializer),
+          (models.Meeting, serializers.MeetingSerializer)):
+        rows = model.objects.count()
+        values = serializers.ValuesSerializer(serializer_class)
+        objects = model.objects.order_by('id')
+
+        def model_serializer() -> bytes:
+          return JSONRenderer().render(
+            serializer_class(objects.all(), many=True).data)
+
+        def values_serializer() -> bytes:
+          return JSONRenderer().render(
+            values.serialize(objects.values_list(*values.columns)))
+
+        model_time = best_time(model_serializer, options['repeat'])
+        values_time = best_time(values_serializer, options['repeat'])
+
+        self.stdout.write('%s (%d rows):' % (model.__name__, rows))
+        self.stdout.write('  ModelSerializer:  %10.0f rows/s' % (
+          rows / model_time))
+        self.stdout.write('  ValuesSerializer: %10.0f rows/s (%.1fx)' % (
+          rows / values_time, model_time / values_time))
+
+      transaction.set_rollback(True)
+
+def best_time(function: typing.Callable[[], typing.Any], repeat: int
+    ) -> float:
+  '''
+  Time a function.
+
+  :param function: function to time
+  :param repeat: number of times to call the function
+
+  :return: shortest time taken by a call, in seconds
+  '''
+  times = []
+  for _ in range(max(repeat, 1)):
+    started = time.perf_counter()
+    function()
+    times.append(time.perf_counter() - started)
+  return min(times)
+
+def generate(sections: int) -> None:
+  '''
+  Generate courses, each with a single offering, and their sections and
+  meetings.
+
+  :param sections: number of sections to generate
+  '''
+  semester = models.Semester.objects.create(
+    term=models.Semester.TERM_FALL,
+    year=1970,
+    start_date=datetime.date(1970, 9, 1),
+    end_date=datetime.date(1970, 12, 31),
+    term_id=0)
+
+  count = -(-sections // SECTIONS_PER_OFFERING)
+  models.Course.objects.bulk_create((models.Course(
+      title='Benchmark %d' % n,
+      description='',
+      department='BEN',
+      number=n,
+      track=models.Course.TRACK_UNDERGRAD)
+    for n in range(count)), batch_size=100)
+  courses = models.Course.objects.filter(department='BEN').order_by('number')
+
+  models.Offering.objects.bulk_create((models.Offering(
+      registrar_guid=n,
+      course=course,
+      semester=semester,
+      start_date=semester.start_date,
+      end_date=semester.end_date)
+    for n, course in enumerate(courses)), batch_size=100)
+  offerings = models.Offering.objects.filter(semester=semester).order_by('id')
+
+  models.Section.objects.bulk_create(itertools.islice((models.Section(
+      offering=offering,
+      number=n,
+      section_id='L%02d' % n,
+      status=models.Section.STATUS_OPEN,
+      capacity=100,
+      enrollment=n)
+    for offering in offerings
+    for n in range(SECTIONS_PER_OFFERING)), sections), batch_size=100)
+  section_ids = (models.Section.objects
+    .filter(offering__semester=semester)
+    .values_list('id', flat=True))
+
+  models.Meeting.objects.bulk_create((models.Meeting(
+      section_id=section_id,
+      building='Friend Center',
+      room='101',
+      number=1,
+      start_time=datetime.time(10, 0),
+      end_time=datetime.time(10, 50),
+      day=day)
+    for section_id in section_ids
+    for day in range(MEETINGS_PER_SECTION)), batch_size=100)
@@ -0,0 +1,51 @@
+# pdata/courses/management/commands/exportsemester.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Export a semester's sections or meetings.
+
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from courses import models, export
+
+class Command(BaseCommand):
+  help = ("Export a semester's sections or meetings, with their courses, as "
+    'newline-delimited JSON or CSV. Rows are written as they are read, so '
+    'memory use does not depend on the size of the semester.')
+
+  def add_arguments(self, parser) -> None:
+    parser.add_argument('term_id', type=int,
+      help='term ID of the semester, such as 1184')
+    parser.add_argument('table', choices=sorted(export.TABLES),
+      help='table to export')
+    parser.add_argument('--format', choices=sorted(export.ENCODERS),
+      default='ndjson', help='output format (default: ndjson)')
+    parser.add_argument('--gzip', action='store_true',
+      help='compress the output with gzip')
+    parser.add_argument('--output', '-o', default='-',
+      help='file to write to (default: standard output)')
+    parser.add_argument('--chunk-size', type=int,
+      default=settings.COURSES_EXPORT_CHUNK_SIZE,
+      help='number of rows read at once (default: %d)' %
+        settings.COURSES_EXPORT_CHUNK_SIZE)
+
+  def handle(self, *args, **options) -> None:
+    if not models.Semester.objects.filter(term_id=options['term_id']).exists():
+      raise CommandError('Unknown semester: %d' % options['term_id'])
+
+    chunks = export.export(options['table'], options['term_id'],
+      options['format'], options['chunk_size'], compress=options['gzip'])
+
+    if options['output'] != '-':
+      with open(options['output'], 'wb') as output:
+        for chunk in chunks:
+          output.write(chunk if options['gzip'] else chunk.encode('utf-8'))
+    elif options['gzip']:
+      for chunk in chunks:
+        sys.stdout.buffer.write(chunk)
+    else:
+      for chunk in chunks:
+        self.stdout.write(chunk, ending='')
@@ -0,0 +1,30 @@
+# pdata/courses/management/commands/servefeed.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Serve the feed of changes to sections.
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from courses import feedserver
+
+class Command(BaseCommand):
+  help = ('Serve the feed of changes to sections, to long-polling and '
+    'streaming (Server-Sent Events) clients. Clients are served by a single '
+    'event loop, so idle clients hold no thread.')
+
+  def add_arguments(self, parser) -> None:
+    parser.add_argument('--host', default='127.0.0.1',
+      help='host to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8001,
+      help='port to listen on (default: 8001)')
+    parser.add_argument('--interval', type=float,
+      default=settings.COURSES_FEED_POLL_INTERVAL,
+      help='seconds between reads of new changes (default: %g)' %
+        settings.COURSES_FEED_POLL_INTERVAL)
+
+  def handle(self, *args, **options) -> None:
+    self.stdout.write('Serving changes on http://%s:%d/courses/changes/' % (
+      options['host'], options['port']))
+    feedserver.serve(options['host'], options['port'], options['interval'])
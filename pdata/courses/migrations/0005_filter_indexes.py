@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-19 09:03
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def set_has_open_seats(apps, schema_editor):
+    Section = apps.get_model('courses', 'Section')
+    Section.objects.filter(enrollment__lt=F('capacity')).update(
+        has_open_seats=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_auto_20180402_2022'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='section',
+            name='has_open_seats',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.RunPython(set_has_open_seats, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='course',
+            name='letter',
+            field=models.CharField(db_index=True, default='', max_length=1),
+        ),
+        migrations.AlterField(
+            model_name='course',
+            name='track',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Undergraduate'), (2, 'Graduate')], db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='instructor',
+            name='last_name',
+            field=models.CharField(db_index=True, max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='meeting',
+            name='building',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='meeting',
+            name='end_time',
+            field=models.TimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='meeting',
+            name='start_time',
+            field=models.TimeField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='section',
+            name='status',
+            field=models.PositiveSmallIntegerField(choices=[(1, 'Open'), (2, 'Closed'), (3, 'Cancelled')], db_index=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='meeting',
+            index_together=set([('day', 'start_time')]),
+        ),
+    ]
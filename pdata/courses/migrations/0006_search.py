@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, OperationalError
+
+
+def course_codes(department, number, letter):
+    return '{0} {1}{2} {0}{1}{2}'.format(department, number, letter)
+
+
+def create_search_index(apps, schema_editor):
+    # The full-text index is only available on SQLite builds with FTS5;
+    # elsewhere, courses are searched with an in-memory index.
+    connection = schema_editor.connection
+    if connection.vendor != 'sqlite':
+        return
+
+    Course = apps.get_model('courses', 'Course')
+    CrossListing = apps.get_model('courses', 'CrossListing')
+
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(
+                'CREATE VIRTUAL TABLE courses_search USING '
+                'fts5(title, description, codes)')
+        except OperationalError:
+            return
+
+        codes = {}
+        for c in CrossListing.objects.all():
+            codes.setdefault(c.course_id, []).append(
+                course_codes(c.department, c.number, c.letter))
+
+        cursor.executemany(
+            'INSERT INTO courses_search (rowid, title, description, codes) '
+            'VALUES (%s, %s, %s, %s)',
+            [(c.pk, c.title, c.description, ' '.join(
+                [course_codes(c.department, c.number, c.letter)] +
+                codes.get(c.pk, [])))
+             for c in Course.objects.all()])
+
+
+def drop_search_index(apps, schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('DROP TABLE IF EXISTS courses_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
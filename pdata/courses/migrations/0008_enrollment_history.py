@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-19 09:31
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_section_changes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EnrollmentHistory',
+            fields=[
+                ('section', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='courses.Section')),
+                ('samples', models.BinaryField()),
+                ('count', models.PositiveIntegerField()),
+                ('last_at', models.DateTimeField()),
+                ('last_status', models.PositiveSmallIntegerField(choices=[(1, 'Open'), (2, 'Closed'), (3, 'Cancelled')])),
+                ('last_capacity', models.PositiveIntegerField()),
+                ('last_enrollment', models.PositiveIntegerField()),
+                ('resolution', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
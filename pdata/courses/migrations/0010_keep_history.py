@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-19 11:02
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def set_history_keys(apps, schema_editor):
+    EnrollmentHistory = apps.get_model('courses', 'EnrollmentHistory')
+    Section = apps.get_model('courses', 'Section')
+    for (pk, term_id, number) in Section.objects.values_list(
+            'id', 'offering__semester__term_id', 'number').iterator():
+        EnrollmentHistory.objects.filter(section_id=pk).update(
+            term_id=term_id, number=number)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_row_versions'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='enrollmenthistory',
+            name='term_id',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='enrollmenthistory',
+            name='number',
+            field=models.PositiveIntegerField(null=True),
+        ),
+        migrations.RunPython(set_history_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='enrollmenthistory',
+            name='term_id',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='enrollmenthistory',
+            name='number',
+            field=models.PositiveIntegerField(),
+        ),
+        migrations.AlterField(
+            model_name='enrollmenthistory',
+            name='section',
+            field=models.OneToOneField(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, serialize=False, to='courses.Section'),
+        ),
+        migrations.AlterField(
+            model_name='sectionchange',
+            name='section',
+            field=models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, to='courses.Section'),
+        ),
+        migrations.AlterIndexTogether(
+            name='enrollmenthistory',
+            index_together=set([('term_id', 'number')]),
+        ),
+    ]
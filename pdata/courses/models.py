@@ -7,7 +7,9 @@
 from django.db import models
 from django.core.validators import MaxValueValidator
 
-class Course(models.Model):
+from pdata.models import Versioned
+
+class Course(Versioned):
   '''
   The `Course` model represents all of the data contained within a course.
   This is data that does *not* change between semesters.
@@ -20,14 +22,14 @@ class Course(models.Model):
   number = models.PositiveSmallIntegerField(db_index=True)
   #: A letter is sometimes appended to course numbers (i.e. ENV 200A, ENV200B,
   #: etc.).
-  letter = models.CharField(max_length=1, default="")
+  letter = models.CharField(max_length=1, default="", db_index=True)
 
   TRACK_UNDERGRAD = 1
   TRACK_GRAD = 2
   track = models.PositiveSmallIntegerField(choices=(
     (TRACK_UNDERGRAD, 'Undergraduate'),
     (TRACK_GRAD, 'Graduate')
-    ))
+    ), db_index=True)
 
   pdf_allowed = models.BooleanField(default=True, db_index=True)
   audit_allowed = models.BooleanField(default=True, db_index=True)
@@ -35,7 +37,7 @@ class Course(models.Model):
   class Meta:
     unique_together = ('department', 'number', 'letter')
 
-class CrossListing(models.Model):
+class CrossListing(Versioned):
   '''
   The `CrossListing` model represents each of the different
   (department, number) pairs that a course is listed under. For example,
@@ -50,7 +52,7 @@ class CrossListing(models.Model):
   class Meta:
     unique_together = ('course', 'department', 'number', 'letter')
 
-class Semester(models.Model):
+class Semester(Versioned):
   '''
   The `Semester` model represents a single semester, which occurs at a single
   point in time.
@@ -72,13 +74,13 @@ class Semester(models.Model):
   class Meta:
     unique_together = ('term', 'year')
 
-class Instructor(models.Model):
+class Instructor(Versioned):
   '''
   The `Instructor` model represents a single instructor. An instructor may
   teach multiple courses across multiple semesters.
   '''
   first_name = models.CharField(max_length=255)
-  last_name = models.CharField(max_length=255)
+  last_name = models.CharField(max_length=255, db_index=True)
 
   #: A full_name is presented in the Registrar data, which means that it may
   #: be possible that the `first_name last_name` does not equal to the
@@ -88,7 +90,7 @@ class Instructor(models.Model):
   #: Provided by the Registrar with instructor listings.
   employee_id = models.CharField(max_length=9, unique=True, db_index=True)
 
-class Offering(models.Model):
+class Offering(Versioned):
   '''
   The `Offering` model represents all of the offerings of a single
   course. For example, there are unique offering of some courses per semester,
@@ -111,7 +113,7 @@ class Offering(models.Model):
   class Meta:
     unique_together = ('course', 'semester')
 
-class Section(models.Model):
+class Section(Versioned):
   '''
   The `Section` model represents a single class for a course. For example,
   an offered course will have multiple classes, as lectures or precepts.
@@ -132,17 +134,21 @@ class Section(models.Model):
     (STATUS_OPEN, 'Open'),
     (STATUS_CLOSED, 'Closed'),
     (STATUS_CANCELLED, 'Cancelled'),
-    ))
+    ), db_index=True)
 
   capacity = models.PositiveIntegerField()
 
   #: The enrollment should always be, at most, the capacity.
   enrollment = models.PositiveIntegerField()
 
+  #: Whether the enrollment is below the capacity. This is stored, rather than
+  #: compared, so that sections with open seats can be found by an index.
+  has_open_seats = models.BooleanField(default=False, db_index=True)
+
   class Meta:
     unique_together = ('offering', 'section_id')
 
-class Meeting(models.Model):
+class Meeting(Versioned):
   '''
   The `Meeting` model is for a single, well, meeting of a section.
 
@@ -152,14 +158,14 @@ class Meeting(models.Model):
   '''
   section = models.ForeignKey(Section, on_delete=models.CASCADE)
 
-  building = models.CharField(max_length=100)
+  building = models.CharField(max_length=100, db_index=True)
   room = models.CharField(max_length=10)
 
   #: Per-section unique number.
   number = models.PositiveSmallIntegerField()
 
-  start_time = models.TimeField()
-  end_time = models.TimeField()
+  start_time = models.TimeField(db_index=True)
+  end_time = models.TimeField(db_index=True)
 
   #: Days of the week where 0 is Monday, 1 is Tuesday, and so forth.
   DAY_MONDAY = 0
@@ -177,3 +183,61 @@ class Meeting(models.Model):
 
   class Meta:
     unique_together = ('section', 'number', 'day')
+    index_together = ('day', 'start_time')
+
+class SectionChange(models.Model):
+  '''
+  The `SectionChange` model represents a change of a section's enrollment,
+  capacity, or status, as recorded by a sync. Changes are numbered in the
+  order in which they are recorded (by their primary key), so that clients
+  may resume a feed of changes after the last one they received.
+
+  Changes are kept when their section is deleted by a sync, as it is
+  recreated with the same ID if it returns (see `EnrollmentHistory`).
+  '''
+  section = models.ForeignKey(Section, on_delete=models.DO_NOTHING,
+    db_constraint=False)
+
+  #: Course of the section, so that changes may be followed per course.
+  course = models.ForeignKey(Course, on_delete=models.CASCADE)
+
+  status = models.PositiveSmallIntegerField(
+    choices=Section._meta.get_field('status').choices)
+  capacity = models.PositiveIntegerField()
+  enrollment = models.PositiveIntegerField()
+
+  changed_at = models.DateTimeField(db_index=True)
+
+class EnrollmentHistory(models.Model):
+  '''
+  The `EnrollmentHistory` model represents the history of a section's
+  enrollment, capacity, and status, as a compact array of samples (see
+  `courses.history`). A sample is appended whenever any of them changes.
+
+  Histories are kept when their section is deleted by a sync, as sections
+  may drop out of the registrar's feed for a while. They are identified by
+  the term ID and class number of their section, so that a section which
+  returns is recreated with the same ID (see `data.update_term_data`).
+  '''
+  section = models.OneToOneField(Section, on_delete=models.DO_NOTHING,
+    db_constraint=False, primary_key=True)
+  term_id = models.PositiveIntegerField()
+  number = models.PositiveIntegerField()
+
+  #: Delta-encoded samples, each relative to the previous one.
+  samples = models.BinaryField()
+  count = models.PositiveIntegerField()
+
+  #: Last sample, which the next is encoded relative to.
+  last_at = models.DateTimeField()
+  last_status = models.PositiveSmallIntegerField(
+    choices=Section._meta.get_field('status').choices)
+  last_capacity = models.PositiveIntegerField()
+  last_enrollment = models.PositiveIntegerField()
+
+  #: Seconds between the samples kept once the history was downsampled, or 0
+  #: if every sample is kept.
+  resolution = models.PositiveIntegerField(default=0)
+
+  class Meta:
+    index_together = ('term_id', 'number')
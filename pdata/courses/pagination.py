@@ -0,0 +1,173 @@
+# pdata/courses/pagination.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Pagination of the courses API.
+
+import typing
+import base64
+import functools
+import operator
+import urllib.parse
+
+from django.conf import settings
+from django.db.models import Q, QuerySet
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+
+class CoursePagination(pagination.CursorPagination):
+  '''
+  Keyset (cursor) pagination over the primary key. Each page is a single
+  range query on the primary key index, so its cost does not depend on how
+  far into the table it is, and no COUNT(*) query is performed.
+
+  The page size is set by `settings.COURSES_PAGE_SIZE`, and clients may
+  request up to `settings.COURSES_MAX_PAGE_SIZE` with the 'page_size' query
+  parameter.
+
+  Results may be ordered by another field (see `filters.OrderingFilter`),
+  which is then followed by the primary key to break ties. Cursors hold the
+  position of the last object on every field of the ordering, so that pages
+  start strictly after it however many objects share a value. (REST
+  framework's own cursors only hold the first field, and skip ties by an
+  offset, which is capped.)
+
+  The view's `values_list` rows may also be paginated (see
+  `views.CourseDataViewset.get_values_serializer`), as long as they include
+  the ordering fields.
+  '''
+  ordering = 'id'
+  page_size = settings.COURSES_PAGE_SIZE
+  page_size_query_param = 'page_size'
+  max_page_size = settings.COURSES_MAX_PAGE_SIZE
+
+  def paginate_queryset(self,
+      queryset: QuerySet,
+      request: Request,
+      view: typing.Any = None
+      ) -> typing.Optional[list]:
+    values = (view.get_values_serializer()
+      if hasattr(view, 'get_values_serializer') else None)
+    self.columns = values.columns if values is not None else ()
+
+    self.page_size = self.get_page_size(request)
+    if not self.page_size:
+      return None
+
+    self.base_url = request.build_absolute_uri()
+    self.model = queryset.model
+    self.ordering = self.get_ordering(request, queryset, view)
+    self.cursor = self.decode_cursor(request)
+
+    reverse = self.cursor is not None and self.cursor.reverse
+    ordering = _reverse(self.ordering) if reverse else self.ordering
+    queryset = queryset.order_by(*ordering)
+    if self.cursor is not None:
+      queryset = queryset.filter(_after(ordering, self.cursor.position))
+
+    # One more object is read, to find whether another page follows.
+    results = list(queryset[:self.page_size + 1])
+    self.page = results[:self.page_size]
+    has_following = len(results) > len(self.page)
+    if reverse:
+      self.page.reverse()
+
+    # Pages may only be empty if objects were deleted, in which case there is
+    # no position to continue from in the other direction.
+    if reverse:
+      self.has_previous = has_following
+      self.has_next = bool(self.page)
+    else:
+      self.has_next = has_following
+      self.has_previous = self.cursor is not None and bool(self.page)
+    return self.page
+
+  def get_next_link(self) -> typing.Optional[str]:
+    if not self.has_next:
+      return None
+    return self.encode_cursor(pagination.Cursor(offset=0, reverse=False,
+      position=self._position(self.page[-1])))
+
+  def get_previous_link(self) -> typing.Optional[str]:
+    if not self.has_previous:
+      return None
+    return self.encode_cursor(pagination.Cursor(offset=0, reverse=True,
+      position=self._position(self.page[0])))
+
+  def decode_cursor(self, request: Request) -> typing.Optional[
+      pagination.Cursor]:
+    encoded = request.query_params.get(self.cursor_query_param)
+    if encoded is None:
+      return None
+
+    try:
+      tokens = urllib.parse.parse_qs(base64.b64decode(
+        encoded.encode('ascii')).decode('ascii'), keep_blank_values=True)
+      reverse = bool(int(tokens.get('r', ['0'])[0]))
+    except (TypeError, ValueError):
+      raise NotFound(self.invalid_cursor_message)
+
+    position = tokens.get('p', [])
+    if len(position) != len(self.ordering):
+      raise NotFound(self.invalid_cursor_message)
+    return pagination.Cursor(offset=0, reverse=reverse, position=position)
+
+  def encode_cursor(self, cursor: pagination.Cursor) -> str:
+    tokens = [('p', value) for value in cursor.position]
+    if cursor.reverse:
+      tokens.append(('r', '1'))
+    encoded = base64.b64encode(urllib.parse.urlencode(tokens).encode(
+      'ascii')).decode('ascii')
+    return replace_query_param(self.base_url, self.cursor_query_param,
+      encoded)
+
+  def _position(self, instance: typing.Any) -> typing.List[str]:
+    '''
+    Get the position of an object (or `values_list` row) in the ordering.
+
+    :param instance: object or row
+
+    :return: value of each field of the ordering
+    '''
+    position = []
+    for field in self.ordering:
+      name = field.lstrip('-')
+      if isinstance(instance, tuple):
+        value = instance[self.columns.index(name)]
+      else:
+        value = getattr(instance, self.model._meta.get_field(name).attname)
+      position.append(str(value))
+    return position
+
+def _reverse(ordering: typing.Sequence[str]) -> typing.Tuple[str]:
+  '''
+  Reverse the direction of each field of an ordering.
+
+  :param ordering: ordering, such as ('-start_time', 'id')
+
+  :return: reversed ordering, such as ('start_time', '-id')
+  '''
+  return tuple(field[1:] if field.startswith('-') else '-' + field
+    for field in ordering)
+
+def _after(ordering: typing.Sequence[str], position: typing.Sequence[str]
+    ) -> Q:
+  '''
+  Build the condition of the objects strictly after a position in an
+  ordering, such as `status > v OR (status = v AND id > pk)`.
+
+  :param ordering: ordering
+  :param position: value of each field of the ordering
+
+  :return: condition
+  '''
+  conditions = []
+  for (i, field) in enumerate(ordering):
+    name = field.lstrip('-')
+    lookup = '%s__%s' % (name, 'lt' if field.startswith('-') else 'gt')
+    conditions.append(functools.reduce(operator.and_,
+      [Q(**{f.lstrip('-'): v}) for (f, v) in zip(ordering[:i], position)],
+      Q(**{lookup: position[i]})))
+  return functools.reduce(operator.or_, conditions)
@@ -0,0 +1,105 @@
+# pdata/courses/resolver.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Resolution of course codes, including crosslisted codes.
+
+import typing
+import collections
+
+from pdata.versions import VersionedIndex
+from courses import models, data, lookups
+
+#: Course which a code resolves to, and whether the code is one of its
+#: crosslistings (rather than its own code).
+Resolution = collections.namedtuple('Resolution', ('id', 'department',
+  'number', 'letter', 'title', 'crosslisted'))
+
+class CodeIndex(object):
+  '''
+  Index of the codes of every course and crosslisting, in hash tables.
+
+  :param courses: (ID, department, number, letter, title) of each course
+  :param crosslistings: (course ID, department, number, letter) of each
+    crosslisting
+  '''
+  def __init__(self,
+      courses: typing.Iterable[typing.Tuple[int, str, int, str, str]],
+      crosslistings: typing.Iterable[typing.Tuple[int, str, int, str]]
+      ) -> None:
+    #: Map of course ID to the resolution of its own code.
+    self.courses = {}
+    #: Map of code, as (department, number, letter), to its resolutions. A
+    #: course's own code resolves to it first, then to any courses which are
+    #: crosslisted under it.
+    self.codes = collections.defaultdict(list)
+
+    for (pk, department, number, letter, title) in courses:
+      course = Resolution(pk, department, number, letter, title, False)
+      self.courses[pk] = course
+      self.codes[(department, number, letter)].append(course)
+
+    for (course_id, department, number, letter) in crosslistings:
+      course = self.courses.get(course_id)
+      if course is not None:
+        self.codes[(department, number, letter)].append(
+          course._replace(crosslisted=True))
+
+    self.codes = dict(self.codes)
+
+  @classmethod
+  def build(cls, scope: str) -> 'CodeIndex':
+    '''
+    Build the index of all current course codes.
+
+    :param scope: version scope of the course codes
+
+    :return: index
+    '''
+    return cls(
+      models.Course.objects.values_list('id', 'department', 'number',
+        'letter', 'title'),
+      models.CrossListing.objects.order_by('id').values_list('course_id',
+        'department', 'number', 'letter'))
+
+  def resolve(self,
+      codes: typing.Iterable[str]
+      ) -> typing.Tuple[typing.Dict[str, typing.List[Resolution]],
+        typing.List[str], typing.List[str]]:
+    '''
+    Resolve course codes, in free form (see `lookups.course_code`), such as
+    'mat375' or 'MAT 375A'.
+
+    :param codes: codes
+
+    :return: map of each code found to the courses it resolves to, in the
+      order given, the codes which were not found, and the codes which are
+      not valid
+    '''
+    results = collections.OrderedDict()
+    missing = []
+    invalid = []
+
+    for code in codes:
+      try:
+        found = self.codes.get(lookups.course_code(code))
+      except ValueError:
+        invalid.append(code)
+        continue
+
+      if found:
+        results[code] = found
+      else:
+        missing.append(code)
+
+    return results, missing, invalid
+
+_index = VersionedIndex(data.DATASET, CodeIndex.build)
+
+def get_index() -> CodeIndex:
+  '''
+  Get the index of the current course codes.
+
+  :return: index
+  '''
+  return _index.get(data.CODES_SCOPE)
@@ -0,0 +1,169 @@
+# pdata/courses/rooms.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Occupancy of rooms by meetings.
+
+import typing
+import bisect
+import datetime
+import itertools
+import collections
+
+from pdata.versions import VersionedIndex
+from courses import models, data
+
+#: Meeting in a room, from `start` to `end`.
+Occupancy = collections.namedtuple('Occupancy', ('start', 'end', 'section'))
+
+class Intervals(object):
+  '''
+  Meetings of a room on a day, sorted by start time, so that those
+  overlapping a window are found by bisection.
+
+  :param occupancies: meetings of the room
+  '''
+  def __init__(self, occupancies: typing.Iterable[Occupancy]) -> None:
+    self.occupancies = sorted(occupancies)
+    self.starts = [o.start for o in self.occupancies]
+    # Latest end of the meetings up to each one. This is non-decreasing, so
+    # the first meeting which may overlap a window is also found by
+    # bisection, even if meetings overlap each other.
+    self.latest_ends = list(itertools.accumulate(
+      (o.end for o in self.occupancies), max))
+
+  def overlapping(self,
+      start: datetime.time,
+      end: datetime.time
+      ) -> typing.List[Occupancy]:
+    '''
+    Get the meetings overlapping a window. Meetings which end when the
+    window starts, or start when it ends, do not overlap it.
+
+    :param start: start of the window
+    :param end: end of the window
+
+    :return: overlapping meetings, by start time
+    '''
+    first = bisect.bisect_right(self.latest_ends, start)
+    last = bisect.bisect_left(self.starts, end)
+    return [o for o in self.occupancies[first:last] if o.end > start]
+
+  def is_free(self, start: datetime.time, end: datetime.time) -> bool:
+    '''
+    Check whether no meeting overlaps a window.
+
+    :param start: start of the window
+    :param end: end of the window
+
+    :return: whether the room is free
+    '''
+    last = bisect.bisect_left(self.starts, end)
+    return last == 0 or self.latest_ends[last - 1] <= start
+
+#: Meetings of a room on a day without any.
+_EMPTY = Intervals(())
+
+class RoomIndex(object):
+  '''
+  Index of the occupancy of a semester's rooms, by building, room and day.
+  Buildings are looked up by name, regardless of case.
+
+  :param rows: (building, room, day, start time, end time, section ID) of
+    each meeting
+  '''
+  def __init__(self, rows: typing.Iterable[typing.Tuple]) -> None:
+    grouped = collections.defaultdict(list)
+    for (building, room, day, start, end, section_id) in rows:
+      grouped[(building, room, day)].append(Occupancy(start, end, section_id))
+
+    # Map of building to room to day to its meetings.
+    self.buildings = {}
+    for (building, room, day), occupancies in grouped.items():
+      self.buildings.setdefault(building, {}).setdefault(room, {})[day] = (
+        Intervals(occupancies))
+
+    # Map of case-folded building name to name.
+    self.names = {name.casefold(): name for name in self.buildings}
+
+  @classmethod
+  def build(cls, scope: str) -> 'RoomIndex':
+    '''
+    Build the index of a semester's rooms.
+
+    :param scope: version scope of the semester's meetings (see
+      `data.meetings_scope`)
+
+    :return: index
+    '''
+    term_id = int(scope.partition('/')[0])
+    return cls(models.Meeting.objects
+      .filter(section__offering__semester__term_id=term_id)
+      .values_list('building', 'room', 'day', 'start_time', 'end_time',
+        'section_id'))
+
+  def building(self, name: str) -> typing.Optional[str]:
+    '''
+    Get the name of a building, as stored.
+
+    :param name: name of the building, in any case
+
+    :return: name, or None if no meeting is held in the building
+    '''
+    return self.names.get(name.casefold())
+
+  def free(self,
+      building: str,
+      day: int,
+      start: datetime.time,
+      end: datetime.time
+      ) -> typing.List[str]:
+    '''
+    Get the rooms of a building in which no meeting overlaps a window.
+
+    :param building: name of the building (see `building`)
+    :param day: day of the week (see `models.Meeting.day`)
+    :param start: start of the window
+    :param end: end of the window
+
+    :return: free rooms, sorted
+    '''
+    return sorted(room for (room, days) in self.buildings[building].items()
+      if days.get(day, _EMPTY).is_free(start, end))
+
+  def occupancy(self,
+      building: str,
+      day: int,
+      start: datetime.time,
+      end: datetime.time,
+      room: str = None
+      ) -> typing.List[typing.Tuple[str, typing.List[Occupancy]]]:
+    '''
+    Get the meetings overlapping a window, in each room of a building.
+
+    :param building: name of the building (see `building`)
+    :param day: day of the week (see `models.Meeting.day`)
+    :param start: start of the window
+    :param end: end of the window
+    :param room: room to restrict the results to (default: all rooms)
+
+    :return: (room, meetings) of each room, sorted by room
+    '''
+    rooms = self.buildings[building]
+    if room is not None:
+      rooms = {room: rooms[room]} if room in rooms else {}
+    return [(r, rooms[r].get(day, _EMPTY).overlapping(start, end))
+      for r in sorted(rooms)]
+
+# Indexes are built per semester, and rebuilt once its meetings change.
+_index = VersionedIndex(data.DATASET, RoomIndex.build)
+
+def get_index(term_id: int) -> RoomIndex:
+  '''
+  Get the index of the current occupancy of a semester's rooms.
+
+  :param term_id: term ID of the semester
+
+  :return: index
+  '''
+  return _index.get(data.meetings_scope(term_id))
@@ -0,0 +1,295 @@
+# pdata/courses/search.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Full-text search of courses.
+
+import typing
+import re
+import math
+import bisect
+import unicodedata
+import collections
+
+from django.conf import settings
+from django.db import connection
+
+from pdata.versions import VersionedIndex
+from courses import models, data
+
+#: Name of the SQLite FTS5 table indexing courses (see migration 0006).
+FTS_TABLE = 'courses_search'
+
+#: Indexed fields of each course, and their weight in the ranking. Matches in
+#: course codes (i.e. 'COS 126') are ranked above those in titles, which are
+#: ranked above those in descriptions.
+FIELDS = ('title', 'description', 'codes')
+WEIGHTS = (5.0, 1.0, 10.0)
+
+#: Parameters of the BM25 ranking function, as used by FTS5.
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_TOKEN = re.compile(r'\w+')
+
+def tokenize(text: str) -> typing.List[str]:
+  '''
+  Split text into lowercase tokens without diacritics, as FTS5's default
+  'unicode61' tokenizer does.
+
+  :param text: text to tokenize
+
+  :return: tokens
+  '''
+  text = unicodedata.normalize('NFKD', text.lower())
+  text = ''.join(c for c in text if not unicodedata.combining(c))
+  return _TOKEN.findall(text)
+
+def course_codes(department: str, number: int, letter: str) -> str:
+  '''
+  Get the text indexing a course code, so that it is matched both as
+  'COS 126' and 'COS126'.
+
+  :param department: department code
+  :param number: course number
+  :param letter: course letter
+
+  :return: indexed text, such as 'COS 126 COS126'
+  '''
+  return '{0} {1}{2} {0}{1}{2}'.format(department, number, letter)
+
+def documents() -> typing.Iterator[typing.Tuple[int, str, str, str]]:
+  '''
+  Get the indexed text of every course.
+
+  :return: iterator of (course ID, title, description, codes)
+  '''
+  crosslistings = collections.defaultdict(list)
+  for (course_id, department, number, letter) in (models.CrossListing.objects
+      .values_list('course_id', 'department', 'number', 'letter')):
+    crosslistings[course_id].append(course_codes(department, number, letter))
+
+  for (pk, title, description, department, number, letter) in (
+      models.Course.objects.values_list('id', 'title', 'description',
+        'department', 'number', 'letter')):
+    codes = [course_codes(department, number, letter)]
+    codes.extend(crosslistings[pk])
+    yield (pk, title, description, ' '.join(codes))
+
+def fts_available() -> bool:
+  '''
+  Check whether courses can be searched with the FTS5 table, which is only
+  created on SQLite builds supporting it.
+
+  :return: whether the FTS5 table exists
+  '''
+  return (connection.vendor == 'sqlite'
+    and FTS_TABLE in connection.introspection.table_names())
+
+def backend() -> str:
+  '''
+  Get the search backend in use, as set by `settings.COURSES_SEARCH_BACKEND`.
+
+  :return: 'fts5' or 'memory'
+  '''
+  if settings.COURSES_SEARCH_BACKEND == 'auto':
+    return 'fts5' if fts_available() else 'memory'
+  return settings.COURSES_SEARCH_BACKEND
+
+def rebuild() -> None:
+  '''
+  Rebuild the FTS5 table, if it exists, from the current courses. This
+  should be called in the transaction which changes them. The in-memory
+  index is rebuilt on its own, once the version of the course codes changes.
+  '''
+  if not fts_available():
+    return
+
+  with connection.cursor() as cursor:
+    cursor.execute('DELETE FROM %s' % FTS_TABLE)
+    cursor.executemany(
+      'INSERT INTO %s (rowid, title, description, codes) '
+      'VALUES (%%s, %%s, %%s, %%s)' % FTS_TABLE,
+      list(documents()))
+
+def search(
+    query: str,
+    semester: int = None,
+    limit: int = 20
+    ) -> typing.List[int]:
+  '''
+  Search courses by title, description, and code (including crosslisted
+  codes). Each word of the query must match, as a prefix of a word in the
+  course, and courses are ranked by BM25.
+
+  :param query: search terms, such as 'intro prog'
+  :param semester: term ID of the semester which courses must be offered in
+    (default: any)
+  :param limit: maximum number of results
+
+  :return: primary keys of the best matching courses, best first
+  '''
+  terms = tokenize(query)
+  if not terms:
+    return []
+
+  if backend() == 'fts5':
+    return _search_fts(terms, semester, limit)
+
+  offered = None
+  if semester is not None:
+    offered = set(models.Offering.objects
+      .filter(semester__term_id=semester)
+      .values_list('course_id', flat=True))
+  return _index.get(data.CODES_SCOPE).search(terms, offered, limit)
+
+def _search_fts(
+    terms: typing.List[str],
+    semester: typing.Optional[int],
+    limit: int
+    ) -> typing.List[int]:
+  '''
+  Search courses with the FTS5 table.
+
+  :param terms: tokenized search terms
+  :param semester: term ID of the semester which courses must be offered in
+  :param limit: maximum number of results
+
+  :return: primary keys of the best matching courses, best first
+  '''
+  # Tokens are alphanumeric, so they are safe to quote.
+  match = ' '.join('"%s"*' % term for term in terms)
+  sql = 'SELECT rowid FROM {0} WHERE {0} MATCH %s'.format(FTS_TABLE)
+  params = [match]
+
+  if semester is not None:
+    sql += (' AND rowid IN (SELECT o.course_id FROM {0} o '
+      'INNER JOIN {1} s ON s.id = o.semester_id WHERE s.term_id = %s)'
+      .format(models.Offering._meta.db_table,
+        models.Semester._meta.db_table))
+    params.append(semester)
+
+  sql += ' ORDER BY bm25({0}, {1}) LIMIT %s'.format(FTS_TABLE,
+    ', '.join(str(w) for w in WEIGHTS))
+  params.append(limit)
+
+  with connection.cursor() as cursor:
+    cursor.execute(sql, params)
+    return [pk for (pk,) in cursor.fetchall()]
+
+class InvertedIndex(object):
+  '''
+  In-memory inverted index of courses, used where FTS5 is not available. It
+  matches and ranks courses as the FTS5 table does.
+  '''
+  def __init__(self, docs: typing.Iterable[typing.Tuple]) -> None:
+    # Map of term to {course ID: occurrences, weighted by field}.
+    self.postings = collections.defaultdict(dict)
+    # Map of course ID to its number of tokens, in all fields.
+    self.lengths = {}
+
+    for (pk, *fields) in docs:
+      self.lengths[pk] = 0
+      for weight, text in zip(WEIGHTS, fields):
+        tokens = tokenize(text)
+        self.lengths[pk] += len(tokens)
+        for token in tokens:
+          postings = self.postings[token]
+          postings[pk] = postings.get(pk, 0.0) + weight
+
+    self.terms = sorted(self.postings)
+    self.average_length = max(
+      sum(self.lengths.values()) / max(len(self.lengths), 1), 1)
+
+  @classmethod
+  def build(cls, scope: str = '') -> 'InvertedIndex':
+    '''
+    Build the index of all courses.
+
+    :param scope: unused, as courses are indexed regardless of semester
+
+    :return: index
+    '''
+    return cls(documents())
+
+  def expand(self, prefix: str) -> typing.List[str]:
+    '''
+    Get all indexed terms starting with a prefix.
+
+    :param prefix: prefix
+
+    :return: matching terms
+    '''
+    start = bisect.bisect_left(self.terms, prefix)
+    end = start
+    while end < len(self.terms) and self.terms[end].startswith(prefix):
+      end += 1
+    return self.terms[start:end]
+
+  def search(self,
+      terms: typing.List[str],
+      offered: typing.Optional[typing.Set[int]],
+      limit: int
+      ) -> typing.List[int]:
+    '''
+    Search courses, as with `search`.
+
+    :param terms: tokenized search terms
+    :param offered: primary keys of the courses which may match (default:
+      all)
+    :param limit: maximum number of results
+
+    :return: primary keys of the best matching courses, best first
+    '''
+    scores = None
+    for term in terms:
+      # Weighted occurrences of any term with the prefix.
+      matches = collections.Counter()
+      for expanded in self.expand(term):
+        matches.update(self.postings[expanded])
+      if offered is not None:
+        matches = {pk: f for (pk, f) in matches.items() if pk in offered}
+
+      if scores is None:
+        scores = dict.fromkeys(matches, 0.0)
+      else:
+        scores = {pk: s for (pk, s) in scores.items() if pk in matches}
+      if not scores:
+        return []
+
+      idf = self._idf(len(matches))
+      for pk in scores:
+        scores[pk] += self._score(pk, matches[pk], idf)
+
+    ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [pk for (pk, _) in ranked[:limit]]
+
+  def _idf(self, matching: int) -> float:
+    '''
+    Get the inverse document frequency of a term, as computed by FTS5.
+
+    :param matching: number of courses matching the term
+
+    :return: inverse document frequency
+    '''
+    total = len(self.lengths)
+    return max(math.log((total - matching + 0.5) / (matching + 0.5)), 1e-6)
+
+  def _score(self, pk: int, frequency: float, idf: float) -> float:
+    '''
+    Get the BM25 score of a term in a course. As in FTS5, occurrences are
+    weighted by field, and the course's length is that of all its fields.
+
+    :param pk: primary key of the course
+    :param frequency: occurrences of the term, weighted by field
+    :param idf: inverse document frequency of the term
+
+    :return: score
+    '''
+    length = self.lengths[pk] / self.average_length
+    return idf * (frequency * (BM25_K1 + 1)) / (
+      frequency + BM25_K1 * (1 - BM25_B + BM25_B * length))
+
+# The indexed text only changes with the course codes (see
+# `data.update_term_data`), not with every sync of enrollments.
+_index = VersionedIndex(data.DATASET, InvertedIndex.build)
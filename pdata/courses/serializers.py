@@ -3,41 +3,295 @@
 # Author: Rushy Panchal
 # Date: July 21st, 2018
 
-from rest_framework import serializers
+import typing
+import copy
+import functools
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch, QuerySet
+from rest_framework import serializers, ISO_8601
+from rest_framework.settings import api_settings
 
 from . import models
 
-class CourseSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin(object):
+  '''
+  Mixin for serializers whose output may be restricted to some of their
+  fields, given by the `fields` argument (see `sparse_fields`).
+  '''
+  def __init__(self, *args, fields: typing.Iterable[str] = None, **kwargs):
+    super().__init__(*args, **kwargs)
+    if fields is not None:
+      for name in set(self.fields) - set(fields):
+        self.fields.pop(name)
+
+class CourseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.Course
     fields = '__all__'
 
-class CrossListingSerializer(serializers.ModelSerializer):
+class CrossListingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.CrossListing
     fields = '__all__'
 
-class SemesterSerializer(serializers.ModelSerializer):
+class SemesterSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.Semester
     fields = '__all__'
 
-class InstructorSerializer(serializers.ModelSerializer):
+class InstructorSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.Instructor
     fields = '__all__'
 
-class OfferingSerializer(serializers.ModelSerializer):
+class OfferingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.Offering
     fields = '__all__'
 
-class SectionSerializer(serializers.ModelSerializer):
+class SectionSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.Section
     fields = '__all__'
 
-class MeetingSerializer(serializers.ModelSerializer):
+class MeetingSerializer(SparseFieldsMixin, serializers.ModelSerializer):
   class Meta:
     model = models.Meeting
     fields = '__all__'
+
+class ExpandedSectionSerializer(SectionSerializer):
+  '''
+  Section, along with its meetings.
+  '''
+  meetings = MeetingSerializer(source='meeting_set', many=True, read_only=True)
+
+  class Meta(SectionSerializer.Meta):
+    pass
+
+class ExpandedOfferingSerializer(OfferingSerializer):
+  '''
+  Offering, along with its semester, instructors, and sections.
+  '''
+  semester = SemesterSerializer(read_only=True)
+  instructor = InstructorSerializer(many=True, read_only=True)
+  sections = ExpandedSectionSerializer(source='section_set', many=True,
+    read_only=True)
+
+  class Meta(OfferingSerializer.Meta):
+    pass
+
+class ExpandedCourseSerializer(CourseSerializer):
+  '''
+  Course, along with its crosslistings and all of its offerings (see
+  `ExpandedOfferingSerializer`). The related objects must be prefetched (see
+  `expanded_courses`), or each of them is queried separately.
+  '''
+  crosslistings = CrossListingSerializer(source='crosslisting_set', many=True,
+    read_only=True)
+  offerings = ExpandedOfferingSerializer(source='offering_set', many=True,
+    read_only=True)
+
+  class Meta(CourseSerializer.Meta):
+    pass
+
+def expanded_courses(
+    courses: QuerySet = None,
+    semester: models.Semester = None
+    ) -> QuerySet:
+  '''
+  Prefetch all of the objects serialized by `ExpandedCourseSerializer`. The
+  whole tree is fetched in a constant number of queries (one per model),
+  regardless of the number of courses or their size.
+
+  :param courses: courses to expand (default: all courses)
+  :param semester: semester to restrict offerings to (default: all
+    semesters)
+
+  :return: courses, with their related objects prefetched
+  '''
+  if courses is None:
+    courses = models.Course.objects.all()
+
+  offerings = models.Offering.objects.select_related('semester')
+  if semester is not None:
+    offerings = offerings.filter(semester=semester)
+
+  return courses.prefetch_related(
+    Prefetch('crosslisting_set',
+      queryset=models.CrossListing.objects.order_by('id')),
+    Prefetch('offering_set',
+      queryset=offerings.order_by('semester__term_id')),
+    Prefetch('offering_set__instructor',
+      queryset=models.Instructor.objects.order_by('id')),
+    Prefetch('offering_set__section_set',
+      queryset=models.Section.objects.order_by('id')),
+    Prefetch('offering_set__section_set__meeting_set',
+      queryset=models.Meeting.objects.order_by('id')))
+
+def sparse_fields(serializer_class: type, value: str) -> typing.Tuple[str]:
+  '''
+  Parse the fields of a serializer requested by a client, as a
+  comma-separated list.
+
+  :param serializer_class: serializer
+  :param value: requested fields, such as 'department,number,title'
+
+  :return: requested fields, in the serializer's order
+  '''
+  names = {name.strip() for name in value.split(',') if name.strip()}
+  available = serializer_class().fields
+  unknown = names - set(available)
+  if unknown:
+    raise ValueError('unknown fields: %s' % ', '.join(sorted(unknown)))
+  if not names:
+    raise ValueError('expected comma-separated fields')
+  return tuple(name for name in available if name in names)
+
+def sparse_columns(
+    serializer_class: type,
+    fields: typing.Iterable[str]
+    ) -> typing.List[str]:
+  '''
+  Get the model fields which some of a `ModelSerializer`'s fields are read
+  from, so that only they are loaded (with `QuerySet.only`). Fields which
+  are not stored in the model's own table, such as many-to-many and reverse
+  relations, are omitted.
+
+  :param serializer_class: serializer
+  :param fields: serializer fields (see `sparse_fields`)
+
+  :return: names of the model fields
+  '''
+  opts = serializer_class.Meta.model._meta
+  available = serializer_class().fields
+  columns = []
+
+  for name in fields:
+    try:
+      field = opts.get_field(available[name].source)
+    except FieldDoesNotExist:
+      continue
+    if field.concrete and not field.many_to_many:
+      columns.append(field.name)
+
+  return columns
+
+class ValuesSerializer(object):
+  '''
+  Serializes rows from `QuerySet.values_list`, without creating model
+  instances or running a `ModelSerializer` on each of them. The output is
+  the same as that of the given `ModelSerializer`.
+
+  Each field's converter is chosen when the serializer is created: values
+  which are already in their output form (such as integers, strings, and
+  choices) are passed through, dates and times are formatted directly, and
+  any other field falls back to its own `to_representation`.
+
+  .. code:: python
+
+    values = ValuesSerializer(MeetingSerializer)
+    rows = models.Meeting.objects.values_list(*values.columns)
+    data = values.serialize(rows)
+
+  :param serializer_class: `ModelSerializer` whose output to reproduce
+  '''
+  #: Fields whose values are output as they are read from the database.
+  PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+    )
+
+  def __init__(self, serializer_class: type) -> None:
+    fields = serializer_class().fields
+
+    self.names = tuple(fields)
+    self.columns = []
+    self.converters = []
+
+    for index, (name, field) in enumerate(fields.items()):
+      if isinstance(field, serializers.ManyRelatedField):
+        raise ValueError('%s.%s: many-to-many fields cannot be read with '
+          'values_list' % (serializer_class.__name__, name))
+
+      self.columns.append(field.source)
+      converter = self._converter(field)
+      if converter is not None:
+        self.converters.append((index, converter))
+
+  @functools.lru_cache(maxsize=128)
+  def restrict(self,
+      fields: typing.Tuple[str],
+      extra: typing.Tuple[str] = ()
+      ) -> 'ValuesSerializer':
+    '''
+    Get a serializer of only some fields. Its rows may also include `extra`
+    columns, such as those which they are ordered by, which are read but not
+    output.
+
+    :param fields: fields to serialize (see `sparse_fields`)
+    :param extra: other columns to read
+
+    :return: serializer
+    '''
+    indexes = [self.names.index(name) for name in fields]
+    converters = dict(self.converters)
+
+    restricted = copy.copy(self)
+    restricted.names = tuple(fields)
+    restricted.columns = [self.columns[i] for i in indexes]
+    restricted.columns.extend(c for c in extra
+      if c not in restricted.columns)
+    restricted.converters = [(position, converters[i])
+      for position, i in enumerate(indexes) if i in converters]
+    return restricted
+
+  @staticmethod
+  def _converter(field: serializers.Field
+      ) -> typing.Optional[typing.Callable[[typing.Any], typing.Any]]:
+    '''
+    Get the function converting a field's value to its output form.
+
+    :param field: serializer field
+
+    :return: converter, or None if the value is output as it is
+    '''
+    if isinstance(field, ValuesSerializer.PASSTHROUGH_FIELDS):
+      return None
+
+    if isinstance(field, (serializers.DateField, serializers.TimeField)):
+      default = (api_settings.DATE_FORMAT
+        if isinstance(field, serializers.DateField)
+        else api_settings.TIME_FORMAT)
+      output_format = getattr(field, 'format', default)
+      if output_format is not None and output_format.lower() == ISO_8601:
+        return lambda value: value.isoformat()
+
+    return field.to_representation
+
+  def serialize(self, rows: typing.Iterable[tuple]
+      ) -> typing.List[typing.Dict[str, typing.Any]]:
+    '''
+    Serialize rows of values, read from `self.columns`. Columns after those
+    of `self.names` are ignored.
+
+    :param rows: rows to serialize
+
+    :return: serialized rows
+    '''
+    names = self.names
+    converters = self.converters
+    data = []
+
+    for row in rows:
+      if converters:
+        row = list(row)
+        for index, convert in converters:
+          if row[index] is not None:
+            row[index] = convert(row[index])
+      data.append(dict(zip(names, row)))
+
+    return data
@@ -0,0 +1,129 @@
+# pdata/courses/snapshots.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Snapshots of each semester's catalog, as compressed JSON files.
+
+import typing
+import os
+import re
+import gzip
+
+from django.conf import settings
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from pdata import versions, files
+from courses import models, serializers
+
+#: Snapshot file, such as '1184-12.json.gz' for version 12 of term 1184.
+_SNAPSHOT = re.compile(r'^(?P<term_id>\d+)-(?P<version>\d+)\.json\.gz$')
+
+def _link(term_id: int) -> str:
+  '''
+  Get the path of the link to the current snapshot of a semester.
+
+  :param term_id: term ID of the semester
+
+  :return: path, such as '.../1184.json.gz'
+  '''
+  return os.path.join(settings.COURSES_SNAPSHOT_DIR, '%d.json.gz' % term_id)
+
+def document(semester: models.Semester) -> dict:
+  '''
+  Get the catalog of a semester: every course offered in it, along with its
+  crosslistings, and its offering in the semester (see
+  `serializers.ExpandedCourseSerializer`).
+
+  :param semester: semester
+
+  :return: catalog
+  '''
+  courses = serializers.expanded_courses(
+    models.Course.objects.filter(offering__semester=semester).order_by('id'),
+    semester=semester)
+  return {
+    'semester': serializers.SemesterSerializer(semester).data,
+    'courses': serializers.ExpandedCourseSerializer(courses, many=True).data,
+    }
+
+def write(term_id: int) -> typing.Optional[str]:
+  '''
+  Write the snapshot of a semester's current catalog, tagged with its
+  version. The snapshot is written to a temporary file, which is renamed
+  once complete, then the semester's link is atomically replaced to point
+  to it. Readers therefore always see a complete snapshot. Older snapshots
+  of the semester are then removed.
+
+  :param term_id: term ID of the semester
+
+  :return: path of the snapshot, or None if the semester has no version
+    (or snapshots are disabled)
+  '''
+  if settings.COURSES_SNAPSHOT_DIR is None:
+    return None
+
+  from courses import data
+
+  with transaction.atomic():
+    version = versions.get(data.DATASET, str(term_id))
+    if version is None:
+      return None
+    semester = models.Semester.objects.get(term_id=term_id)
+    content = JSONRenderer().render(dict(document(semester),
+      version=version.version))
+
+  os.makedirs(settings.COURSES_SNAPSHOT_DIR, exist_ok=True)
+  path = os.path.join(settings.COURSES_SNAPSHOT_DIR,
+    '%d-%d.json.gz' % (term_id, version.version))
+
+  with files.atomic_write(path) as f:
+    # The modification time is fixed, so that the same catalog is always
+    # compressed to the same bytes.
+    with gzip.GzipFile(fileobj=f, mode='wb', mtime=0) as compressed:
+      compressed.write(content)
+  files.publish(path, _link(term_id),
+    re.compile(r'^%d-\d+\.json\.gz$' % term_id))
+
+  return path
+
+def current_version(term_id: int) -> typing.Optional[int]:
+  '''
+  Get the version of the current snapshot of a semester.
+
+  :param term_id: term ID of the semester
+
+  :return: version, or None if there is no snapshot
+  '''
+  if settings.COURSES_SNAPSHOT_DIR is None:
+    return None
+
+  name = files.published(_link(term_id))
+  if name is None:
+    return None
+  return int(_SNAPSHOT.match(name).group('version'))
+
+def open_snapshot(term_id: int) -> typing.Optional[
+    typing.Tuple[typing.BinaryIO, int]]:
+  '''
+  Open the current snapshot of a semester, without querying the database.
+
+  :param term_id: term ID of the semester
+
+  :return: snapshot (gzip-compressed JSON) and its version, or None if there
+    is none
+  '''
+  if settings.COURSES_SNAPSHOT_DIR is None:
+    return None
+
+  # The snapshot may be replaced (and removed) between reading the link and
+  # opening its target, in which case the new link is read.
+  for _ in range(3):
+    try:
+      name = os.readlink(_link(term_id))
+      snapshot = open(os.path.join(settings.COURSES_SNAPSHOT_DIR, name), 'rb')
+    except FileNotFoundError:
+      continue
+    return snapshot, int(_SNAPSHOT.match(name).group('version'))
+
+  return None
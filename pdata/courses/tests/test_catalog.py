@@ -0,0 +1,89 @@
+# pdata/courses/tests/test_catalog.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the binary index of the catalog.
+
+import os
+import tempfile
+
+from django.test import override_settings
+
+from pdata import versions
+from courses import models, data, catalog
+from courses.tests.test_views import CourseAPITestBase
+
+class TestCatalogIndex(CourseAPITestBase):
+  def setUp(self):
+    super().setUp()
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    self.directory = directory.name
+    override = override_settings(COURSES_CATALOG_INDEX_DIR=self.directory)
+    override.enable()
+    self.addCleanup(override.disable)
+
+    catalog.write()
+    self.index = catalog.get()
+
+  def test_courses(self):
+    for course in models.Course.objects.all():
+      self.assertEqual(self.index.course(course.department, course.number,
+        course.letter), (course.id, course.title))
+
+    self.assertIsNone(self.index.course('COS', 999))
+    self.assertIsNone(self.index.course('ZZZ', 1))
+
+  def test_crosslistings(self):
+    crosslisting = models.CrossListing.objects.first()
+    self.assertEqual(self.index.crosslisted(crosslisting.department,
+      crosslisting.number, crosslisting.letter), sorted(
+        models.CrossListing.objects.filter(department=crosslisting.department,
+          number=crosslisting.number, letter=crosslisting.letter)
+        .values_list('course_id', flat=True)))
+    self.assertEqual(self.index.crosslisted('ZZZ', 1), [])
+
+  def test_sections(self):
+    term = models.Semester.objects.get().term_id
+    for section in models.Section.objects.select_related('offering'):
+      self.assertEqual(self.index.section(term, section.number),
+        (section.id, section.offering_id, section.offering.course_id,
+          section.section_id))
+
+    self.assertIsNone(self.index.section(term + 1, 40160))
+    self.assertIsNone(self.index.section(term, 1))
+
+  def test_no_queries(self):
+    with self.assertNumQueries(0):
+      index = catalog.get()
+      self.assertIs(index, self.index)
+      self.assertIsNotNone(index.course('COS', 333))
+
+  def test_swap(self):
+    '''
+    Once a new index is written, it replaces the previous one.
+    '''
+    version = versions.get(data.DATASET).version
+    self.assertEqual(self.index.version, version)
+
+    models.Course.objects.filter(department='COS', number=333).update(
+      title='Advanced Programming')
+    versions.bump(data.DATASET)
+    catalog.write()
+
+    index = catalog.get()
+    self.assertEqual(index.version, version + 1)
+    self.assertEqual(index.course('COS', 333).title, 'Advanced Programming')
+    self.assertEqual(os.listdir(self.directory).count(
+      'catalog-%d.idx' % version), 0)
+
+    # The previous index is still readable.
+    self.assertNotEqual(self.index.course('COS', 333).title,
+      'Advanced Programming')
+
+  def test_invalid(self):
+    path = os.path.join(self.directory, 'invalid.idx')
+    with open(path, 'wb') as f:
+      f.write(b'\0' * 64)
+    with self.assertRaises(ValueError):
+      catalog.CatalogIndex(path)
@@ -0,0 +1,145 @@
+# pdata/courses/tests/test_conflicts.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the detection of conflicts between sections.
+
+import copy
+import datetime
+import itertools
+
+from django.test import SimpleTestCase
+
+from courses import models, data, conflicts
+from courses.tests.test_views import CourseAPITestBase
+
+def time(value: str) -> datetime.time:
+  return datetime.datetime.strptime(value, '%H:%M').time()
+
+class TestMeetingIndex(SimpleTestCase):
+  '''
+  Tests of the index itself, on generated meetings.
+  '''
+  def test_same_as_pairwise(self):
+    '''
+    The sweep finds the same conflicts as comparing every pair of meetings.
+    '''
+    meetings = []
+    for section_id in range(60):
+      for day in range(5):
+        start = 8 * 60 + (section_id * 37 + day * 53) % (12 * 60)
+        end = start + 50 + (section_id % 3) * 30
+        meetings.append((section_id, day, time('%d:%d' % divmod(start, 60)),
+          time('%d:%d' % divmod(end, 60))))
+    index = conflicts.MeetingIndex(((s, s + 40000) for s in range(60)),
+      meetings)
+
+    expected = set()
+    for (a, b) in itertools.combinations(meetings, 2):
+      if a[0] != b[0] and a[1] == b[1] and a[2] < b[3] and b[2] < a[3]:
+        expected.add((a[1], tuple(sorted((a[0], b[0]))), max(a[2], b[2]),
+          min(a[3], b[3])))
+
+    found = index.conflicts(range(60))
+    self.assertEqual(len(found), len(expected))
+    self.assertEqual(set(found), expected)
+    self.assertEqual(found, sorted(found,
+      key=lambda c: (c.day, c.start, c.end, c.sections)))
+
+  def test_adjacent(self):
+    index = conflicts.MeetingIndex([(1, 100), (2, 200), (3, 300)], [
+      (1, 0, time('10:00'), time('11:00')),
+      (2, 0, time('11:00'), time('12:00')),
+      (3, 1, time('10:30'), time('11:30')),
+      ])
+    self.assertEqual(index.conflicts([1, 2, 3]), [])
+
+  def test_resolve(self):
+    index = conflicts.MeetingIndex([(1, 100), (2, 200)], [])
+    self.assertEqual(index.resolve([2, 5], [100, 200, 300]),
+      ([2, 1], [5, 300]))
+
+class TestConflictsEndpoint(CourseAPITestBase):
+  URL = '/courses/conflicts/'
+
+  def setUp(self):
+    super().setUp()
+    conflicts._index.clear()
+    self.term = models.Semester.objects.get().term_id
+    self.sections = {
+      '%s %d%s %s' % (department, number, letter, section_id): pk
+      for (department, number, letter, section_id, pk)
+      in models.Section.objects.values_list('offering__course__department',
+        'offering__course__number', 'offering__course__letter',
+        'section_id', 'id')}
+
+  def get(self, **params):
+    params.setdefault('semester', self.term)
+    return self.client.get(self.URL, params)
+
+  def test_conflicts(self):
+    cos333 = self.sections['COS 333 L01']
+    cos432 = self.sections['COS 432 L01']
+    ids = ','.join(str(s) for s in (cos432, cos333,
+      self.sections['AST 401 L01']))
+
+    response = self.get(sections=ids)
+    self.assertEqual(response.status_code, 200)
+    conflict = {'sections': sorted([cos333, cos432]), 'start': '11:00:00',
+      'end': '12:20:00'}
+    self.assertEqual(response.json(), {
+      'sections': [cos432, cos333, self.sections['AST 401 L01']],
+      'conflicts': [
+        {'day': models.Meeting.DAY_TUESDAY, 'conflicts': [conflict]},
+        {'day': models.Meeting.DAY_THURSDAY, 'conflicts': [conflict]},
+        ],
+      })
+
+  def test_class_numbers(self):
+    response = self.get(classes='42038,42951', sections=str(
+      self.sections['ISC 233 C01']))
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.json()['conflicts'], [
+      {'day': day, 'conflicts': [{
+        'sections': sorted([self.sections['ISC 233 L01'],
+          self.sections['COS 518 S01']]),
+        'start': '10:00:00',
+        'end': '10:20:00',
+        }]} for day in (models.Meeting.DAY_MONDAY,
+          models.Meeting.DAY_WEDNESDAY)])
+
+  def test_no_conflicts(self):
+    response = self.get(classes='40300,40160')
+    self.assertEqual(response.json()['conflicts'], [])
+
+  def test_queries(self):
+    '''
+    Once the index is built, only the version of the semester's meetings is
+    queried (by `views.meetings_conditional`, then by the index).
+    '''
+    self.get(classes='40160')
+    with self.assertNumQueries(2):
+      response = self.get(classes='40160,40184')
+    self.assertEqual(len(response.json()['conflicts']), 2)
+
+  def test_updated_by_sync(self):
+    modified = copy.deepcopy(self.json_data)
+    for subject in modified['term'][0]['subjects']:
+      for course in subject['courses']:
+        if subject['code'] == 'COS' and course['catalog_number'] == '432':
+          meeting = course['classes'][0]['schedule']['meetings'][0]
+          meeting['start_time'] = '12:30 PM'
+          meeting['end_time'] = '01:50 PM'
+
+    self.assertEqual(len(self.get(classes='40160,40184').json()[
+      'conflicts']), 2)
+    data.update_term_data(modified)
+    self.assertEqual(self.get(classes='40160,40184').json()['conflicts'], [])
+
+  def test_invalid(self):
+    for params in ({'classes': '40160', 'semester': ''}, {},
+        {'sections': 'a,b'}, {'classes': '1'},
+        {'classes': '40160', 'semester': self.term + 1},
+        {'sections': ','.join(str(s) for s in range(101))}):
+      response = self.get(**params)
+      self.assertEqual(response.status_code, 400, params)
@@ -12,10 +12,12 @@ import itertools
 import copy
 import contextlib
 import unittest.mock
+import urllib.error
 
 from django.test import TestCase, SimpleTestCase
 from django.db import transaction
 
+from pdata import metrics, versions
 from courses import models, data
 
 class CourseDatasetTestBase(object):
@@ -126,6 +128,7 @@ class CourseDatasetTestBase(object):
     self.assertEqual(s1.capacity, s2.capacity)
     self.assertEqual(s1.enrollment, s2.enrollment)
     self.assertEqual(s1.offering_id, s2.offering_id)
+    self.assertEqual(s1.has_open_seats, s1.enrollment < s1.capacity)
 
   def assertMeetingEqual(self,
       m1: models.Meeting, m2: models.Meeting) -> None:
@@ -277,9 +280,9 @@ class CourseDatasetTestBase(object):
       # COS 518
       m['subjects'][1]['courses'][2]['instructors'][0]['emplid'] = '000000420'
       e['instructors']['echo'].employee_id = '000000420'
+      # The previous instructor remains, but no longer teaches the course.
       e['instructors']['_'] = models.Instructor(
         employee_id='000000005', first_name='PROF', last_name='Echo')
-      e['offering-instructors']['cos518'].append('_')
 
   def test_update_term_data_updated_schedule(self):
     '''
@@ -621,6 +624,29 @@ class TestCourseDataset(TestCase, CourseDatasetTestBase):
     self.with_response(self.json_data)
     self.assertDatabaseState()
 
+  def test_update_term_metrics(self):
+    '''
+    update_term records the bytes downloaded and the time spent in each phase.
+    '''
+    with metrics.recording() as run:
+      self.with_response(self.json_data)
+
+    self.assertEqual(run.bytes_downloaded, len(json.dumps(self.json_data)))
+    self.assertEqual(set(run.timings), {'fetch', 'transform', 'write'})
+    self.assertIsNone(run.error)
+
+  def test_update_term_fetch_failed(self):
+    '''
+    update_term marks the run as failed if the data cannot be fetched.
+    '''
+    with metrics.recording() as run, \
+        unittest.mock.patch('urllib.request.urlopen',
+          side_effect=urllib.error.URLError('timed out')):
+      self.assertIsNone(data.update_term('current'))
+
+    self.assertIn('timed out', run.error)
+    self.assertEqual(models.Semester.objects.count(), 0)
+
 class TestUpdateTermData(TestCase, CourseDatasetTestBase):
   '''
   Test the update_term_data function for updating a term's data dynamically.
@@ -708,6 +734,61 @@ class TestUpdateTermData(TestCase, CourseDatasetTestBase):
     data.update_term_data(self.json_data)
     self.assertDatabaseState()
 
+  def test_update_term_data_changes(self):
+    '''
+    update_term_data reports the number of objects changed per model, which
+    excludes objects that are already up to date.
+    '''
+    changes = data.update_term_data(self.json_data)
+    self.assertEqual(changes['semester'],
+      {'created': 1, 'updated': 0, 'deleted': 0})
+    self.assertEqual(changes['course'],
+      {'created': 5, 'updated': 0, 'deleted': 0})
+
+    c = models.Course.objects.get(department='AST', number=401)
+    c.title = 'Totally Not Cosmology'
+    c.save()
+
+    changes = data.update_term_data(self.json_data)
+    self.assertEqual(changes['course'],
+      {'created': 0, 'updated': 1, 'deleted': 0})
+    for model, counts in changes.items():
+      if model != 'course':
+        self.assertEqual(counts,
+          {'created': 0, 'updated': 0, 'deleted': 0}, model)
+
+  def test_update_term_data_version(self):
+    '''
+    update_term_data bumps the version of the dataset and of the term only
+    if an object changed, and that of the term's meetings only if they
+    changed.
+    '''
+    data.update_term_data(self.json_data)
+    term = str(models.Semester.objects.get().term_id)
+    meetings = data.meetings_scope(term)
+    version = versions.get(data.DATASET).version
+    self.assertEqual(versions.get(data.DATASET, term).version, version)
+    self.assertEqual(versions.get(data.DATASET, meetings).version, version)
+
+    data.update_term_data(self.json_data)
+    self.assertEqual(versions.get(data.DATASET).version, version)
+
+    models.Section.objects.update(enrollment=0)
+    data.update_term_data(self.json_data)
+    self.assertEqual(versions.get(data.DATASET).version, version + 1)
+    self.assertEqual(versions.get(data.DATASET, term).version, version + 1)
+    self.assertEqual(versions.get(data.DATASET, meetings).version, version)
+
+    models.Meeting.objects.filter(day=models.Meeting.DAY_FRIDAY).delete()
+    data.update_term_data(self.json_data)
+    self.assertEqual(versions.get(data.DATASET, meetings).version,
+      version + 2)
+
+  def test_registration_windows(self):
+    data.update_term_data(self.json_data)
+    self.assertEqual(data.registration_windows(), [
+      (datetime.date(2018, 2, 5), datetime.date(2018, 2, 19))])
+
 EXPECTED_OBJECTS = {
   'semester': models.Semester(
     term=models.Semester.TERM_SPRING,
@@ -0,0 +1,169 @@
+# pdata/courses/tests/test_delta.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for row versions and delta sync of the courses API.
+
+from pdata import versions
+from pdata.utils import bulk_upsert
+from courses import models, data
+from courses.tests.test_feed import FeedTestBase
+
+class DeltaTestBase(FeedTestBase):
+  def setUp(self):
+    super().setUp()
+    self.version = versions.get(data.DATASET).version
+
+  def delete_section(self) -> int:
+    '''
+    Delete the section, as a sync which no longer expects it would.
+
+    :return: version of the dataset made by the deletion
+    '''
+    version = versions.reserve(data.DATASET)
+    bulk_upsert(models.Section.objects.filter(offering=self.section.offering),
+      lambda d: hash(d['number']),
+      [{'number': s.number} for s in models.Section.objects
+        .filter(offering=self.section.offering)
+        .exclude(id=self.section.id)],
+      delete=True, version=version)
+    versions.bump(data.DATASET)
+    return version
+
+class TestRowVersions(DeltaTestBase):
+  def test_changed_rows(self):
+    # The initial sync creates every row.
+    for model_t in (models.Course, models.CrossListing, models.Semester,
+        models.Instructor, models.Offering, models.Section, models.Meeting):
+      self.assertEqual(set(model_t.objects.values_list('version', flat=True)),
+        {self.version}, model_t)
+
+    # Only changed rows are tagged with the new version.
+    self.enroll(3)
+    self.assertEqual(list(models.Section.objects
+      .filter(version__gt=self.version)
+      .values_list('id', flat=True)), [self.section.id])
+    self.assertEqual(models.Section.objects.get(id=self.section.id).version,
+      versions.get(data.DATASET).version)
+    self.assertFalse(models.Meeting.objects.filter(
+      version__gt=self.version).exists())
+
+    # An unchanged sync tags nothing.
+    data.update_term_data(self.json_data)
+    self.assertEqual(versions.get(data.DATASET).version, self.version + 1)
+
+  def test_offering_instructors(self):
+    for subject in self.json_data['term'][0]['subjects']:
+      for course in subject['courses']:
+        if course['guid'] == str(self.section.offering.registrar_guid):
+          course['instructors'].append({'emplid': '000000099',
+            'first_name': 'Prof', 'last_name': 'Zulu',
+            'full_name': 'Prof Zulu'})
+    data.update_term_data(self.json_data)
+
+    self.assertEqual(list(models.Offering.objects
+      .filter(version__gt=self.version)
+      .values_list('id', flat=True)), [self.section.offering_id])
+    self.assertEqual(list(models.Instructor.objects
+      .filter(version__gt=self.version)
+      .values_list('employee_id', flat=True)), ['000000099'])
+
+  def test_tombstones(self):
+    meetings = list(models.Meeting.objects.filter(section=self.section)
+      .order_by('id').values_list('id', flat=True))
+    self.assertTrue(meetings)
+
+    version = self.delete_section()
+    self.assertFalse(models.Section.objects.filter(
+      id=self.section.id).exists())
+
+    # Rows deleted by cascades are recorded as well.
+    self.assertEqual(versions.deleted(models.Section, self.version),
+      [self.section.id])
+    self.assertEqual(sorted(versions.deleted(models.Meeting, self.version)),
+      meetings)
+    self.assertEqual(versions.deleted(models.Section, version), [])
+    self.assertEqual(versions.deleted(models.Offering, self.version), [])
+
+class TestDeltaSync(DeltaTestBase):
+  ENDPOINTS = ('listings', 'crosslistings', 'semesters', 'instructors',
+    'offerings', 'sections', 'meetings')
+
+  def test_since(self):
+    for endpoint in self.ENDPOINTS:
+      response = self.client.get('/courses/%s/' % endpoint,
+        {'since': self.version})
+      self.assertEqual(response.status_code, 200, endpoint)
+      self.assertEqual(response.json(), {'next': None, 'previous': None,
+        'results': [], 'deleted': [], 'version': self.version}, endpoint)
+
+      # Without 'since', all objects are listed.
+      response = self.client.get('/courses/%s/' % endpoint)
+      self.assertEqual(set(response.json()), {'next', 'previous', 'results'})
+      self.assertTrue(response.json()['results'], endpoint)
+
+    self.enroll(3)
+    for params in ({}, {'fields': 'enrollment'}):
+      response = self.client.get('/courses/sections/', dict(params,
+        since=self.version))
+      content = response.json()
+      self.assertEqual([s['enrollment'] for s in content['results']], [3])
+      self.assertEqual(content['version'], self.version + 1)
+
+    response = self.client.get('/courses/meetings/', {'since': self.version})
+    self.assertEqual(response.json()['results'], [])
+
+  def test_deleted(self):
+    meetings = set(models.Meeting.objects.filter(section=self.section)
+      .values_list('id', flat=True))
+    self.delete_section()
+
+    content = self.client.get('/courses/sections/',
+      {'since': self.version}).json()
+    self.assertEqual(content['deleted'], [self.section.id])
+    self.assertEqual(content['version'], self.version + 1)
+    content = self.client.get('/courses/meetings/',
+      {'since': self.version}).json()
+    self.assertEqual(set(content['deleted']), meetings)
+
+    # Deletions already seen are not listed again.
+    content = self.client.get('/courses/sections/',
+      {'since': content['version']}).json()
+    self.assertEqual(content['deleted'], [])
+
+  def test_sync_deleted(self):
+    '''
+    Sections which a sync no longer lists are deleted, and listed as such.
+    '''
+    for subject in self.json_data['term'][0]['subjects']:
+      for course in subject['courses']:
+        if len(course['classes']) > 1:
+          dropped = course['classes'].pop()
+          break
+      else:
+        continue
+      break
+    section = models.Section.objects.get(number=int(dropped['class_number']))
+    meetings = set(models.Meeting.objects.filter(section=section)
+      .values_list('id', flat=True))
+
+    changes = data.update_term_data(self.json_data)
+    self.assertEqual(changes['section']['deleted'], 1)
+    self.assertFalse(models.Section.objects.filter(id=section.id).exists())
+
+    content = self.client.get('/courses/sections/',
+      {'since': self.version}).json()
+    self.assertEqual(content['deleted'], [section.id])
+    self.assertEqual(content['version'], self.version + 1)
+    content = self.client.get('/courses/meetings/',
+      {'since': self.version}).json()
+    self.assertEqual(set(content['deleted']), meetings)
+
+  def test_invalid(self):
+    response = self.client.get('/courses/sections/', {'since': 'x'})
+    self.assertEqual(response.status_code, 400)
+
+    # Retrieving a single object ignores 'since'.
+    response = self.client.get('/courses/sections/%d/' % self.section.id,
+      {'since': self.version + 10})
+    self.assertEqual(response.status_code, 200)
@@ -0,0 +1,124 @@
+# pdata/courses/tests/test_export.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the export of a semester's data.
+
+import io
+import os
+import csv
+import gzip
+import json
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import override_settings
+
+from courses import models, export
+from courses.tests.test_views import CourseAPITestBase
+
+class TestExport(CourseAPITestBase):
+  def setUp(self):
+    super().setUp()
+    self.term = models.Semester.objects.get().term_id
+
+  def get(self, path: str, **headers) -> tuple:
+    response = self.client.get('/courses/export/%s' % path,
+      {'semester': self.term}, **headers)
+    self.assertEqual(response.status_code, 200)
+    self.assertTrue(response.streaming)
+    return response, b''.join(response.streaming_content)
+
+  def test_ndjson(self):
+    response, content = self.get('sections.ndjson')
+    self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+    self.assertEqual(response['Content-Disposition'],
+      'attachment; filename="%d-sections.ndjson"' % self.term)
+
+    rows = [json.loads(line) for line in content.decode('utf-8').splitlines()]
+    self.assertEqual([r['id'] for r in rows],
+      list(models.Section.objects.order_by('id').values_list('id', flat=True)))
+
+    section = models.Section.objects.get(number=40160)
+    self.assertEqual(rows[[r['id'] for r in rows].index(section.id)], {
+      'id': section.id,
+      'class_number': 40160,
+      'section': 'L01',
+      'status': section.status,
+      'capacity': section.capacity,
+      'enrollment': section.enrollment,
+      'course_id': section.offering.course_id,
+      'department': 'COS',
+      'number': 333,
+      'letter': '',
+      'title': section.offering.course.title,
+      })
+
+  def test_csv(self):
+    response, content = self.get('meetings.csv')
+    self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+    rows = list(csv.DictReader(io.StringIO(content.decode('utf-8'))))
+    self.assertEqual(len(rows), models.Meeting.objects.count())
+    self.assertEqual(list(rows[0]),
+      [name for (name, _) in export.TABLES['meetings'].columns])
+
+    lab = [r for r in rows if r['class_number'] == '42041']
+    self.assertEqual([(r['department'], r['section'], r['day'],
+      r['start_time'], r['end_time'], r['building'], r['room'])
+      for r in lab], [('ISC', 'B01', str(models.Meeting.DAY_TUESDAY),
+        '13:30:00', '16:20:00', 'Thomas Laboratory', '012')])
+
+  def test_gzip(self):
+    _, expected = self.get('meetings.ndjson')
+    response, content = self.get('meetings.ndjson',
+      HTTP_ACCEPT_ENCODING='gzip, deflate')
+    self.assertEqual(response['Content-Encoding'], 'gzip')
+    self.assertIn('Accept-Encoding', response['Vary'])
+    self.assertEqual(gzip.decompress(content), expected)
+
+  def test_chunks(self):
+    '''
+    Rows are read in chunks, as the response is streamed.
+    '''
+    with override_settings(COURSES_EXPORT_CHUNK_SIZE=2):
+      response = self.client.get('/courses/export/sections.csv',
+        {'semester': self.term})
+
+    # The 7 sections are read 2 at a time.
+    with self.assertNumQueries(4):
+      content = b''.join(response.streaming_content)
+    self.assertEqual(len(content.decode('utf-8').splitlines()), 8)
+
+  def test_empty(self):
+    models.Section.objects.all().delete()
+    _, content = self.get('sections.csv')
+    self.assertEqual(content.decode('utf-8').splitlines(),
+      [','.join(name for (name, _) in export.TABLES['sections'].columns)])
+
+  def test_invalid(self):
+    for params in ({}, {'semester': 'spring'}, {'semester': self.term + 1}):
+      response = self.client.get('/courses/export/sections.csv', params)
+      self.assertEqual(response.status_code, 400, params)
+
+    response = self.client.get('/courses/export/courses.csv',
+      {'semester': self.term})
+    self.assertEqual(response.status_code, 404)
+
+  def test_command(self):
+    _, expected = self.get('sections.csv')
+
+    with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'sections.csv.gz')
+      call_command('exportsemester', self.term, 'sections', format='csv',
+        gzip=True, output=path, chunk_size=3)
+      with open(path, 'rb') as f:
+        self.assertEqual(gzip.decompress(f.read()), expected)
+
+    stdout = io.StringIO()
+    call_command('exportsemester', self.term, 'sections', format='csv',
+      stdout=stdout)
+    self.assertEqual(stdout.getvalue().encode('utf-8'), expected)
+
+    with self.assertRaises(CommandError):
+      call_command('exportsemester', self.term + 1, 'sections')
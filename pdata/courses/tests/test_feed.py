@@ -0,0 +1,219 @@
+# pdata/courses/tests/test_feed.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the feed of changes to sections.
+
+import copy
+import json
+import asyncio
+import datetime
+import concurrent.futures
+
+from django.test import override_settings
+from django.utils import timezone
+
+from courses import models, data, feed, feedserver
+from courses.tests.test_views import CourseAPITestBase
+
+class InlineExecutor(concurrent.futures.Executor):
+  '''
+  Runs queries in the test's thread, so that they see its transaction.
+  '''
+  def submit(self, function, *args, **kwargs):
+    future = concurrent.futures.Future()
+    future.set_result(function(*args, **kwargs))
+    return future
+
+class FeedTestBase(CourseAPITestBase):
+  def setUp(self):
+    super().setUp()
+    # The example data is shared by all tests, and is changed by `enroll`.
+    self.json_data = copy.deepcopy(self.json_data)
+    self.section = models.Section.objects.select_related('offering').get(
+      number=40160)
+
+  def enroll(self, enrollment: int) -> None:
+    '''
+    Sync a change to the enrollment of the section.
+    '''
+    for subject in self.json_data['term'][0]['subjects']:
+      for course in subject['courses']:
+        for section in course['classes']:
+          if int(section['class_number']) == self.section.number:
+            section['enrollment'] = str(enrollment)
+    data.update_term_data(self.json_data)
+
+class TestFeed(FeedTestBase):
+  def test_record(self):
+    # The initial sync records every section.
+    self.assertEqual(feed.latest(), models.Section.objects.count())
+
+    since = feed.latest()
+    self.enroll(3)
+    changes = feed.read(since)
+    self.assertEqual([(c['section'], c['course'], c['enrollment'])
+      for c in changes], [(self.section.id, self.section.offering.course_id,
+        3)])
+    self.assertEqual(changes[0]['seq'], feed.latest())
+
+    # Unchanged sections are not recorded.
+    data.update_term_data(self.json_data)
+    self.assertEqual(feed.read(since), changes)
+
+  def test_retention(self):
+    models.SectionChange.objects.update(
+      changed_at=timezone.now() - datetime.timedelta(days=30))
+    latest = feed.latest()
+    with override_settings(COURSES_FEED_RETENTION=60):
+      self.enroll(3)
+
+    self.assertEqual(list(models.SectionChange.objects.values_list('id',
+      flat=True)), [latest + 1])
+    self.assertTrue(feed.expired(0))
+    self.assertFalse(feed.expired(latest))
+
+    # The latest change is always kept, so that sequence numbers are not
+    # reused.
+    models.SectionChange.objects.update(
+      changed_at=timezone.now() - datetime.timedelta(days=30))
+    with override_settings(COURSES_FEED_RETENTION=60):
+      data.update_term_data(self.json_data)
+    self.assertEqual(feed.latest(), latest + 1)
+
+  def test_endpoint(self):
+    response = self.client.get('/courses/changes/')
+    since = response.json()['next']
+    self.assertEqual(since, feed.latest())
+
+    self.enroll(3)
+    other = models.Section.objects.exclude(
+      offering=self.section.offering).first()
+    for params in ({'sections': self.section.id},
+        {'courses': self.section.offering.course_id},
+        {'sections': other.id},
+        {}):
+      response = self.client.get('/courses/changes/', dict(params,
+        since=since))
+      self.assertEqual(response.status_code, 200)
+      content = response.json()
+      self.assertEqual([c['section'] for c in content['changes']],
+        [] if params == {'sections': other.id} else [self.section.id], params)
+      self.assertEqual(content['next'], feed.latest())
+      self.assertFalse(content['expired'])
+
+    for params in ({'since': 'x'}, {'sections': '1,x'},
+        {'courses': ','.join(map(str, range(feed.MAX_FOLLOWED + 1)))}):
+      response = self.client.get('/courses/changes/', params)
+      self.assertEqual(response.status_code, 400, params)
+
+class TestFeedServer(FeedTestBase):
+  def setUp(self):
+    super().setUp()
+    self.loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(self.loop)
+    self.addCleanup(self.close_loop)
+
+    self.feed = feedserver.Feed(0.01, InlineExecutor())
+    self.server = feedserver.FeedServer(self.feed, timeout=0.5,
+      heartbeat=0.05)
+    server = self.loop.run_until_complete(asyncio.start_server(
+      self.server.handle, '127.0.0.1', 0))
+    self.addCleanup(lambda: self.loop.run_until_complete(
+      server.wait_closed()))
+    self.addCleanup(server.close)
+    self.port = server.sockets[0].getsockname()[1]
+    self.loop.run_until_complete(self.feed.start())
+
+  def close_loop(self) -> None:
+    '''
+    Stop the connections still being handled (such as streams), then close
+    the event loop.
+    '''
+    tasks = asyncio.Task.all_tasks(self.loop)
+    for task in tasks:
+      task.cancel()
+    self.loop.run_until_complete(asyncio.gather(*tasks,
+      return_exceptions=True))
+    self.loop.close()
+    asyncio.set_event_loop(None)
+
+  async def request(self, path: str, headers: str = '') -> tuple:
+    reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+    writer.write(('GET %s HTTP/1.1\r\nHost: localhost\r\n%s\r\n' % (path,
+      headers)).encode('latin-1'))
+    return reader, writer
+
+  async def response(self, path: str) -> tuple:
+    reader, writer = await self.request(path)
+    status = (await reader.readline()).split()[1]
+    while (await reader.readline()).strip():
+      pass
+    body = await reader.read()
+    writer.close()
+    return int(status), json.loads(body.decode('utf-8'))
+
+  def test_poll(self):
+    since = self.feed.cursor
+
+    async def poll() -> tuple:
+      response = asyncio.ensure_future(self.response(
+        '/courses/changes/poll?sections=%d' % self.section.id))
+      await asyncio.sleep(0.05)
+      self.assertFalse(response.done())
+
+      # Changes are sent once they are read by the feed.
+      self.enroll(3)
+      await self.feed.poll()
+      return await response
+
+    status, content = self.loop.run_until_complete(poll())
+    self.assertEqual(status, 200)
+    self.assertEqual([c['enrollment'] for c in content['changes']], [3])
+    self.assertEqual(content['next'], feed.latest())
+
+    # Changes already read are returned at once.
+    status, content = self.loop.run_until_complete(self.response(
+      '/courses/changes/poll?since=%d' % since))
+    self.assertEqual([c['section'] for c in content['changes']],
+      [self.section.id])
+
+    # Without changes, the response is sent after the timeout.
+    status, content = self.loop.run_until_complete(self.response(
+      '/courses/changes/poll?courses=%d' % self.section.offering.course_id))
+    self.assertEqual(content, {'changes': [], 'next': feed.latest(),
+      'expired': False})
+    self.assertEqual(self.feed._courses, {})
+
+  def test_stream(self):
+    since = self.feed.cursor
+    self.enroll(3)
+    self.loop.run_until_complete(self.feed.poll())
+
+    async def stream() -> bytes:
+      reader, writer = await self.request('/courses/changes/stream',
+        'Last-Event-ID: %d\r\n' % since)
+      content = await reader.readuntil(b': heartbeat\n\n')
+      self.enroll(4)
+      await self.feed.poll()
+      while b'"enrollment": 4' not in content:
+        content += await asyncio.wait_for(
+          reader.readuntil(b': heartbeat\n\n'), 1)
+      writer.close()
+      return content.decode('utf-8')
+
+    content = self.loop.run_until_complete(stream())
+    self.assertTrue(content.startswith('HTTP/1.1 200 OK\r\n'))
+    self.assertIn('Content-Type: text/event-stream', content)
+
+    events = [e for e in content.split('\r\n\r\n', 1)[1].split('\n\n')
+      if e.startswith('id:')]
+    self.assertEqual([json.loads(e.split('data: ', 1)[1])['enrollment']
+      for e in events], [3, 4])
+    self.assertEqual(events[1].split('\n')[0], 'id: %d' % feed.latest())
+
+  def test_invalid(self):
+    for path, expected in (('/courses/changes/poll?since=x', 400),
+        ('/courses/changes/', 404)):
+      status, _ = self.loop.run_until_complete(self.response(path))
+      self.assertEqual(status, expected, path)
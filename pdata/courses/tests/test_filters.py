@@ -0,0 +1,213 @@
+# pdata/courses/tests/test_filters.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the filtering and ordering of the courses API.
+
+import unittest
+
+from django.db import connection
+from django.db.models import QuerySet
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from courses import models, views
+from courses.tests.test_views import CourseAPITestBase
+
+class TestFilters(CourseAPITestBase):
+  '''
+  Test the query parameter filters of the list endpoints.
+  '''
+  def results(self, endpoint: str, **params) -> list:
+    params.setdefault('page_size', 1000)
+    response = self.client.get('/courses/%s/' % endpoint, params)
+    self.assertEqual(response.status_code, 200)
+    return response.json()['results']
+
+  def test_listings(self):
+    courses = self.results('listings', department='cos', number=333)
+    self.assertEqual([(c['department'], c['number']) for c in courses],
+      [('COS', 333)])
+
+    self.assertEqual(len(self.results('listings',
+        track=models.Course.TRACK_UNDERGRAD)),
+      models.Course.objects.filter(
+        track=models.Course.TRACK_UNDERGRAD).count())
+
+  def test_offerings(self):
+    offering = models.Offering.objects.first()
+    offerings = self.results('offerings', course=offering.course_id,
+      semester=offering.semester.term_id)
+    self.assertEqual([o['id'] for o in offerings], [offering.pk])
+
+    # Semesters are given by their term ID, as with every other endpoint.
+    self.assertEqual(len(self.results('offerings',
+        semester=offering.semester.term_id)),
+      models.Offering.objects.filter(semester=offering.semester).count())
+    self.assertEqual(self.results('offerings',
+      semester=offering.semester_id), [])
+
+  def test_sections(self):
+    models.Section.objects.filter(
+      pk=models.Section.objects.first().pk).update(has_open_seats=False)
+
+    sections = self.results('sections', has_open_seats='true')
+    self.assertEqual(len(sections),
+      models.Section.objects.filter(has_open_seats=True).count())
+    self.assertTrue(all(s['enrollment'] < s['capacity'] for s in sections))
+
+    sections = self.results('sections', status=models.Section.STATUS_OPEN,
+      has_open_seats='false')
+    self.assertEqual(len(sections), models.Section.objects.filter(
+      status=models.Section.STATUS_OPEN, has_open_seats=False).count())
+
+  def test_meetings(self):
+    meetings = self.results('meetings', day=models.Meeting.DAY_MONDAY,
+      start_after='11:00', end_before='17:00')
+    self.assertTrue(meetings)
+    for meeting in meetings:
+      self.assertEqual(meeting['day'], models.Meeting.DAY_MONDAY)
+      self.assertGreaterEqual(meeting['start_time'], '11:00')
+      self.assertLessEqual(meeting['end_time'], '17:00')
+
+    building = models.Meeting.objects.first().building
+    self.assertEqual(len(self.results('meetings', building=building)),
+      models.Meeting.objects.filter(building=building).count())
+
+  def test_instructors(self):
+    instructor = models.Instructor.objects.first()
+    instructors = self.results('instructors',
+      employee_id=instructor.employee_id)
+    self.assertEqual([i['id'] for i in instructors], [instructor.pk])
+
+    prefix = instructor.last_name[:2]
+    instructors = self.results('instructors', last_name=prefix)
+    self.assertIn(instructor.pk, [i['id'] for i in instructors])
+    self.assertTrue(all(i['last_name'].startswith(prefix)
+      for i in instructors))
+
+  def test_invalid(self):
+    for endpoint, params in (
+        ('listings', {'number': 'abc'}),
+        ('sections', {'has_open_seats': 'maybe'}),
+        ('meetings', {'start_after': '25:00'})):
+      response = self.client.get('/courses/%s/' % endpoint, params)
+      self.assertEqual(response.status_code, 400, params)
+      self.assertIn(list(params)[0], response.json())
+
+class TestOrdering(CourseAPITestBase):
+  '''
+  Test the ordering of the list endpoints.
+  '''
+  def test_ordering(self):
+    '''
+    Following the next links of an ordered list returns every object
+    exactly once, in order.
+    '''
+    expected = list(models.Meeting.objects
+      .order_by('-start_time', 'id')
+      .values_list('id', flat=True))
+    ids = []
+
+    url = '/courses/meetings/?ordering=-start_time&page_size=4'
+    while url is not None:
+      response = self.client.get(url).json()
+      ids.extend(m['id'] for m in response['results'])
+      url = response['next']
+
+    self.assertEqual(ids, expected)
+
+  def test_ties(self):
+    '''
+    Objects sharing the value of the ordering field are each returned
+    exactly once, however many of them there are, in both directions.
+    '''
+    offering = models.Offering.objects.first()
+    models.Section.objects.bulk_create(models.Section(offering=offering,
+        number=90000 + i, section_id='%03X' % i,
+        status=models.Section.STATUS_OPEN, capacity=10, enrollment=0)
+      for i in range(1500))
+    expected = list(models.Section.objects
+      .order_by('-status', 'id')
+      .values_list('id', flat=True))
+    self.assertGreater(models.Section.objects.filter(
+      status=models.Section.STATUS_OPEN).count(), 1000)
+
+    ids = []
+    url = '/courses/sections/?ordering=-status&page_size=100'
+    while url is not None:
+      response = self.client.get(url).json()
+      ids.extend(s['id'] for s in response['results'])
+      url = response['next']
+      previous = response['previous']
+      last = len(response['results'])
+    self.assertEqual(ids, expected)
+
+    ids = []
+    while previous is not None:
+      response = self.client.get(previous).json()
+      ids[:0] = [s['id'] for s in response['results']]
+      previous = response['previous']
+    self.assertEqual(ids, expected[:-last])
+
+  def test_invalid_cursor(self):
+    response = self.client.get('/courses/sections/',
+      {'ordering': 'status', 'cursor': 'cD0x'})
+    self.assertEqual(response.status_code, 404)
+
+  def test_not_whitelisted(self):
+    '''
+    Fields which are not whitelisted are ignored.
+    '''
+    response = self.client.get('/courses/listings/',
+      {'ordering': 'description'}).json()
+    self.assertEqual([c['id'] for c in response['results']],
+      sorted(c['id'] for c in response['results']))
+
+@unittest.skipUnless(connection.vendor == 'sqlite',
+  'query plans are checked with SQLite')
+class TestQueryPlans(CourseAPITestBase):
+  '''
+  Test that each filter is answered by an index. Without statistics, SQLite
+  prefers scanning the table in order of primary key to using an index for
+  a range, so time ranges are checked along with the ordering (or day) that
+  they are used with.
+  '''
+  FILTERS = (
+    (views.CourseViewset, {'department': 'COS'}),
+    (views.CourseViewset, {'number': '126'}),
+    (views.CourseViewset, {'letter': 'A'}),
+    (views.CourseViewset, {'track': '1'}),
+    (views.OfferingViewset, {'semester': '1184'}),
+    (views.OfferingViewset, {'course': '1'}),
+    (views.SectionViewset, {'status': '1'}),
+    (views.SectionViewset, {'has_open_seats': 'true'}),
+    (views.MeetingViewset, {'day': '1'}),
+    (views.MeetingViewset, {'building': 'Friend Center'}),
+    (views.MeetingViewset, {'day': '1', 'start_after': '10:00'}),
+    (views.MeetingViewset, {'start_after': '10:00',
+      'ordering': 'start_time'}),
+    (views.MeetingViewset, {'end_before': '12:00', 'ordering': 'end_time'}),
+    (views.InstructorViewset, {'employee_id': '960000000'}),
+    (views.InstructorViewset, {'last_name': 'Sm'}),
+    )
+
+  def filtered(self, viewset: type, params: dict) -> QuerySet:
+    '''
+    Get the queryset of a list endpoint, with the given query parameters.
+    '''
+    view = viewset(action='list', format_kwarg=None)
+    view.request = Request(APIRequestFactory().get('/', params))
+    return view.filter_queryset(view.get_queryset())
+
+  def query_plan(self, queryset: QuerySet) -> list:
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+      cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+      return [row[-1] for row in cursor.fetchall()]
+
+  def test_filters_use_index(self):
+    for viewset, params in self.FILTERS:
+      plan = self.query_plan(self.filtered(viewset, params))
+      self.assertRegex(plan[0], r'^SEARCH \w+ USING (COVERING )?INDEX',
+        '%s %s: %s' % (viewset.__name__, params, plan))
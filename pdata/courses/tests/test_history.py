@@ -0,0 +1,173 @@
+# pdata/courses/tests/test_history.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the enrollment history of sections.
+
+import copy
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+
+from pdata import versions
+from courses import models, data, history
+from courses.tests.test_feed import FeedTestBase
+
+Sample = history.Sample
+
+class TestEncoding(TestCase):
+  def test_round_trip(self):
+    samples = [
+      Sample(1538352000, 1, 160, 0),
+      Sample(1538352060, 1, 160, 128),
+      Sample(1538352120, 2, 150, 150),
+      Sample(1538438520, 1, 200, 3),
+      ]
+    encoded = history.encode(samples)
+    self.assertEqual(history.decode(encoded), samples)
+    # Later samples only take a few bytes.
+    self.assertEqual(len(history.encode(samples[1:2], samples[0])), 5)
+
+    # Samples may be appended relative to the last.
+    self.assertEqual(history.decode(history.encode(samples[:2])
+      + history.encode(samples[2:], samples[1])), samples)
+
+  def test_resample(self):
+    samples = [Sample(t, 1, 10, e) for (t, e) in ((0, 0), (30, 1), (59, 2),
+      (60, 3), (200, 4))]
+    self.assertEqual(history.resample(samples, 60),
+      [samples[2], samples[3], samples[4]])
+    self.assertEqual(history.resample(samples, 0), samples)
+
+  def test_total(self):
+    self.assertEqual(history.total([
+      [Sample(0, 1, 10, 1), Sample(20, 1, 10, 5)],
+      [Sample(10, 1, 20, 2), Sample(20, 1, 20, 3)],
+      ]), [(0, 10, 1), (10, 30, 3), (20, 30, 8)])
+
+class TestHistory(FeedTestBase):
+  def test_append(self):
+    # The initial sync records every section.
+    self.assertEqual(models.EnrollmentHistory.objects.count(),
+      models.Section.objects.count())
+
+    self.enroll(3)
+    self.enroll(4)
+    record = models.EnrollmentHistory.objects.get(section=self.section)
+    self.assertEqual(record.count, 3)
+    self.assertEqual([s.enrollment for s in history.decode(record.samples)],
+      [self.section.enrollment, 3, 4])
+
+  def test_removed_section(self):
+    '''
+    The history of a section which leaves the feed is kept, and the section
+    is recreated with the same ID once it returns.
+    '''
+    self.enroll(3)
+    changes = list(models.SectionChange.objects.filter(section=self.section)
+      .values_list('id', flat=True))
+
+    removed = copy.deepcopy(self.json_data)
+    for subject in removed['term'][0]['subjects']:
+      for course in subject['courses']:
+        course['classes'] = [c for c in course['classes']
+          if int(c['class_number']) != self.section.number]
+    data.update_term_data(removed)
+    self.assertFalse(models.Section.objects.filter(
+      id=self.section.id).exists())
+    deleted_at = versions.get(data.DATASET).version
+
+    data.update_term_data(self.json_data)
+    section = models.Section.objects.get(number=self.section.number)
+    self.assertEqual(section.id, self.section.id)
+
+    record = models.EnrollmentHistory.objects.get(section=section)
+    self.assertEqual([s.enrollment for s in history.decode(record.samples)],
+      [self.section.enrollment, 3, 3])
+    self.assertEqual((record.term_id, record.number),
+      (section.offering.semester.term_id, section.number))
+    self.assertEqual(list(models.SectionChange.objects
+      .filter(section=section)
+      .values_list('id', flat=True))[:len(changes)], changes)
+
+    # The section is listed as changed, rather than deleted.
+    for since in (deleted_at - 1, deleted_at):
+      content = self.client.get('/courses/sections/',
+        {'since': since}).json()
+      self.assertEqual(content['deleted'], [])
+      self.assertIn(section.id, [s['id'] for s in content['results']])
+
+  def test_section(self):
+    self.enroll(3)
+    response = self.client.get('/courses/sections/%d/history/' %
+      self.section.id)
+    self.assertEqual(response.status_code, 200)
+
+    content = response.json()
+    self.assertEqual(content['section'], self.section.id)
+    self.assertEqual([(s['status'], s['capacity'], s['enrollment'])
+      for s in content['samples']], [
+        (self.section.status, self.section.capacity, self.section.enrollment),
+        (self.section.status, self.section.capacity, 3)])
+
+    # Both samples are within the same minute.
+    response = self.client.get('/courses/sections/%d/history/' %
+      self.section.id, {'resolution': 3600})
+    self.assertEqual([s['enrollment'] for s in response.json()['samples']],
+      [3])
+
+    for resolution in ('x', '-1'):
+      response = self.client.get('/courses/sections/%d/history/' %
+        self.section.id, {'resolution': resolution})
+      self.assertEqual(response.status_code, 400)
+
+  def test_course(self):
+    course = self.section.offering.course
+    sections = list(models.Section.objects.filter(offering__course=course)
+      .order_by('id'))
+
+    response = self.client.get('/courses/listings/%d/history/' % course.id,
+      {'semester': self.section.offering.semester.term_id})
+    self.assertEqual(response.status_code, 200)
+    content = response.json()
+    self.assertEqual([s['section'] for s in content['sections']],
+      [s.id for s in sections])
+    self.assertEqual(content['total'][-1]['enrollment'],
+      sum(s.enrollment for s in sections))
+    self.assertEqual(content['total'][-1]['capacity'],
+      sum(s.capacity for s in sections))
+
+    response = self.client.get('/courses/listings/%d/history/' % course.id,
+      {'semester': self.section.offering.semester.term_id + 1})
+    self.assertEqual(response.json()['sections'], [])
+
+  def test_downsample(self):
+    record = models.EnrollmentHistory.objects.get(section=self.section)
+    start = history.decode(record.samples)[0]
+    extra = [start._replace(time=start.time + minutes * 60,
+      enrollment=minutes) for minutes in range(1, 180)]
+    record.samples = history.encode([start] + extra)
+    record.count = 180
+    record.save()
+
+    # The semester has not ended.
+    models.Semester.objects.update(
+      end_date=timezone.now().date() + datetime.timedelta(days=1))
+    self.assertEqual(history.downsample(3600, 0)['enrollmenthistory'],
+      {'created': 0, 'updated': 0, 'deleted': 0})
+
+    models.Semester.objects.update(
+      end_date=timezone.now().date() - datetime.timedelta(days=1))
+    self.assertEqual(history.downsample(3600, 0)['enrollmenthistory'][
+      'updated'], models.EnrollmentHistory.objects.count())
+
+    record.refresh_from_db()
+    samples = history.decode(record.samples)
+    self.assertEqual(samples, history.resample([start] + extra, 3600))
+    self.assertEqual((record.count, record.resolution), (len(samples), 3600))
+    self.assertEqual(record.last_enrollment, 179)
+
+    # Histories are only downsampled once.
+    self.assertEqual(history.downsample(3600, 0)['enrollmenthistory'][
+      'updated'], 0)
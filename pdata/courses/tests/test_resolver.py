@@ -0,0 +1,108 @@
+# pdata/courses/tests/test_resolver.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the resolution of course codes.
+
+import json
+
+from courses import models, data, resolver
+from courses.tests.test_views import CourseAPITestBase
+
+class TestResolver(CourseAPITestBase):
+  def setUp(self):
+    super().setUp()
+    resolver._index.clear()
+    self.course = models.Course.objects.get(department='COS', number=432)
+
+  def test_index(self):
+    index = resolver.CodeIndex(
+      [(1, 'COS', 342, '', 'Graph Theory'), (2, 'MAT', 375, '', 'Topology')],
+      [(1, 'MAT', 375, ''), (3, 'ELE', 100, '')])
+
+    results, missing, invalid = index.resolve(['mat375', 'COS 342', 'ELE100',
+      'graph'])
+    self.assertEqual(results, {
+      'mat375': [
+        resolver.Resolution(2, 'MAT', 375, '', 'Topology', False),
+        resolver.Resolution(1, 'COS', 342, '', 'Graph Theory', True),
+        ],
+      'COS 342': [resolver.Resolution(1, 'COS', 342, '', 'Graph Theory',
+        False)],
+      })
+    # Crosslistings of unknown courses are ignored.
+    self.assertEqual(missing, ['ELE100'])
+    self.assertEqual(invalid, ['graph'])
+
+  def test_resolve(self):
+    response = self.client.get('/courses/resolve/',
+      {'codes': 'ele432, COS 432,cos999,xyz'})
+    self.assertEqual(response.status_code, 200)
+
+    expected = {
+      'id': self.course.id,
+      'department': 'COS',
+      'number': 432,
+      'letter': '',
+      'title': self.course.title,
+      }
+    self.assertEqual(response.json(), {
+      'results': {
+        'ele432': [dict(expected, crosslisted=True)],
+        'COS 432': [dict(expected, crosslisted=False)],
+        },
+      'missing': ['cos999'],
+      'invalid': ['xyz'],
+      })
+
+  def post(self, body: dict):
+    return self.client.post('/courses/resolve/', json.dumps(body),
+      content_type='application/json')
+
+  def test_batch(self):
+    codes = ['cos%d' % n for n in range(100, 500)] + ['ele432']
+    response = self.post({'codes': codes})
+    self.assertEqual(response.status_code, 200)
+
+    content = response.json()
+    # COS 233 is a crosslisting of ISC 233.
+    self.assertEqual(list(content['results']), ['cos233', 'cos333', 'cos432',
+      'ele432'])
+    self.assertEqual(content['results']['cos233'][0]['department'], 'ISC')
+    self.assertEqual(len(content['missing']), len(codes) - 4)
+    self.assertEqual(content['results']['ele432'][0]['id'], self.course.id)
+
+    for body in ({}, {'codes': 'COS 432'}, {'codes': [1]}, {'codes': []},
+        {'codes': ['COS %d' % n for n in range(501)]}):
+      response = self.post(body)
+      self.assertEqual(response.status_code, 400, body)
+
+  def test_invalid(self):
+    for params in ({}, {'codes': ' , '},
+        {'codes': ','.join('COS %d' % n for n in range(501))}):
+      response = self.client.get('/courses/resolve/', params)
+      self.assertEqual(response.status_code, 400)
+
+  def test_version(self):
+    '''
+    The index is only rebuilt once courses or crosslistings change.
+    '''
+    self.client.get('/courses/resolve/', {'codes': 'COS 432'})
+    index = resolver.get_index()
+
+    models.Section.objects.update(enrollment=0)
+    data.update_term_data(self.json_data)
+    self.assertIs(resolver.get_index(), index)
+
+    models.Course.objects.filter(id=self.course.id).update(title='')
+    data.update_term_data(self.json_data)
+    self.assertIsNot(resolver.get_index(), index)
+    self.assertEqual(resolver.get_index().courses[self.course.id].title,
+      self.course.title)
+
+  def test_queries(self):
+    self.client.get('/courses/resolve/', {'codes': 'COS 432'})
+    # The version of the codes is read by the response cache and the index.
+    with self.assertNumQueries(2):
+      response = self.client.get('/courses/resolve/', {'codes': 'ELE 432'})
+    self.assertEqual(response.status_code, 200)
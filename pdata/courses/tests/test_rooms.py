@@ -0,0 +1,131 @@
+# pdata/courses/tests/test_rooms.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the occupancy of rooms.
+
+import copy
+import random
+import datetime
+
+from django.test import SimpleTestCase
+
+from courses import models, data, rooms
+from courses.tests.test_views import CourseAPITestBase
+
+def time(minutes: int) -> datetime.time:
+  return datetime.time(*divmod(minutes, 60))
+
+class TestIntervals(SimpleTestCase):
+  def test_same_as_scan(self):
+    '''
+    Bisection finds the same meetings as scanning all of them, including
+    when meetings overlap each other.
+    '''
+    rng = random.Random(0)
+    occupancies = []
+    for section in range(40):
+      start = rng.randrange(8 * 60, 20 * 60)
+      occupancies.append(rooms.Occupancy(time(start),
+        time(start + rng.choice((50, 80, 170))), section))
+    intervals = rooms.Intervals(occupancies)
+
+    for _ in range(500):
+      start = rng.randrange(7 * 60, 22 * 60)
+      end = start + rng.randrange(1, 4 * 60)
+      start, end = time(start), time(min(end, 23 * 60 + 59))
+
+      expected = sorted(o for o in occupancies
+        if o.start < end and start < o.end)
+      self.assertEqual(intervals.overlapping(start, end), expected)
+      self.assertEqual(intervals.is_free(start, end), not expected)
+
+  def test_adjacent(self):
+    intervals = rooms.Intervals([rooms.Occupancy(time(600), time(660), 1)])
+    self.assertTrue(intervals.is_free(time(540), time(600)))
+    self.assertTrue(intervals.is_free(time(660), time(720)))
+    self.assertFalse(intervals.is_free(time(659), time(720)))
+    self.assertEqual(intervals.overlapping(time(660), time(720)), [])
+
+class TestRoomEndpoints(CourseAPITestBase):
+  def setUp(self):
+    super().setUp()
+    rooms._index.clear()
+    self.term = models.Semester.objects.get().term_id
+    self.sections = dict(models.Section.objects.values_list('number', 'id'))
+
+  def get(self, endpoint: str, **params):
+    params.setdefault('semester', self.term)
+    return self.client.get('/courses/rooms/%s/' % endpoint, params)
+
+  def test_free(self):
+    params = {'building': 'Thomas Laboratory',
+      'day': models.Meeting.DAY_TUESDAY}
+
+    response = self.get('free', start='11:30', end='13:30', **params)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.json(), {'building': 'Thomas Laboratory',
+      'day': models.Meeting.DAY_TUESDAY, 'rooms': ['012']})
+
+    response = self.get('free', start='12:20', end='13:30', **params)
+    self.assertEqual(response.json()['rooms'], ['003', '012'])
+    response = self.get('free', **params)
+    self.assertEqual(response.json()['rooms'], [])
+
+    params['day'] = models.Meeting.DAY_FRIDAY
+    response = self.get('free', **params)
+    self.assertEqual(response.json()['rooms'], ['003', '012'])
+
+  def test_occupancy(self):
+    response = self.get('occupancy', building='thomas laboratory',
+      day=models.Meeting.DAY_TUESDAY, start='12:00', end='14:00')
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response.json(), {
+      'building': 'Thomas Laboratory',
+      'day': models.Meeting.DAY_TUESDAY,
+      'rooms': [
+        {'room': '003', 'meetings': [{'section': self.sections[40160],
+          'start': '11:00:00', 'end': '12:20:00'}]},
+        {'room': '012', 'meetings': [{'section': self.sections[42041],
+          'start': '13:30:00', 'end': '16:20:00'}]},
+        ],
+      })
+
+    response = self.get('occupancy', building='Thomas Laboratory',
+      day=models.Meeting.DAY_TUESDAY, room='012', end='12:00')
+    self.assertEqual(response.json()['rooms'],
+      [{'room': '012', 'meetings': []}])
+
+  def test_queries(self):
+    '''
+    Once the index is built, only the version of the semester's meetings is
+    queried.
+    '''
+    params = {'building': 'Peyton Hall', 'day': models.Meeting.DAY_MONDAY}
+    self.get('free', **params)
+    with self.assertNumQueries(2):
+      response = self.get('occupancy', **params)
+    self.assertEqual(len(response.json()['rooms'][0]['meetings']), 1)
+
+  def test_updated_by_sync(self):
+    modified = copy.deepcopy(self.json_data)
+    for subject in modified['term'][0]['subjects']:
+      for course in subject['courses']:
+        if subject['code'] == 'COS' and course['catalog_number'] == '333':
+          course['classes'][0]['schedule']['meetings'][0]['room'] = '012'
+
+    params = {'building': 'Thomas Laboratory',
+      'day': models.Meeting.DAY_THURSDAY}
+    self.assertEqual(self.get('free', **params).json()['rooms'], ['012'])
+    data.update_term_data(modified)
+    self.assertEqual(self.get('free', **params).json()['rooms'], [])
+
+  def test_invalid(self):
+    valid = {'building': 'Peyton Hall', 'day': 0}
+    for params in ({'day': 0}, {'building': 'Peyton Hall'},
+        dict(valid, semester=''), dict(valid, day=7),
+        dict(valid, start='1pm'), dict(valid, start='14:00', end='13:00'),
+        dict(valid, building='Frist Campus Center')):
+      for endpoint in ('free', 'occupancy'):
+        response = self.get(endpoint, **params)
+        self.assertEqual(response.status_code, 400, params)
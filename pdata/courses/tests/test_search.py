@@ -0,0 +1,138 @@
+# pdata/courses/tests/test_search.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for course search.
+
+import copy
+import unittest
+import unittest.mock
+
+from django.db import connection
+from django.test import override_settings
+
+from courses import models, data, search
+from courses.tests.test_views import CourseAPITestBase
+
+class SearchTestBase(object):
+  '''
+  Tests which every search backend must pass. Subclasses set `BACKEND`.
+  '''
+  BACKEND = None
+
+  def setUp(self):
+    super().setUp()
+    search._index.clear()
+    settings = override_settings(COURSES_SEARCH_BACKEND=self.BACKEND)
+    settings.enable()
+    self.addCleanup(settings.disable)
+
+  def codes(self, query: str, **kwargs) -> list:
+    '''
+    Search courses.
+
+    :return: codes of the matching courses, such as 'COS 333', best first
+    '''
+    pks = search.search(query, **kwargs)
+    courses = models.Course.objects.in_bulk(pks)
+    return ['%s %d%s' % (courses[pk].department, courses[pk].number,
+      courses[pk].letter) for pk in pks]
+
+  def test_code(self):
+    self.assertEqual(self.codes('COS 333'), ['COS 333'])
+    self.assertEqual(self.codes('cos333'), ['COS 333'])
+
+  def test_crosslisting(self):
+    self.assertEqual(self.codes('ele 432'), ['COS 432'])
+    self.assertEqual(self.codes('MOL233'), ['ISC 233'])
+
+  def test_title_and_description(self):
+    self.assertEqual(self.codes('cosmology'), ['AST 401'])
+    self.assertEqual(self.codes('extragalactic'), ['AST 401'])
+
+  def test_prefix(self):
+    self.assertEqual(self.codes('progr techn'), ['COS 333'])
+    self.assertEqual(self.codes('intro nat sci'), ['ISC 233'])
+
+  def test_all_terms_match(self):
+    self.assertEqual(self.codes('cosmology security'), [])
+    self.assertEqual(self.codes('!!!'), [])
+
+  def test_ranking(self):
+    '''
+    Matches in codes rank above matches in titles, which rank above matches
+    in descriptions.
+    '''
+    codes = self.codes('cos')
+    self.assertEqual(set(codes),
+      {'COS 333', 'COS 518', 'COS 432', 'ISC 233', 'AST 401'})
+    self.assertEqual(codes[-1], 'AST 401')
+
+    self.assertEqual(self.codes('systems')[0], 'COS 518')
+
+  def test_semester(self):
+    term = models.Semester.objects.get().term_id
+    self.assertEqual(self.codes('cosmology', semester=term), ['AST 401'])
+    self.assertEqual(self.codes('cosmology', semester=term + 1), [])
+
+  def test_limit(self):
+    self.assertEqual(len(self.codes('cos', limit=2)), 2)
+
+  def test_updated_by_sync(self):
+    modified = copy.deepcopy(self.json_data)
+    for subject in modified['term'][0]['subjects']:
+      for course in subject['courses']:
+        if subject['code'] == 'COS' and course['catalog_number'] == '333':
+          course['title'] = 'Zymurgy for Programmers'
+    data.update_term_data(modified)
+
+    self.assertEqual(self.codes('zymurgy'), ['COS 333'])
+    self.assertEqual(self.codes('techniques'), [])
+
+  def test_endpoint(self):
+    response = self.client.get('/courses/search', {'q': 'cosmology'})
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual([(c['department'], c['number'])
+      for c in response.json()['results']], [('AST', 401)])
+
+    response = self.client.get('/courses/search/', {'q': 'cos', 'limit': 1})
+    self.assertEqual(len(response.json()['results']), 1)
+
+  def test_endpoint_invalid(self):
+    for params in ({}, {'q': ' '}, {'q': 'cos', 'semester': 'spring'}):
+      response = self.client.get('/courses/search/', params)
+      self.assertEqual(response.status_code, 400, params)
+
+@unittest.skipUnless(connection.vendor == 'sqlite',
+  'FTS5 is only used with SQLite')
+class TestFTSSearch(SearchTestBase, CourseAPITestBase):
+  BACKEND = 'fts5'
+
+  def test_available(self):
+    self.assertTrue(search.fts_available())
+
+class TestMemorySearch(SearchTestBase, CourseAPITestBase):
+  BACKEND = 'memory'
+
+  @unittest.skipUnless(connection.vendor == 'sqlite',
+    'FTS5 is only used with SQLite')
+  def test_same_ranking_as_fts(self):
+    for query in ('cos', 'advanced', 'sci', 'the', 'a c'):
+      expected = search._search_fts(search.tokenize(query), None, 20)
+      self.assertEqual(search.search(query), expected, query)
+
+  def test_not_rebuilt_by_enrollment(self):
+    '''
+    Syncs which only change enrollments do not rebuild the index.
+    '''
+    self.codes('cos')
+    modified = copy.deepcopy(self.json_data)
+    for subject in modified['term'][0]['subjects']:
+      for course in subject['courses']:
+        for section in course['classes']:
+          section['enrollment'] = str(int(section['enrollment']) + 1)
+
+    with unittest.mock.patch.object(search._index, 'build') as build:
+      data.update_term_data(modified)
+      self.assertEqual(self.codes('cosmology'), ['AST 401'])
+    build.assert_not_called()
@@ -0,0 +1,137 @@
+# pdata/courses/tests/test_snapshots.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the snapshots of each semester's catalog.
+
+import os
+import gzip
+import json
+import tempfile
+from unittest import mock
+
+from django.test import override_settings
+
+from pdata import versions
+from courses import models, data, snapshots, serializers
+from courses.tests.test_views import CourseAPITestBase
+
+class TestSnapshots(CourseAPITestBase):
+  def setUp(self):
+    super().setUp()
+    directory = tempfile.TemporaryDirectory()
+    self.addCleanup(directory.cleanup)
+    self.directory = directory.name
+    override = override_settings(COURSES_SNAPSHOT_DIR=self.directory)
+    override.enable()
+    self.addCleanup(override.disable)
+
+    self.term = models.Semester.objects.get().term_id
+    self.version = versions.get(data.DATASET, str(self.term)).version
+    snapshots.write(self.term)
+
+  def get(self, **headers):
+    return self.client.get('/courses/snapshot/', {'semester': self.term},
+      **headers)
+
+  def test_write(self):
+    self.assertEqual(sorted(os.listdir(self.directory)),
+      ['%d-%d.json.gz' % (self.term, self.version), '%d.json.gz' % self.term])
+    self.assertEqual(snapshots.current_version(self.term), self.version)
+
+    with open(os.path.join(self.directory, '%d.json.gz' % self.term),
+        'rb') as f:
+      document = json.loads(gzip.decompress(f.read()).decode('utf-8'))
+    self.assertEqual(document['version'], self.version)
+    self.assertEqual(document['semester']['term_id'], self.term)
+    self.assertEqual(document['courses'], json.loads(json.dumps(
+      serializers.ExpandedCourseSerializer(serializers.expanded_courses(
+        models.Course.objects.order_by('id')), many=True).data)))
+
+  def test_rewrite(self):
+    '''
+    Rewriting a snapshot replaces the previous version's.
+    '''
+    versions.bump(data.DATASET, scopes=[str(self.term)])
+    snapshots.write(self.term)
+    self.assertEqual(sorted(os.listdir(self.directory)), [
+      '%d-%d.json.gz' % (self.term, self.version + 1),
+      '%d.json.gz' % self.term])
+    self.assertEqual(snapshots.current_version(self.term), self.version + 1)
+
+  def test_get(self):
+    with self.assertNumQueries(0):
+      response = self.get(HTTP_ACCEPT_ENCODING='gzip')
+      content = b''.join(response.streaming_content)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response['Content-Encoding'], 'gzip')
+    self.assertEqual(response['Accept-Ranges'], 'bytes')
+    self.assertEqual(response['ETag'], '"courses-%d"' % self.version)
+    self.assertEqual(int(response['Content-Length']), len(content))
+
+    with self.assertNumQueries(0):
+      plain = self.get()
+      self.assertEqual(b''.join(plain.streaming_content),
+        gzip.decompress(content))
+    self.assertFalse(plain.has_header('Content-Encoding'))
+    self.assertIn('Accept-Encoding', plain['Vary'])
+
+  def test_not_modified(self):
+    response = self.get(HTTP_IF_NONE_MATCH='"courses-%d"' % self.version)
+    self.assertEqual(response.status_code, 304)
+
+    response = self.get(HTTP_IF_NONE_MATCH='"courses-%d"' % (self.version - 1))
+    self.assertEqual(response.status_code, 200)
+
+  def test_range(self):
+    content = b''.join(self.get(HTTP_ACCEPT_ENCODING='gzip').streaming_content)
+    size = len(content)
+
+    for header, (first, last) in (
+        ('bytes=0-9', (0, 9)),
+        ('bytes=10-', (10, size - 1)),
+        ('bytes=-5', (size - 5, size - 1)),
+        ('bytes=5-%d' % (size * 2), (5, size - 1))):
+      response = self.get(HTTP_ACCEPT_ENCODING='gzip', HTTP_RANGE=header)
+      self.assertEqual(response.status_code, 206, header)
+      self.assertEqual(response['Content-Range'],
+        'bytes %d-%d/%d' % (first, last, size), header)
+      self.assertEqual(response.content, content[first:last + 1], header)
+
+    response = self.get(HTTP_ACCEPT_ENCODING='gzip',
+      HTTP_RANGE='bytes=%d-' % size)
+    self.assertEqual(response.status_code, 416)
+    self.assertEqual(response['Content-Range'], 'bytes */%d' % size)
+
+    # Ranges of an outdated version, or of the decompressed catalog, are
+    # ignored.
+    response = self.get(HTTP_ACCEPT_ENCODING='gzip', HTTP_RANGE='bytes=0-9',
+      HTTP_IF_RANGE='"courses-%d"' % (self.version - 1))
+    self.assertEqual(response.status_code, 200)
+    response = self.get(HTTP_RANGE='bytes=0-9')
+    self.assertEqual(response.status_code, 200)
+
+  def test_missing(self):
+    response = self.client.get('/courses/snapshot/',
+      {'semester': self.term + 1})
+    self.assertEqual(response.status_code, 404)
+
+    for params in ({}, {'semester': 'spring'}):
+      response = self.client.get('/courses/snapshot/', params)
+      self.assertEqual(response.status_code, 400, params)
+
+  def test_update(self):
+    '''
+    Updating a semester writes its snapshot once the update is committed.
+    '''
+    # Test cases never commit, so callbacks (which write the snapshot, and the
+    # catalog index) are run immediately instead.
+    with mock.patch('django.db.transaction.on_commit',
+        side_effect=lambda callback: callback()) as on_commit:
+      models.Section.objects.filter(number=40160).update(capacity=0)
+      data.update_term_data(self.json_data)
+    self.assertEqual(on_commit.call_count, 2)
+
+    version = versions.get(data.DATASET, str(self.term)).version
+    self.assertGreater(version, self.version)
+    self.assertEqual(snapshots.current_version(self.term), version)
@@ -0,0 +1,169 @@
+# pdata/courses/tests/test_timetables.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the generation of timetables.
+
+import json
+import time
+import random
+import datetime
+import itertools
+
+from django.test import SimpleTestCase
+
+from courses import models, conflicts, timetables
+from courses.tests.test_views import CourseAPITestBase
+
+def minutes(value: int) -> datetime.time:
+  return datetime.time(*divmod(value, 60))
+
+class TestMask(SimpleTestCase):
+  def test_slots(self):
+    self.assertEqual(conflicts.mask(0, minutes(0), minutes(5)), 0b1)
+    self.assertEqual(conflicts.mask(0, minutes(5), minutes(15)), 0b110)
+    self.assertEqual(conflicts.mask(1, minutes(0), minutes(5)),
+      1 << conflicts.SLOTS_PER_DAY)
+    self.assertEqual(conflicts.mask(0, minutes(60), minutes(60)), 0)
+
+  def test_partial_slots(self):
+    '''
+    Meetings occupy every slot which they overlap.
+    '''
+    self.assertEqual(conflicts.mask(0, minutes(6), minutes(11)), 0b110)
+
+  def test_same_as_intervals(self):
+    '''
+    Meetings on 5-minute boundaries overlap exactly when their masks
+    intersect.
+    '''
+    rng = random.Random(0)
+    for _ in range(500):
+      a, b = [(rng.randrange(2), rng.randrange(96, 240) * 5) for _ in range(2)]
+      a_end, b_end = a[1] + rng.randrange(1, 40) * 5, b[1] + 50
+      overlap = a[0] == b[0] and a[1] < b_end and b[1] < a_end
+      self.assertEqual(bool(
+        conflicts.mask(a[0], minutes(a[1]), minutes(a_end)) &
+        conflicts.mask(b[0], minutes(b[1]), minutes(b_end))), overlap)
+
+class TestGenerate(SimpleTestCase):
+  def test_same_as_brute_force(self):
+    rng = random.Random(0)
+    masks = {}
+    groups = []
+    for group in range(6):
+      sections = []
+      for n in range(rng.randrange(1, 6)):
+        section_id = group * 10 + n
+        day = rng.randrange(5)
+        start = rng.randrange(8 * 12, 18 * 12) * 5
+        masks[section_id] = conflicts.mask(day, minutes(start),
+          minutes(start + rng.choice((50, 80, 180))))
+        sections.append(section_id)
+      groups.append(sections)
+    # Sections with the same meetings are both chosen.
+    masks[groups[0][0]] = masks[groups[0][-1]]
+
+    expected = [choice for choice in itertools.product(*groups)
+      if all(not masks[a] & masks[b]
+        for (a, b) in itertools.combinations(choice, 2))]
+    found = list(timetables.generate(groups, masks))
+    self.assertTrue(expected)
+    self.assertEqual(len(found), len(expected))
+    self.assertEqual(set(found), set(expected))
+
+  def test_no_timetables(self):
+    masks = {1: 0b11, 2: 0b01, 3: 0b10, 4: 0}
+    self.assertEqual(list(timetables.generate([[1], [2, 3], [4]], masks)), [])
+    self.assertEqual(list(timetables.generate([[1], []], masks)), [])
+    self.assertEqual(list(timetables.generate([[2, 3], [1, 4]], masks)),
+      [(2, 4), (3, 4)])
+
+  def test_deadline(self):
+    found = timetables.generate([[1], [2]], {}, deadline=time.monotonic() - 1)
+    with self.assertRaises(timetables.SearchTimeout):
+      next(found)
+
+  def test_section_type(self):
+    self.assertEqual(timetables.section_type('L01'), 'L')
+    self.assertEqual(timetables.section_type('P99A'), 'P')
+    self.assertEqual(timetables.section_type('01'), '')
+
+class TestTimetableEndpoint(CourseAPITestBase):
+  URL = '/courses/timetables/'
+
+  def setUp(self):
+    super().setUp()
+    conflicts._index.clear()
+    self.term = models.Semester.objects.get().term_id
+    self.courses = {'%s %d' % (department, number): pk
+      for (department, number, pk) in models.Course.objects.values_list(
+        'department', 'number', 'id')}
+    self.sections = {
+      '%s %d %s' % (department, number, section_id): pk
+      for (department, number, section_id, pk)
+      in models.Section.objects.values_list('offering__course__department',
+        'offering__course__number', 'section_id', 'id')}
+
+  def get(self, *courses, **params):
+    params.setdefault('semester', self.term)
+    params['courses'] = ','.join(str(self.courses[c]) for c in courses)
+    response = self.client.get(self.URL, params)
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+    return [json.loads(line) for line in
+      b''.join(response.streaming_content).decode('utf-8').splitlines()]
+
+  def test_timetables(self):
+    self.assertEqual(self.get('COS 333', 'ISC 233', 'AST 401'), [
+      {'sections': [self.sections[s] for s in ('COS 333 L01', 'ISC 233 B01',
+        'ISC 233 C01', 'ISC 233 L01', 'AST 401 L01')]},
+      {'count': 1, 'complete': True},
+      ])
+
+  def test_conflicts(self):
+    self.assertEqual(self.get('COS 333', 'COS 432'),
+      [{'count': 0, 'complete': True}])
+    self.assertEqual(self.get('ISC 233', 'COS 518'),
+      [{'count': 0, 'complete': True}])
+
+  def test_exclude(self):
+    '''
+    Excluded sections are not chosen, but their type is still required.
+    '''
+    self.assertEqual(self.get('ISC 233', exclude=self.sections[
+      'ISC 233 C01']), [{'count': 0, 'complete': True}])
+
+  def test_open(self):
+    models.Section.objects.filter(id=self.sections['COS 333 L01']).update(
+      has_open_seats=False)
+    self.assertEqual(self.get('COS 333', open='true'),
+      [{'count': 0, 'complete': True}])
+    self.assertEqual(self.get('COS 333')[-1], {'count': 1, 'complete': True})
+
+  def test_cancelled(self):
+    '''
+    Cancelled sections are ignored, along with their type if all of its
+    sections are cancelled.
+    '''
+    models.Section.objects.filter(id=self.sections['ISC 233 C01']).update(
+      status=models.Section.STATUS_CANCELLED)
+    self.assertEqual(self.get('ISC 233')[0]['sections'],
+      [self.sections['ISC 233 B01'], self.sections['ISC 233 L01']])
+
+  def test_truncated(self):
+    self.assertEqual(self.get('COS 333', limit=0),
+      [{'count': 0, 'complete': False}])
+
+    with self.settings(COURSES_TIMETABLE_TIMEOUT=-1):
+      self.assertEqual(self.get('COS 333'),
+        [{'count': 0, 'complete': False}])
+
+  def test_invalid(self):
+    for params in ({'courses': ''}, {'semester': self.term},
+        {'semester': self.term, 'courses': ','.join(['1'] * 11)},
+        {'semester': self.term, 'courses': 'COS333'},
+        {'semester': self.term, 'courses': '0'},
+        {'semester': self.term + 1, 'courses': self.courses['COS 333']}):
+      response = self.client.get(self.URL, params)
+      self.assertEqual(response.status_code, 400, params)
@@ -0,0 +1,402 @@
+# pdata/courses/tests/test_views.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the courses API.
+
+import re
+import unittest.mock
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.core.cache import caches
+from django.db import connection
+from django.db.models import Count
+from django.utils.http import http_date
+from rest_framework.renderers import JSONRenderer
+
+from pdata import versions, metrics
+from courses import models, data, pagination, serializers, views
+from courses.tests.test_data import CourseDatasetTestBase
+
+class CourseAPITestBase(TestCase):
+  '''
+  Loads the example data before each test.
+  '''
+  DATA_PATH = CourseDatasetTestBase.DATA_PATH
+
+  @classmethod
+  def setUpClass(cls) -> None:
+    super().setUpClass()
+    CourseDatasetTestBase.read_data(cls)
+
+  def setUp(self):
+    caches['responses'].clear()
+    data.update_term_data(self.json_data)
+
+class TestPagination(CourseAPITestBase):
+  '''
+  Test the cursor pagination of list endpoints.
+  '''
+  ENDPOINTS = ('listings', 'crosslistings', 'semesters', 'instructors',
+    'offerings', 'sections', 'meetings')
+
+  def test_all_endpoints_paginated(self):
+    for endpoint in self.ENDPOINTS:
+      response = self.client.get('/courses/%s/' % endpoint)
+      self.assertEqual(response.status_code, 200, endpoint)
+      self.assertEqual(set(response.json()), {'next', 'previous', 'results'},
+        endpoint)
+
+  def test_pages(self):
+    '''
+    Following the next links returns every object exactly once, in order of
+    primary key.
+    '''
+    expected = list(models.Meeting.objects.order_by('id')
+      .values_list('id', flat=True))
+    ids = []
+
+    url = '/courses/meetings/?page_size=4'
+    while url is not None:
+      response = self.client.get(url).json()
+      self.assertLessEqual(len(response['results']), 4)
+      ids.extend(m['id'] for m in response['results'])
+      url = response['next']
+
+    self.assertEqual(ids, expected)
+
+  def test_no_count_query(self):
+    '''
+    A page is retrieved with a single query, regardless of its position,
+    besides that of the dataset's version.
+    '''
+    response = self.client.get('/courses/sections/?page_size=2').json()
+
+    with self.assertNumQueries(2):
+      self.client.get(response['next'])
+
+  def test_max_page_size(self):
+    with unittest.mock.patch.object(pagination.CoursePagination,
+        'max_page_size', 2):
+      response = self.client.get('/courses/meetings/?page_size=1000')
+    self.assertEqual(len(response.json()['results']), 2)
+
+  def test_page_size(self):
+    response = self.client.get('/courses/meetings/?page_size=3')
+    self.assertEqual(len(response.json()['results']), 3)
+
+class TestExpandedCourse(CourseAPITestBase):
+  '''
+  Test the expanded course endpoint.
+  '''
+  def expanded_url(self, course: models.Course) -> str:
+    return '/courses/listings/%d/expanded/' % course.pk
+
+  def test_structure(self):
+    offering = (models.Offering.objects
+      .filter(section__meeting__isnull=False)
+      .first())
+    course = offering.course
+
+    response = self.client.get(self.expanded_url(course))
+    self.assertEqual(response.status_code, 200)
+    expanded = response.json()
+
+    self.assertEqual(expanded['id'], course.pk)
+    self.assertEqual(len(expanded['crosslistings']),
+      course.crosslisting_set.count())
+    self.assertEqual(len(expanded['offerings']), course.offering_set.count())
+
+    nested = next(o for o in expanded['offerings'] if o['id'] == offering.pk)
+    self.assertEqual(nested['semester']['term_id'],
+      offering.semester.term_id)
+    self.assertEqual(sorted(i['id'] for i in nested['instructor']),
+      sorted(offering.instructor.values_list('id', flat=True)))
+    self.assertEqual([s['id'] for s in nested['sections']],
+      list(offering.section_set.order_by('id').values_list('id', flat=True)))
+
+    meetings = [m['id'] for s in nested['sections'] for m in s['meetings']]
+    self.assertEqual(meetings, list(models.Meeting.objects
+      .filter(section__offering=offering)
+      .order_by('section_id', 'id')
+      .values_list('id', flat=True)))
+
+  def test_constant_queries(self):
+    '''
+    The number of queries does not depend on the size of the course.
+    '''
+    courses = (models.Course.objects
+      .annotate(meetings=Count('offering__section__meeting'))
+      .order_by('meetings'))
+    smallest, largest = courses.first(), courses.last()
+    self.assertLess(smallest.meetings, largest.meetings)
+
+    # The dataset's version, and one query per model: course, crosslistings,
+    # offerings (with their semesters), instructors, sections, and meetings.
+    for course in (smallest, largest):
+      with self.assertNumQueries(7):
+        response = self.client.get(self.expanded_url(course))
+      self.assertEqual(response.status_code, 200)
+
+  def test_not_found(self):
+    response = self.client.get('/courses/listings/0/expanded/')
+    self.assertEqual(response.status_code, 404)
+
+class TestValuesSerializer(CourseAPITestBase):
+  '''
+  Test the serialization of list responses from `values_list` rows.
+  '''
+  SERIALIZERS = (
+    (models.Section, serializers.SectionSerializer),
+    (models.Meeting, serializers.MeetingSerializer),
+    )
+
+  def test_identical_output(self):
+    renderer = JSONRenderer()
+
+    for model, serializer_class in self.SERIALIZERS:
+      values = serializers.ValuesSerializer(serializer_class)
+      objects = model.objects.order_by('id')
+
+      expected = renderer.render(serializer_class(objects, many=True).data)
+      actual = renderer.render(values.serialize(
+        objects.values_list(*values.columns)))
+      self.assertEqual(actual, expected, model.__name__)
+
+  def test_identical_responses(self):
+    for endpoint, viewset in (('sections', views.SectionViewset),
+        ('meetings', views.MeetingViewset)):
+      url = '/courses/%s/?page_size=5' % endpoint
+      while url is not None:
+        response = self.client.get(url)
+        caches['responses'].clear()
+        with unittest.mock.patch.object(viewset, 'values_serializer', None):
+          expected = self.client.get(url)
+
+        self.assertEqual(response.content, expected.content, url)
+        url = response.json()['next']
+
+  def test_many_to_many(self):
+    with self.assertRaises(ValueError):
+      serializers.ValuesSerializer(serializers.OfferingSerializer)
+
+class TestBatch(CourseAPITestBase):
+  '''
+  Test the lookup of many objects at once.
+  '''
+  def test_ids(self):
+    courses = list(models.Course.objects.order_by('-id')[:3])
+    ids = [str(c.id) for c in courses] + ['0']
+
+    with self.assertNumQueries(2):
+      response = self.client.get('/courses/listings/batch/',
+        {'ids': ','.join(ids)})
+    self.assertEqual(response.status_code, 200)
+    body = response.json()
+
+    self.assertEqual(list(body['results']), ids[:3])
+    self.assertEqual(body['results'][ids[0]],
+      serializers.CourseSerializer(courses[0]).data)
+    self.assertEqual(body['missing'], ['0'])
+
+  def test_course_codes(self):
+    response = self.client.get('/courses/listings/batch/',
+      {'codes': 'COS333, isc 233,COS233,ELE432'})
+    body = response.json()
+    self.assertEqual({k: (v['department'], v['number'])
+      for k, v in body['results'].items()},
+      {'COS333': ('COS', 333), 'isc 233': ('ISC', 233)})
+    self.assertEqual(body['missing'], ['COS233', 'ELE432'])
+
+  def test_instructors(self):
+    response = self.client.get('/courses/instructors/batch/',
+      {'emplids': '000000002,000000001,999999999'})
+    body = response.json()
+    self.assertEqual([v['employee_id'] for v in body['results'].values()],
+      ['000000002', '000000001'])
+    self.assertEqual(body['missing'], ['999999999'])
+
+  def test_classes(self):
+    term = models.Semester.objects.get().term_id
+    with self.assertNumQueries(2):
+      response = self.client.get('/courses/sections/batch/',
+        {'classes': '40160,1', 'semester': term})
+    body = response.json()
+    self.assertEqual(body['results']['40160']['section_id'], 'L01')
+    self.assertEqual(body['missing'], ['1'])
+
+    response = self.client.get('/courses/sections/batch/',
+      {'classes': '40160', 'semester': term + 1})
+    self.assertEqual(response.json()['missing'], ['40160'])
+
+  def test_invalid(self):
+    for url, params in (
+        ('listings', {}),
+        ('listings', {'ids': '1', 'codes': 'COS126'}),
+        ('listings', {'ids': ''}),
+        ('listings', {'ids': 'COS126'}),
+        ('listings', {'codes': 'COS'}),
+        ('listings', {'ids': ','.join(str(i) for i in range(101))}),
+        ('instructors', {'codes': 'COS126'}),
+        ('sections', {'classes': '40160'})):
+      response = self.client.get('/courses/%s/batch/' % url, params)
+      self.assertEqual(response.status_code, 400, (url, params))
+
+class TestSparseFields(CourseAPITestBase):
+  '''
+  Test the restriction of responses to the requested fields.
+  '''
+  CODES = 'department,number,letter,title'
+
+  def test_fields(self):
+    response = self.client.get('/courses/listings/', {'fields': self.CODES})
+    self.assertEqual(response.status_code, 200)
+    for course in response.json()['results']:
+      self.assertEqual(set(course), set(self.CODES.split(',')))
+
+    full = self.client.get('/courses/listings/')
+    self.assertLess(len(response.content) * 5, len(full.content))
+
+  def test_columns(self):
+    '''
+    Only the columns of the requested fields are read.
+    '''
+    for url in ('/courses/listings/', '/courses/sections/'):
+      with CaptureQueriesContext(connection) as queries:
+        self.client.get(url, {'fields': 'id', 'ordering': '-id'})
+      columns = re.search(r'^SELECT (.*?) FROM', queries[-1]['sql']).group(1)
+      self.assertEqual(columns.count(','), 0, url)
+
+  def test_ordering(self):
+    '''
+    Results are paginated by the ordering field, even if it is not requested,
+    without any other query.
+    '''
+    for endpoint, fields, ordering in (('listings', 'title', '-number'),
+        ('sections', 'status', 'offering'), ('meetings', 'room', 'start_time')):
+      expected = [{f: obj[f] for f in fields.split(',')}
+        for obj in self.client.get('/courses/%s/' % endpoint,
+          {'ordering': ordering}).json()['results']]
+
+      url = '/courses/%s/?page_size=2&ordering=%s&fields=%s' % (endpoint,
+        ordering, fields)
+      found = []
+      while url is not None:
+        with self.assertNumQueries(2):
+          body = self.client.get(url).json()
+        found.extend(body['results'])
+        url = body['next']
+      self.assertEqual(found, expected, endpoint)
+
+  def test_detail(self):
+    course = models.Course.objects.first()
+    response = self.client.get('/courses/listings/%d/' % course.id,
+      {'fields': 'title'})
+    self.assertEqual(response.json(), {'title': course.title})
+
+    response = self.client.get('/courses/listings/%d/expanded/' % course.id,
+      {'fields': 'id,offerings'})
+    self.assertEqual(set(response.json()), {'id', 'offerings'})
+    self.assertIn('sections', response.json()['offerings'][0])
+
+  def test_batch(self):
+    with self.assertNumQueries(2):
+      response = self.client.get('/courses/listings/batch/',
+        {'codes': 'COS333,ISC233', 'fields': 'title'})
+    self.assertEqual(response.json()['results']['COS333'],
+      {'title': models.Course.objects.get(department='COS', number=333).title})
+
+  def test_search(self):
+    response = self.client.get('/courses/search/',
+      {'q': 'cosmology', 'fields': 'department,number'})
+    self.assertEqual(response.json()['results'],
+      [{'department': 'AST', 'number': 401}])
+
+  def test_invalid(self):
+    for url, fields in (('listings', 'title,bogus'), ('listings', ''),
+        ('sections', 'meetings'), ('search', 'description,x')):
+      response = self.client.get('/courses/%s/' % url,
+        {'fields': fields, 'q': 'cos'})
+      self.assertEqual(response.status_code, 400, (url, fields))
+      self.assertIn('fields', response.json())
+
+class TestConditionalRequests(CourseAPITestBase):
+  '''
+  Test the tagging of responses with the dataset's version.
+  '''
+  URL = '/courses/listings/'
+
+  def test_headers(self):
+    response = self.client.get(self.URL)
+    version = versions.get(data.DATASET)
+
+    self.assertEqual(response['ETag'], versions.etag(version))
+    self.assertEqual(response['Last-Modified'],
+      http_date(version.modified_at.timestamp()))
+    self.assertIn('public', response['Cache-Control'])
+    self.assertIn('max-age=', response['Cache-Control'])
+
+  def test_not_modified(self):
+    '''
+    A conditional request for the current version only reads the version.
+    '''
+    response = self.client.get(self.URL)
+
+    with self.assertNumQueries(1):
+      cached = self.client.get(self.URL,
+        HTTP_IF_NONE_MATCH=response['ETag'])
+    self.assertEqual(cached.status_code, 304)
+    self.assertEqual(cached.content, b'')
+    self.assertIn('max-age=', cached['Cache-Control'])
+
+    cached = self.client.get(self.URL,
+      HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+    self.assertEqual(cached.status_code, 304)
+
+  def test_cached(self):
+    '''
+    Responses are cached on the server until the dataset changes.
+    '''
+    metrics.reset()
+    response = self.client.get(self.URL)
+
+    with self.assertNumQueries(1):
+      cached = self.client.get(self.URL)
+    self.assertEqual(cached.content, response.content)
+    self.assertEqual(cached['ETag'], response['ETag'])
+    self.assertEqual(cached['Content-Type'], response['Content-Type'])
+
+    # Another query string is another response.
+    self.client.get(self.URL, {'page_size': 1})
+
+    models.Course.objects.update(title='')
+    data.update_term_data(self.json_data)
+    with self.assertNumQueries(2):
+      modified = self.client.get(self.URL)
+    self.assertNotEqual(modified['ETag'], response['ETag'])
+
+    counters = metrics.counters()
+    labels = (('cache', 'responses'),)
+    self.assertEqual(counters['pdata_response_cache_hits_total', labels], 1)
+    self.assertEqual(counters['pdata_response_cache_misses_total', labels], 3)
+
+  def test_modified(self):
+    response = self.client.get(self.URL)
+
+    models.Section.objects.update(enrollment=0)
+    data.update_term_data(self.json_data)
+
+    modified = self.client.get(self.URL, HTTP_IF_NONE_MATCH=response['ETag'])
+    self.assertEqual(modified.status_code, 200)
+    self.assertNotEqual(modified['ETag'], response['ETag'])
+
+  def test_unversioned(self):
+    '''
+    Responses are not tagged before the dataset's first change.
+    '''
+    versions.models.DatasetVersion.objects.all().delete()
+
+    response = self.client.get(self.URL)
+    self.assertEqual(response.status_code, 200)
+    self.assertFalse(response.has_header('ETag'))
@@ -0,0 +1,131 @@
+# pdata/courses/timetables.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Generation of timetables without conflicts.
+
+import typing
+import re
+import time
+import itertools
+import collections
+
+from courses import models
+
+_SECTION_TYPE = re.compile(r'^[A-Za-z]*')
+
+class SearchTimeout(Exception):
+  '''
+  Raised when the search for timetables takes longer than its deadline.
+  '''
+
+def section_type(section_id: str) -> str:
+  '''
+  Get the type of a section, from the prefix of its ID.
+
+  :param section_id: ID of the section, such as 'P01'
+
+  :return: type, such as 'P' (a precept)
+  '''
+  return _SECTION_TYPE.match(section_id).group()
+
+def section_groups(
+    term_id: int,
+    course_ids: typing.List[int],
+    exclude: typing.Iterable[int] = (),
+    open_only: bool = False
+    ) -> typing.Tuple[typing.List[typing.List[int]], typing.List[int]]:
+  '''
+  Get the sections of each type (i.e. lectures, precepts and labs) of
+  courses in a semester, one of which must be chosen in a timetable.
+  Cancelled sections are ignored, but a type is still required if all of
+  its sections are excluded, or are full with `open_only`.
+
+  :param term_id: term ID of the semester
+  :param course_ids: primary keys of the courses
+  :param exclude: primary keys of sections which must not be chosen
+  :param open_only: whether to only choose sections with open seats
+
+  :return: IDs of the sections of each type, by course (in the order given)
+    and type, and the courses which are not offered in the semester
+  '''
+  exclude = set(exclude)
+  # Map of course to section type to its sections.
+  courses = collections.defaultdict(dict)
+
+  for (course_id, section_id, pk, has_open_seats) in (models.Section.objects
+      .filter(offering__semester__term_id=term_id,
+        offering__course_id__in=course_ids)
+      .exclude(status=models.Section.STATUS_CANCELLED)
+      .order_by('section_id')
+      .values_list('offering__course_id', 'section_id', 'id',
+        'has_open_seats')):
+    sections = courses[course_id].setdefault(section_type(section_id), [])
+    if pk not in exclude and (has_open_seats or not open_only):
+      sections.append(pk)
+
+  groups = []
+  missing = []
+  for course_id in collections.OrderedDict.fromkeys(course_ids):
+    if course_id not in courses:
+      missing.append(course_id)
+    for _, sections in sorted(courses[course_id].items()):
+      groups.append(sections)
+
+  return groups, missing
+
+def generate(
+    groups: typing.List[typing.List[int]],
+    masks: typing.Dict[int, int],
+    deadline: float = None
+    ) -> typing.Iterator[typing.Tuple[int, ...]]:
+  '''
+  Generate every timetable which chooses one section of each group, without
+  any two chosen sections conflicting. Timetables are generated lazily, so
+  that they can be streamed as they are found.
+
+  The search backtracks as soon as any group has no section left which fits
+  the sections chosen so far, and always chooses from the group with the
+  fewest sections left next. Sections of a group which meet at the same
+  times are searched once, then expanded in the results.
+
+  :param groups: IDs of the sections of each group (see `section_groups`)
+  :param masks: bitmask of each section's meetings (see
+    `conflicts.MeetingIndex.masks`)
+  :param deadline: `time.monotonic` time after which to stop searching, by
+    raising `SearchTimeout` (default: none)
+
+  :return: iterator of the section chosen in each group, in order
+  '''
+  # Map of mask to the sections with it, per group.
+  options = []
+  for sections in groups:
+    by_mask = collections.OrderedDict()
+    for section_id in sections:
+      by_mask.setdefault(masks.get(section_id, 0), []).append(section_id)
+    options.append(list(by_mask.items()))
+
+  chosen = [None] * len(groups)
+
+  def search(remaining: typing.List[int], occupied: int) -> typing.Iterator:
+    if deadline is not None and time.monotonic() > deadline:
+      raise SearchTimeout()
+    if not remaining:
+      yield chosen
+      return
+
+    fitting = []
+    for index in remaining:
+      fits = [o for o in options[index] if not o[0] & occupied]
+      if not fits:
+        return
+      fitting.append((len(fits), index, fits))
+
+    _, index, fits = min(fitting)
+    rest = [i for i in remaining if i != index]
+    for (section_mask, sections) in fits:
+      chosen[index] = sections
+      yield from search(rest, occupied | section_mask)
+
+  for choice in search(list(range(len(groups))), 0):
+    yield from itertools.product(*choice)
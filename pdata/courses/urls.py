@@ -3,6 +3,7 @@
 # Author: Rushy Panchal
 # Date: July 21st, 2018
 
+from django.conf.urls import url
 from rest_framework import routers
 
 from . import views
@@ -16,4 +17,15 @@ router.register('offerings', views.OfferingViewset)
 router.register('sections', views.SectionViewset)
 router.register('meetings', views.MeetingViewset)
 
-urlpatterns = router.urls
+urlpatterns = [
+  url(r'^search/?$', views.search_courses, name='search'),
+  url(r'^resolve/?$', views.resolve_codes, name='resolve'),
+  url(r'^changes/?$', views.section_changes, name='changes'),
+  url(r'^conflicts/?$', views.section_conflicts, name='conflicts'),
+  url(r'^rooms/free/?$', views.free_rooms, name='free-rooms'),
+  url(r'^rooms/occupancy/?$', views.room_occupancy, name='room-occupancy'),
+  url(r'^timetables/?$', views.generate_timetables, name='timetables'),
+  url(r'^export/(?P<table>sections|meetings)\.(?P<extension>ndjson|csv)$',
+    views.export_semester, name='export'),
+  url(r'^snapshot/?$', views.semester_snapshot, name='snapshot'),
+] + router.urls
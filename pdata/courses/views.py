@@ -3,35 +3,915 @@
 # Author: Rushy Panchal
 # Date: July 21st, 2018
 
-from rest_framework import viewsets
+import typing
+import os
+import re
+import time
+import json
+import gzip
+import datetime
+import collections
+
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse, FileResponse
+from django.utils.cache import (patch_vary_headers, patch_cache_control,
+  get_conditional_response)
+from django.db.models import QuerySet
+from django.utils.decorators import method_decorator
+from rest_framework import viewsets, decorators
+from rest_framework.exceptions import ValidationError, NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from pdata import versions
 
 from . import models
 from . import serializers
+from . import pagination
+from . import filters
+from . import lookups
+from . import search
+from . import resolver
+from . import conflicts
+from . import rooms
+from . import timetables
+from . import export
+from . import feed
+from . import history
+from . import snapshots
+from . import data
+
+#: Maximum number of keys looked up at once by batch endpoints.
+MAX_BATCH_SIZE = 100
+
+#: Maximum number of results of the search endpoint.
+MAX_SEARCH_RESULTS = 100
+
+#: Maximum number of sections checked for conflicts at once.
+MAX_CONFLICT_SECTIONS = 100
+
+#: Maximum number of changes returned at once by the feed of changes.
+MAX_FEED_CHANGES = 1000
+
+#: Maximum number of codes resolved at once.
+MAX_RESOLVE_CODES = 500
+
+#: Maximum number of courses, and of results, of the timetable endpoint.
+MAX_TIMETABLE_COURSES = 10
+MAX_TIMETABLES = 1000
+
+#: Tags responses with the version of the courses dataset, so that clients
+#: can make conditional requests, and caches them on the server until the
+#: version changes (see `pdata.versions.conditional`).
+conditional = versions.conditional(data.DATASET,
+  max_age=settings.COURSES_CACHE_MAX_AGE,
+  cache=settings.COURSES_RESPONSE_CACHE)
+
+#: Tags responses with the version of a semester's meetings (given by the
+#: 'semester' query parameter), which changes less often than the dataset.
+meetings_conditional = versions.conditional(data.DATASET,
+  scope=lambda request: data.meetings_scope(request.GET.get('semester', '')),
+  max_age=settings.COURSES_CACHE_MAX_AGE,
+  cache=settings.COURSES_RESPONSE_CACHE)
+
+#: Tags responses with the version of a semester (given by the 'semester'
+#: query parameter).
+semester_conditional = versions.conditional(data.DATASET,
+  scope=lambda request: request.GET.get('semester', ''),
+  max_age=settings.COURSES_CACHE_MAX_AGE,
+  cache=settings.COURSES_RESPONSE_CACHE)
+
+#: Tags responses with the version of the course codes, which only changes
+#: when courses or crosslistings do.
+codes_conditional = versions.conditional(data.DATASET,
+  scope=lambda request: data.CODES_SCOPE,
+  max_age=settings.COURSES_CACHE_MAX_AGE,
+  cache=settings.COURSES_RESPONSE_CACHE)
+
+def _history_params(
+    request: Request,
+    parsers: typing.Dict[str, typing.Callable[[str], typing.Any]] = None
+    ) -> typing.Dict[str, typing.Any]:
+  '''
+  Parse the parameters of a request for enrollment history: the seconds
+  between samples ('resolution', default: 0, for every sample), and any
+  others.
+
+  :param request: request
+  :param parsers: parsers of the other parameters (see
+    `filters.parse_params`)
+
+  :return: parameters
+  '''
+  params = filters.parse_params(request, dict(parsers or {},
+    resolution=filters.integer))
+  params.setdefault('resolution', 0)
+  if params['resolution'] < 0:
+    raise ValidationError({'resolution': 'expected a number of seconds'})
+  return params
+
+def _timestamp(time: int) -> str:
+  '''
+  Format a time of an enrollment history.
+
+  :param time: seconds since the epoch
+
+  :return: ISO 8601 timestamp
+  '''
+  return datetime.datetime.fromtimestamp(time,
+    datetime.timezone.utc).isoformat()
+
+def _sample(sample: history.Sample) -> dict:
+  '''
+  Serialize a sample of an enrollment history.
+
+  :param sample: sample
+
+  :return: serialized sample
+  '''
+  return {
+    'time': _timestamp(sample.time),
+    'status': sample.status,
+    'capacity': sample.capacity,
+    'enrollment': sample.enrollment,
+    }
+
+@method_decorator(conditional, name='dispatch')
+class CourseDataViewset(viewsets.ReadOnlyModelViewSet):
+  '''
+  Base viewset of the courses API. List endpoints are paginated by primary
+  key, or by the requested ordering (see `pagination.CoursePagination`), and
+  may be filtered by query parameters. Responses are versioned (see
+  `conditional`).
+
+  Clients may request only some fields of each object, as a comma-separated
+  list, with the 'fields' query parameter. Only the columns of those fields
+  are then read from the database.
+
+  Clients mirroring the data may request only the objects changed after a
+  version of the dataset, with 'since' (see `pdata.models.Versioned`). The
+  objects deleted after it are then listed in 'deleted', and the version
+  which the results are current as of in 'version', to be given as 'since'
+  by the next request. When paging through changes, the version of the
+  first page should be kept: objects changed while paging are listed again
+  by the next request.
+  '''
+  pagination_class = pagination.CoursePagination
+  filter_backends = (filters.QueryParameterFilter, filters.OrderingFilter)
+
+  #: Map of query parameter to the filter it applies (see
+  #: `filters.QueryParameterFilter`). Each filter is backed by an index.
+  filter_params = {}
+
+  #: Fields which results may be ordered by, with the 'ordering' query
+  #: parameter. Each of them is indexed.
+  ordering_fields = ('id',)
+  ordering = 'id'
+
+  #: If set, list responses are serialized from `QuerySet.values_list` rows
+  #: by this serializer (see `serializers.ValuesSerializer`), rather than
+  #: from model instances by `serializer_class`.
+  values_serializer = None
+
+  #: Map of query parameter to the key which objects may be looked up by
+  #: with the 'batch' endpoint (see `lookups.Key`).
+  batch_keys = {'ids': lookups.ID}
+
+  @decorators.list_route(methods=['get'])
+  def batch(self, request: Request) -> Response:
+    '''
+    Look up many objects at once, by one of `batch_keys` given as a
+    comma-separated list (of at most `MAX_BATCH_SIZE` keys). Objects are
+    returned in 'results', keyed by the requested keys, and keys which were
+    not found are listed in 'missing'.
+    '''
+    params = [p for p in self.batch_keys if p in request.query_params]
+    if len(params) != 1:
+      raise ValidationError('expected exactly one of: %s' %
+        ', '.join(sorted(self.batch_keys)))
+    param = params[0]
+
+    keys = list(collections.OrderedDict.fromkeys(
+      k.strip() for k in request.query_params[param].split(',') if k.strip()))
+    if not 0 < len(keys) <= MAX_BATCH_SIZE:
+      raise ValidationError({param: 'expected 1 to %d keys' %
+        MAX_BATCH_SIZE})
 
-class CourseViewset(viewsets.ReadOnlyModelViewSet):
+    key = self.batch_keys[param]
+    queryset = self.get_batch_queryset(param)
+    columns = self.get_sparse_columns()
+    if columns is not None:
+      queryset = queryset.only(*columns, *key.columns)
+
+    try:
+      results, missing = key.lookup(queryset, keys)
+    except ValueError as e:
+      raise ValidationError({param: str(e)})
+
+    serializer = self.get_serializer(list(results.values()), many=True)
+    return Response({
+      'results': collections.OrderedDict(zip(results, serializer.data)),
+      'missing': missing,
+      })
+
+  def get_batch_queryset(self, param: str) -> QuerySet:
+    '''
+    Get the queryset which the 'batch' endpoint looks up objects in.
+
+    :param param: query parameter of the requested keys
+
+    :return: queryset
+    '''
+    return self.get_queryset()
+
+  def get_sparse_fields(self) -> typing.Optional[typing.Tuple[str]]:
+    '''
+    Get the fields requested with the 'fields' query parameter.
+
+    :return: requested fields, or None for all fields
+    '''
+    if 'fields' not in self.request.query_params:
+      return None
+
+    if not hasattr(self, '_sparse_fields'):
+      try:
+        self._sparse_fields = serializers.sparse_fields(
+          self.get_serializer_class(), self.request.query_params['fields'])
+      except ValueError as e:
+        raise ValidationError({'fields': str(e)})
+    return self._sparse_fields
+
+  def get_sparse_columns(self) -> typing.Optional[typing.List[str]]:
+    '''
+    Get the model fields to load for the requested fields, along with the
+    primary key and the fields which results are ordered by.
+
+    :return: model fields, or None to load all fields
+    '''
+    fields = self.get_sparse_fields()
+    if fields is None:
+      return None
+
+    columns = serializers.sparse_columns(self.get_serializer_class(), fields)
+    return list(collections.OrderedDict.fromkeys(
+      ['id'] + columns + list(self._ordering_columns())))
+
+  def _ordering_columns(self) -> typing.Tuple[str]:
+    '''
+    Get the fields which list results are ordered by.
+
+    :return: fields
+    '''
+    ordering = filters.OrderingFilter().get_ordering(self.request,
+      super().get_queryset(), self)
+    return tuple(field.lstrip('-') for field in ordering)
+
+  def get_since(self) -> typing.Optional[int]:
+    '''
+    Get the version which changes are requested after, with 'since'.
+
+    :return: version, or None if all objects are requested
+    '''
+    if self.action != 'list':
+      return None
+    return filters.parse_params(self.request,
+      {'since': filters.integer}).get('since')
+
+  def get_queryset(self) -> QuerySet:
+    queryset = super().get_queryset()
+    columns = self.get_sparse_columns()
+    if columns is not None:
+      queryset = queryset.only(*columns)
+    return queryset
+
+  def filter_queryset(self, queryset: QuerySet) -> QuerySet:
+    queryset = super().filter_queryset(queryset)
+    since = self.get_since()
+    if since is not None:
+      queryset = queryset.filter(version__gt=since)
+    return queryset
+
+  def get_serializer(self, *args, **kwargs) -> typing.Any:
+    kwargs.setdefault('fields', self.get_sparse_fields())
+    return super().get_serializer(*args, **kwargs)
+
+  def get_values_serializer(self) -> typing.Optional[
+      serializers.ValuesSerializer]:
+    '''
+    Get the serializer of `values_list` rows (see `values_serializer`),
+    restricted to the requested fields.
+
+    :return: serializer, or None if list responses are serialized from model
+      instances
+    '''
+    fields = self.get_sparse_fields()
+    if self.values_serializer is None or fields is None:
+      return self.values_serializer
+    return self.values_serializer.restrict(fields, self._ordering_columns())
+
+  def list(self, request: Request, *args, **kwargs) -> Response:
+    since = self.get_since()
+    if since is None:
+      return self._list(request, *args, **kwargs)
+
+    # The version is read before the objects, so that no change after it is
+    # missed by the next request.
+    current = versions.get(data.DATASET)
+    response = self._list(request, *args, **kwargs)
+    response.data['deleted'] = versions.deleted(self.queryset.model, since)
+    response.data['version'] = current.version if current else 0
+    return response
+
+  def _list(self, request: Request, *args, **kwargs) -> Response:
+    '''
+    List the objects, serialized from `values_list` rows if the viewset has
+    a `values_serializer`.
+    '''
+    values = self.get_values_serializer()
+    if values is None:
+      return super().list(request, *args, **kwargs)
+
+    queryset = (self.filter_queryset(self.get_queryset())
+      .values_list(*values.columns))
+
+    page = self.paginate_queryset(queryset)
+    if page is not None:
+      return self.get_paginated_response(values.serialize(page))
+    return Response(values.serialize(queryset))
+
+class CourseViewset(CourseDataViewset):
   queryset = models.Course.objects.all()
   serializer_class = serializers.CourseSerializer
+  filter_params = {
+    'department': filters.Filter('department', str.upper),
+    'number': filters.Filter('number', filters.integer),
+    'letter': filters.Filter('letter', str.upper),
+    'track': filters.Filter('track', filters.integer),
+    }
+  ordering_fields = ('id', 'department', 'number')
+  batch_keys = {'ids': lookups.ID, 'codes': lookups.CourseCodeKey()}
+
+  @decorators.detail_route(methods=['get'])
+  def expanded(self, request: Request, pk: str = None) -> Response:
+    '''
+    Retrieve a course with its crosslistings and offerings nested, including
+    each offering's semester, instructors, sections, and meetings.
+    '''
+    course = self.get_object()
+    return Response(self.get_serializer(course).data)
+
+  @decorators.detail_route(methods=['get'])
+  def history(self, request: Request, pk: str = None) -> Response:
+    '''
+    Retrieve the enrollment history of a course's sections (see
+    `SectionViewset.history`), in a semester given by its term ID with
+    'semester' (default: all semesters), along with the total capacity and
+    enrollment of the sections over time.
+    '''
+    course = self.get_object()
+    params = _history_params(request, {'semester': filters.integer})
+
+    sections = models.Section.objects.filter(offering__course=course)
+    if 'semester' in params:
+      sections = sections.filter(offering__semester__term_id=params['semester'])
+    histories = history.samples(sections.order_by('id').values_list('id',
+      flat=True), params['resolution'])
 
-class CrossListingViewset(viewsets.ReadOnlyModelViewSet):
+    return Response({
+      'course': course.id,
+      'resolution': params['resolution'],
+      'sections': [{'section': section_id, 'samples': [_sample(s)
+          for s in samples]}
+        for (section_id, samples) in sorted(histories.items())],
+      'total': [{'time': _timestamp(time), 'capacity': capacity,
+          'enrollment': enrollment}
+        for (time, capacity, enrollment) in history.total(
+          histories.values())],
+      })
+
+  def get_serializer_class(self) -> type:
+    if self.action == 'expanded':
+      return serializers.ExpandedCourseSerializer
+    return super().get_serializer_class()
+
+  def get_queryset(self) -> QuerySet:
+    queryset = super().get_queryset()
+    if self.action == 'expanded':
+      queryset = serializers.expanded_courses(queryset)
+    return queryset
+
+class CrossListingViewset(CourseDataViewset):
   queryset = models.CrossListing.objects.all()
   serializer_class = serializers.CrossListingSerializer
+  ordering_fields = ('id', 'department', 'number')
 
-class SemesterViewset(viewsets.ReadOnlyModelViewSet):
+class SemesterViewset(CourseDataViewset):
   queryset = models.Semester.objects.all()
   serializer_class = serializers.SemesterSerializer
+  ordering_fields = ('id', 'term_id')
 
-class InstructorViewset(viewsets.ReadOnlyModelViewSet):
+class InstructorViewset(CourseDataViewset):
   queryset = models.Instructor.objects.all()
   serializer_class = serializers.InstructorSerializer
+  filter_params = {
+    'employee_id': filters.Filter('employee_id'),
+    'last_name': filters.PrefixFilter('last_name'),
+    }
+  ordering_fields = ('id', 'last_name')
+  batch_keys = {'ids': lookups.ID, 'emplids': lookups.Key('employee_id')}
 
-class OfferingViewset(viewsets.ReadOnlyModelViewSet):
-  queryset = models.Offering.objects.all()
+class OfferingViewset(CourseDataViewset):
+  queryset = models.Offering.objects.prefetch_related('instructor')
   serializer_class = serializers.OfferingSerializer
+  filter_params = {
+    'semester': filters.Filter('semester__term_id', filters.integer),
+    'course': filters.Filter('course', filters.integer),
+    }
+  ordering_fields = ('id', 'semester', 'course')
 
-class SectionViewset(viewsets.ReadOnlyModelViewSet):
+class SectionViewset(CourseDataViewset):
   queryset = models.Section.objects.all()
   serializer_class = serializers.SectionSerializer
+  filter_params = {
+    'status': filters.Filter('status', filters.integer),
+    'has_open_seats': filters.Filter('has_open_seats', filters.boolean),
+    }
+  ordering_fields = ('id', 'offering', 'status')
+  values_serializer = serializers.ValuesSerializer(
+    serializers.SectionSerializer)
+  batch_keys = {
+    'ids': lookups.ID,
+    'classes': lookups.Key('number', filters.integer),
+    }
+
+  @decorators.detail_route(methods=['get'])
+  def history(self, request: Request, pk: str = None) -> Response:
+    '''
+    Retrieve the enrollment history of a section: its status, capacity, and
+    enrollment each time any of them changed. With 'resolution', only the
+    last sample in each window of that many seconds is returned.
+    '''
+    section = self.get_object()
+    params = _history_params(request)
+    samples = history.samples([section.id], params['resolution'])
+    return Response({
+      'section': section.id,
+      'resolution': params['resolution'],
+      'samples': [_sample(s) for s in samples.get(section.id, ())],
+      })
 
-class MeetingViewset(viewsets.ReadOnlyModelViewSet):
+  def get_batch_queryset(self, param: str) -> QuerySet:
+    queryset = super().get_batch_queryset(param)
+    if param != 'classes':
+      return queryset
+
+    # Class numbers are only unique within a semester.
+    params = filters.parse_params(self.request, {'semester': filters.integer})
+    if 'semester' not in params:
+      raise ValidationError({'semester': 'required to look up classes'})
+    return queryset.filter(offering__semester__term_id=params['semester'])
+
+class MeetingViewset(CourseDataViewset):
   queryset = models.Meeting.objects.all()
   serializer_class = serializers.MeetingSerializer
+  filter_params = {
+    'day': filters.Filter('day', filters.integer),
+    'building': filters.Filter('building'),
+    'start_after': filters.Filter('start_time__gte', filters.time),
+    'end_before': filters.Filter('end_time__lte', filters.time),
+    }
+  ordering_fields = ('id', 'day', 'building', 'start_time', 'end_time')
+  values_serializer = serializers.ValuesSerializer(
+    serializers.MeetingSerializer)
+
+@conditional
+@decorators.api_view(['GET'])
+def search_courses(request: Request) -> Response:
+  '''
+  Search courses by title, description, and code (including crosslisted
+  codes), with the 'q' query parameter. Each word matches as a prefix, and
+  results are ranked by relevance.
+
+  Results may be restricted to the courses offered in a semester, by its
+  term ID, with 'semester'. The number of results is set with 'limit'
+  (default: 20, at most `MAX_SEARCH_RESULTS`). As with the other endpoints,
+  only some fields may be requested with 'fields'.
+  '''
+  query = request.query_params.get('q', '')
+  if not search.tokenize(query):
+    raise ValidationError({'q': 'expected search terms'})
+
+  params = filters.parse_params(request,
+    {'semester': filters.integer, 'limit': filters.integer})
+  params['limit'] = max(min(params.get('limit', 20), MAX_SEARCH_RESULTS), 0)
+
+  courses = models.Course.objects.all()
+  fields = None
+  if 'fields' in request.query_params:
+    try:
+      fields = serializers.sparse_fields(serializers.CourseSerializer,
+        request.query_params['fields'])
+    except ValueError as e:
+      raise ValidationError({'fields': str(e)})
+    courses = courses.only('id', *serializers.sparse_columns(
+      serializers.CourseSerializer, fields))
+
+  pks = search.search(query, **params)
+  courses = courses.in_bulk(pks)
+  return Response({'results': serializers.CourseSerializer(
+    [courses[pk] for pk in pks if pk in courses], many=True,
+    fields=fields).data})
+
+@codes_conditional
+@decorators.api_view(['GET', 'POST'])
+def resolve_codes(request: Request) -> Response:
+  '''
+  Resolve course codes, in free form (such as 'mat375' or 'MAT 375A'), to
+  the courses listed under them, whether as their own code or as a
+  crosslisting. Codes are given as a comma-separated list with 'codes', or,
+  for larger batches, as a JSON list 'codes' in the body of a POST request
+  (of at most `MAX_RESOLVE_CODES` codes).
+
+  Resolved codes are returned in 'results', keyed by the requested codes.
+  Codes which were not found are listed in 'missing', and codes which are
+  not valid in 'invalid'.
+  '''
+  if request.method == 'POST':
+    codes = request.data.get('codes') if isinstance(request.data,
+      dict) else None
+    if (not isinstance(codes, list)
+        or not all(isinstance(c, str) for c in codes)):
+      raise ValidationError({'codes': 'expected a list of course codes'})
+  else:
+    codes = request.query_params.get('codes', '').split(',')
+
+  codes = list(collections.OrderedDict.fromkeys(
+    c.strip() for c in codes if c.strip()))
+  if not 0 < len(codes) <= MAX_RESOLVE_CODES:
+    raise ValidationError({'codes': 'expected 1 to %d codes' %
+      MAX_RESOLVE_CODES})
+
+  results, missing, invalid = resolver.get_index().resolve(codes)
+  return Response({
+    'results': collections.OrderedDict((code, [r._asdict() for r in found])
+      for (code, found) in results.items()),
+    'missing': missing,
+    'invalid': invalid,
+    })
+
+@conditional
+@decorators.api_view(['GET'])
+def section_changes(request: Request) -> Response:
+  '''
+  Get the changes to the enrollment, capacity, or status of sections after
+  the change numbered 'since', in order (at most `MAX_FEED_CHANGES` at once).
+  Sections may be followed by ID ('sections') or by course ('courses'), as
+  comma-separated lists (see `feed.parse_params`).
+  Without 'since', no changes are returned, only the number of the latest.
+
+  Clients resume from 'next', the number of the last change they were sent.
+  If older changes were discarded, 'expired' is set, and clients should read
+  the sections again. Clients waiting for changes should subscribe to the
+  feed server instead (see `courses.feedserver`), which sends changes as
+  soon as they are recorded.
+  '''
+  params = feed.parse_params(request)
+  if 'since' not in params:
+    return Response({'changes': [], 'next': feed.latest(), 'expired': False})
+
+  # Changes are only read up to the latest, so that none recorded meanwhile
+  # are skipped by clients resuming from it.
+  since = params['since']
+  latest = feed.latest()
+  changes = feed.read(since, params['sections'], params['courses'],
+    limit=MAX_FEED_CHANGES, until=latest)
+  return Response({
+    'changes': changes,
+    'next': (changes[-1]['seq'] if len(changes) == MAX_FEED_CHANGES
+      else max(since, latest)),
+    'expired': feed.expired(since),
+    })
+
+@meetings_conditional
+@decorators.api_view(['GET'])
+def section_conflicts(request: Request) -> Response:
+  '''
+  Find the time conflicts between sections of a semester, given by its term
+  ID with 'semester'. Sections are given by ID with 'sections', or by class
+  number with 'classes', as comma-separated lists (of at most
+  `MAX_CONFLICT_SECTIONS` sections).
+
+  Conflicts are grouped by day. Each is a pair of sections, with the time
+  during which their meetings overlap.
+  '''
+  params = filters.parse_params(request, {
+    'semester': filters.integer,
+    'sections': filters.integers,
+    'classes': filters.integers,
+    })
+
+  if 'semester' not in params:
+    raise ValidationError({'semester': 'expected a term ID'})
+  requested = params.get('sections', []) + params.get('classes', [])
+  if not requested:
+    raise ValidationError({'sections': 'expected sections or classes'})
+  if len(requested) > MAX_CONFLICT_SECTIONS:
+    raise ValidationError({'sections': 'expected at most %d sections' %
+      MAX_CONFLICT_SECTIONS})
+
+  index = conflicts.get_index(params['semester'])
+  section_ids, missing = index.resolve(params.get('sections', ()),
+    params.get('classes', ()))
+  if missing:
+    raise ValidationError({'sections': 'unknown sections or classes: %s' %
+      ', '.join(str(m) for m in missing)})
+
+  days = collections.OrderedDict()
+  for conflict in index.conflicts(section_ids):
+    days.setdefault(conflict.day, []).append({
+      'sections': list(conflict.sections),
+      'start': conflict.start.isoformat(),
+      'end': conflict.end.isoformat(),
+      })
+
+  return Response({
+    'sections': section_ids,
+    'conflicts': [{'day': day, 'conflicts': found}
+      for day, found in days.items()],
+    })
+
+def _room_query(request: Request) -> typing.Tuple[
+    rooms.RoomIndex, str, int, datetime.time, datetime.time]:
+  '''
+  Parse the parameters of a query of the occupancy of rooms: the semester's
+  term ID ('semester'), the building's name ('building'), the day of the
+  week ('day') and the window, from 'start' (default: midnight) to 'end'
+  (default: the end of the day).
+
+  :param request: request
+
+  :return: index of the semester's rooms, name of the building, day, and
+    start and end of the window
+  '''
+  for param in ('semester', 'building', 'day'):
+    if param not in request.query_params:
+      raise ValidationError({param: 'this parameter is required'})
+
+  params = filters.parse_params(request, {
+    'semester': filters.integer,
+    'day': filters.integer,
+    'start': filters.time,
+    'end': filters.time,
+    })
+  if params['day'] not in dict(models.Meeting._meta.get_field('day').choices):
+    raise ValidationError({'day': 'expected a day, from 0 (Monday)'})
+
+  start = params.get('start', datetime.time.min)
+  end = params.get('end', datetime.time.max)
+  if start >= end:
+    raise ValidationError({'end': 'expected a time after the start'})
+
+  index = rooms.get_index(params['semester'])
+  building = index.building(request.query_params['building'])
+  if building is None:
+    raise ValidationError({'building': 'unknown building'})
+
+  return (index, building, params['day'], start, end)
+
+@meetings_conditional
+@decorators.api_view(['GET'])
+def free_rooms(request: Request) -> Response:
+  '''
+  Find the rooms of a building which are free (no meeting is held in them)
+  during a window of a day of a semester's week (see `_room_query`). Rooms
+  are those in which any meeting is held during the semester.
+  '''
+  index, building, day, start, end = _room_query(request)
+  return Response({
+    'building': building,
+    'day': day,
+    'rooms': index.free(building, day, start, end),
+    })
+
+@meetings_conditional
+@decorators.api_view(['GET'])
+def room_occupancy(request: Request) -> Response:
+  '''
+  Find the meetings held in each room of a building during a window of a
+  day of a semester's week (see `_room_query`). Results may be restricted
+  to a room with 'room'.
+  '''
+  index, building, day, start, end = _room_query(request)
+  occupancy = index.occupancy(building, day, start, end,
+    room=request.query_params.get('room'))
+
+  return Response({
+    'building': building,
+    'day': day,
+    'rooms': [{
+      'room': room,
+      'meetings': [{
+        'section': o.section,
+        'start': o.start.isoformat(),
+        'end': o.end.isoformat(),
+        } for o in occupancies],
+      } for (room, occupancies) in occupancy],
+    })
+
+@conditional
+@decorators.api_view(['GET'])
+def generate_timetables(request: Request) -> StreamingHttpResponse:
+  '''
+  Generate the timetables of a semester (given by its term ID with
+  'semester') which take every course given by ID, as a comma-separated
+  list, with 'courses'. A timetable has one section of each type (i.e. a
+  lecture, a precept and a lab) of each course, without any two of them
+  conflicting. Sections may be excluded with 'exclude', and restricted to
+  those with open seats with 'open'.
+
+  Timetables are streamed as they are found, as newline-delimited JSON
+  objects with the 'sections' of each. The last line has the 'count' of
+  timetables, and whether they are 'complete', rather than truncated by
+  'limit' (default: 100, at most `MAX_TIMETABLES`) or by
+  `settings.COURSES_TIMETABLE_TIMEOUT`.
+  '''
+  for param in ('semester', 'courses'):
+    if param not in request.query_params:
+      raise ValidationError({param: 'this parameter is required'})
+
+  params = filters.parse_params(request, {
+    'semester': filters.integer,
+    'courses': filters.integers,
+    'exclude': filters.integers,
+    'open': filters.boolean,
+    'limit': filters.integer,
+    })
+  if not 0 < len(params['courses']) <= MAX_TIMETABLE_COURSES:
+    raise ValidationError({'courses': 'expected 1 to %d courses' %
+      MAX_TIMETABLE_COURSES})
+  limit = max(min(params.get('limit', 100), MAX_TIMETABLES), 0)
+
+  groups, missing = timetables.section_groups(params['semester'],
+    params['courses'], exclude=params.get('exclude', ()),
+    open_only=params.get('open', False))
+  if missing:
+    raise ValidationError({'courses': 'courses not offered: %s' %
+      ', '.join(str(m) for m in missing)})
+
+  masks = conflicts.get_index(params['semester']).masks
+  deadline = time.monotonic() + settings.COURSES_TIMETABLE_TIMEOUT
+
+  def lines() -> typing.Iterator[str]:
+    count = 0
+    complete = True
+    found = timetables.generate(groups, masks, deadline=deadline)
+    try:
+      for timetable in found:
+        if count == limit:
+          complete = False
+          break
+        count += 1
+        yield json.dumps({'sections': timetable}) + '\n'
+    except timetables.SearchTimeout:
+      complete = False
+    yield json.dumps({'count': count, 'complete': complete}) + '\n'
+
+  return StreamingHttpResponse(lines(),
+    content_type='application/x-ndjson')
+
+@semester_conditional
+@decorators.api_view(['GET'])
+def export_semester(
+    request: Request,
+    table: str,
+    extension: str
+    ) -> StreamingHttpResponse:
+  '''
+  Export a semester's sections or meetings (see `export.TABLES`), given by
+  its term ID with 'semester', as newline-delimited JSON or CSV. Rows are
+  streamed as they are read, in chunks of `settings.COURSES_EXPORT_CHUNK_SIZE`,
+  and compressed with gzip if the client accepts it.
+  '''
+  if 'semester' not in request.query_params:
+    raise ValidationError({'semester': 'this parameter is required'})
+  term_id = filters.parse_params(request,
+    {'semester': filters.integer})['semester']
+  if not models.Semester.objects.filter(term_id=term_id).exists():
+    raise ValidationError({'semester': 'unknown semester'})
+
+  compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+  response = StreamingHttpResponse(export.export(table, term_id, extension,
+      settings.COURSES_EXPORT_CHUNK_SIZE, compress=compress),
+    content_type=export.CONTENT_TYPES[extension])
+  response['Content-Disposition'] = 'attachment; filename="%d-%s.%s"' % (
+    term_id, table, extension)
+  if compress:
+    response['Content-Encoding'] = 'gzip'
+  patch_vary_headers(response, ('Accept-Encoding',))
+  return response
+
+_RANGE = re.compile(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$')
+
+def _byte_range(
+    header: str,
+    size: int
+    ) -> typing.Optional[typing.Tuple[int, int]]:
+  '''
+  Parse the Range header of a request, if it requests a single range of
+  bytes. Other ranges (such as multiple ranges) are ignored, so the whole
+  representation is sent.
+
+  :param header: value of the Range header
+  :param size: size of the representation
+
+  :return: (first, last) byte of the range, inclusive, or None to send the
+    whole representation
+
+  :raise ValueError: if the range is not satisfiable
+  '''
+  match = _RANGE.match(header)
+  if match is None or match.groups() == ('', ''):
+    return None
+
+  first, last = match.groups()
+  if not first:
+    # Suffix range: the last bytes of the representation.
+    if int(last) == 0:
+      raise ValueError('empty suffix range')
+    return (max(size - int(last), 0), size - 1)
+
+  first = int(first)
+  if first >= size:
+    raise ValueError('range starts after the end of the representation')
+  elif last and int(last) < first:
+    return None
+  return (first, min(int(last), size - 1) if last else size - 1)
+
+@decorators.api_view(['GET'])
+def semester_snapshot(request: Request) -> HttpResponse:
+  '''
+  Get the catalog of a semester, given by its term ID with 'semester': every
+  course offered in it, with its crosslistings and offering (see
+  `snapshots.document`). The catalog is served from its latest snapshot,
+  without querying the database, and is tagged with the semester's version
+  (as are other responses of the semester, see `semester_conditional`).
+
+  The snapshot is sent as is, with gzip content encoding, to clients which
+  accept it, and may then be requested in ranges of bytes (such as to resume
+  a download). Other clients receive it decompressed.
+  '''
+  if 'semester' not in request.query_params:
+    raise ValidationError({'semester': 'this parameter is required'})
+  term_id = filters.parse_params(request,
+    {'semester': filters.integer})['semester']
+
+  found = snapshots.open_snapshot(term_id)
+  if found is None:
+    raise NotFound('no snapshot of semester %d' % term_id)
+  snapshot, version = found
+  tag = '"%s-%d"' % (data.DATASET, version)
+
+  response = get_conditional_response(request, etag=tag)
+  compress = 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', '')
+
+  if response is not None:
+    snapshot.close()
+  elif not compress:
+    def decompressed() -> typing.Iterator[bytes]:
+      with gzip.GzipFile(fileobj=snapshot) as f:
+        yield from iter(lambda: f.read(FileResponse.block_size), b'')
+      snapshot.close()
+
+    response = StreamingHttpResponse(decompressed(),
+      content_type='application/json')
+  else:
+    size = os.fstat(snapshot.fileno()).st_size
+    byte_range = None
+    if ('HTTP_RANGE' in request.META
+        and request.META.get('HTTP_IF_RANGE', tag) == tag):
+      try:
+        byte_range = _byte_range(request.META['HTTP_RANGE'], size)
+      except ValueError:
+        snapshot.close()
+        response = HttpResponse(status=416)
+        response['Content-Range'] = 'bytes */%d' % size
+        return response
+
+    if byte_range is None:
+      response = FileResponse(snapshot, content_type='application/json')
+      response['Content-Length'] = size
+    else:
+      first, last = byte_range
+      with snapshot:
+        snapshot.seek(first)
+        response = HttpResponse(snapshot.read(last - first + 1),
+          content_type='application/json', status=206)
+      response['Content-Range'] = 'bytes %d-%d/%d' % (first, last, size)
+    response['Content-Encoding'] = 'gzip'
+    response['Accept-Ranges'] = 'bytes'
+
+  response['ETag'] = tag
+  patch_vary_headers(response, ('Accept-Encoding',))
+  patch_cache_control(response, public=True,
+    max_age=settings.COURSES_CACHE_MAX_AGE)
+  return response
@@ -0,0 +1,255 @@
+# pdata/pdata/cache.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Server-side caching of rendered responses.
+
+import typing
+import time
+import pickle
+import hashlib
+import threading
+import collections
+
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from django.http import HttpRequest, HttpResponse
+
+from pdata import metrics
+
+#: Seconds between checks for a response being computed by another request.
+POLL_INTERVAL = 0.05
+
+class LRUCache(BaseCache):
+  '''
+  Thread-safe, in-process cache backend, which evicts the least recently used
+  entries once it holds `MAX_ENTRIES` entries or `MAX_SIZE` bytes (of
+  pickled values). Django's own local memory backend evicts entries
+  regardless of their use.
+
+  .. code:: python
+
+    CACHES = {
+      'responses': {
+        'BACKEND': 'pdata.cache.LRUCache',
+        'OPTIONS': {'MAX_ENTRIES': 1000, 'MAX_SIZE': 64 * 1024 * 1024},
+        },
+      }
+
+  As with Django's local memory backend, caches with the same location share
+  their entries within a process.
+  '''
+  _stores = {}
+
+  def __init__(self, location: str, params: dict) -> None:
+    super().__init__(params)
+    self._max_size = params.get('OPTIONS', {}).get('MAX_SIZE')
+    self._store = self._stores.setdefault(location, _LRUStore())
+    self._lock = self._store.lock
+
+  @property
+  def size(self) -> int:
+    '''
+    Total size of the cached values, in bytes.
+    '''
+    return self._store.size
+
+  def _get(self, key: str) -> typing.Optional[bytes]:
+    '''
+    Get a pickled value, marking it as the most recently used. The lock must
+    be held.
+
+    :param key: cache key
+
+    :return: pickled value, or None if absent or expired
+    '''
+    try:
+      expiry, pickled = self._store.entries[key]
+    except KeyError:
+      return None
+
+    if expiry is not None and expiry <= time.time():
+      self._store.pop(key)
+      return None
+
+    self._store.entries.move_to_end(key)
+    return pickled
+
+  def _set(self, key: str, pickled: bytes, timeout: float) -> None:
+    '''
+    Set a pickled value, evicting the least recently used values as needed.
+    The lock must be held.
+
+    :param key: cache key
+    :param pickled: pickled value
+    :param timeout: timeout of the value
+    '''
+    store = self._store
+    store.pop(key)
+    store.entries[key] = (self.get_backend_timeout(timeout), pickled)
+    store.size += len(pickled)
+
+    while store.entries and (len(store.entries) > self._max_entries or
+        (self._max_size is not None and store.size > self._max_size)):
+      store.pop(next(iter(store.entries)))
+
+  def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> bool:
+    key = self.make_key(key, version=version)
+    self.validate_key(key)
+    pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    with self._lock:
+      if self._get(key) is not None:
+        return False
+      self._set(key, pickled, timeout)
+      return True
+
+  def get(self, key, default=None, version=None) -> typing.Any:
+    key = self.make_key(key, version=version)
+    self.validate_key(key)
+    with self._lock:
+      pickled = self._get(key)
+    return default if pickled is None else pickle.loads(pickled)
+
+  def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None) -> None:
+    key = self.make_key(key, version=version)
+    self.validate_key(key)
+    pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    with self._lock:
+      self._set(key, pickled, timeout)
+
+  def delete(self, key, version=None) -> None:
+    key = self.make_key(key, version=version)
+    self.validate_key(key)
+    with self._lock:
+      self._store.pop(key)
+
+  def has_key(self, key, version=None) -> bool:
+    key = self.make_key(key, version=version)
+    self.validate_key(key)
+    with self._lock:
+      return self._get(key) is not None
+
+  def clear(self) -> None:
+    with self._lock:
+      self._store.entries.clear()
+      self._store.size = 0
+
+class _LRUStore(object):
+  '''
+  Entries of an `LRUCache`, shared by all caches with the same location.
+  '''
+  def __init__(self) -> None:
+    #: Map of key to (expiry, pickled value), least recently used first.
+    self.entries = collections.OrderedDict()
+    #: Total size of the pickled values, in bytes.
+    self.size = 0
+    self.lock = threading.Lock()
+
+  def pop(self, key: str) -> None:
+    '''
+    Remove an entry, if present.
+
+    :param key: cache key
+    '''
+    entry = self.entries.pop(key, None)
+    if entry is not None:
+      self.size -= len(entry[1])
+
+def response_key(request: HttpRequest, prefix: str) -> str:
+  '''
+  Get the cache key of the response to a request.
+
+  :param request: request
+  :param prefix: prefix identifying the data which the response depends on,
+    such as the version of a dataset
+
+  :return: cache key
+  '''
+  path = hashlib.md5(request.get_full_path().encode('utf-8')).hexdigest()
+  return 'pdata.response:%s:%s' % (prefix, path)
+
+def cached_response(
+    alias: str,
+    key: str,
+    view: typing.Callable[..., HttpResponse],
+    request: HttpRequest,
+    *args,
+    lock_timeout: float = 30,
+    **kwargs
+    ) -> HttpResponse:
+  '''
+  Get the response of a view from a cache, or render it and cache it. Only
+  successful, non-streaming responses are cached.
+
+  On a miss, a single request computes the response (its lock being held in
+  the cache itself, so that it is shared by all processes using the cache),
+  while concurrent requests for the same key wait for it. If the response
+  has not been cached after `lock_timeout` seconds, they compute it
+  themselves.
+
+  Hits and misses are counted by the 'pdata_response_cache_hits_total' and
+  'pdata_response_cache_misses_total' metrics.
+
+  :param alias: name of the cache (in `settings.CACHES`)
+  :param key: cache key of the response (see `response_key`)
+  :param view: view to compute the response with
+  :param request: request
+  :param lock_timeout: maximum number of seconds to wait for another request
+    computing the response
+
+  :return: response
+  '''
+  cache = caches[alias]
+  lock = key + ':lock'
+  deadline = time.monotonic() + lock_timeout
+
+  cached = cache.get(key)
+  while cached is None:
+    if cache.add(lock, True, lock_timeout):
+      try:
+        return _render_and_cache(alias, key, view, request, *args, **kwargs)
+      finally:
+        cache.delete(lock)
+
+    if time.monotonic() >= deadline:
+      return _render_and_cache(alias, key, view, request, *args, **kwargs)
+
+    time.sleep(POLL_INTERVAL)
+    cached = cache.get(key)
+
+  metrics.incr('pdata_response_cache_hits_total', cache=alias)
+  status, headers, content = cached
+  response = HttpResponse(content, status=status)
+  for header, value in headers:
+    response[header] = value
+  return response
+
+def _render_and_cache(
+    alias: str,
+    key: str,
+    view: typing.Callable[..., HttpResponse],
+    request: HttpRequest,
+    *args,
+    **kwargs
+    ) -> HttpResponse:
+  '''
+  Compute the response of a view, and cache it if it is successful.
+
+  :param alias: name of the cache
+  :param key: cache key of the response
+  :param view: view to compute the response with
+  :param request: request
+
+  :return: response
+  '''
+  metrics.incr('pdata_response_cache_misses_total', cache=alias)
+
+  response = view(request, *args, **kwargs)
+  if response.status_code != 200 or response.streaming:
+    return response
+
+  if hasattr(response, 'render'):
+    response = response.render()
+  caches[alias].set(key, (response.status_code, list(response.items()),
+    response.content))
+  return response
@@ -5,6 +5,7 @@
 # Description: Interface for data providers.
 
 import typing
+import importlib
 
 _registry = {}
 
@@ -34,6 +35,13 @@ class _BaseDataProvider(type):
     return cls
   
 class DataProvider(metaclass=_BaseDataProvider):
+  #: Maximum number of this provider's tasks which may run at once.
+  concurrency = 1
+
+  #: Tasks of providers with a higher priority are started first when
+  #: providers compete for the same resources (such as database writes).
+  priority = 0
+
   @property
   def tasks(self) -> typing.List[dict]:
     '''
@@ -57,6 +65,11 @@ class DataProvider(metaclass=_BaseDataProvider):
     In this case, `example.update` would be a function available with that
     import.
 
+    Besides the Celery Beat options, a task definition may include options
+    used by pdata when running the task: 'lease', 'adaptive' (see
+    `pdata.tasks.run_task`), 'timeout', 'jitter', and 'writes' (see
+    `pdata.runner.ScheduledTask`).
+
     :return: task definitions for the data provider
 
     :see: http://docs.celeryproject.org/en/v4.1.0/userguide/periodic-tasks.html#entries
@@ -64,4 +77,20 @@ class DataProvider(metaclass=_BaseDataProvider):
     raise NotImplementedError("DataProvider.tasks must be overridden.")
 
 def get_provider(name) -> DataProvider:
+  '''
+  Get the data provider of a dataset. The dataset's `data` module is imported
+  if the provider has not been registered yet.
+
+  :param name: name of the dataset (i.e. its Django app)
+
+  :return: data provider of the dataset
+
+  :raises KeyError: if the dataset does not define a data provider
+  '''
+  if name not in _registry:
+    try:
+      importlib.import_module('%s.data' % name)
+    except ImportError:
+      pass
+
   return _registry[name]
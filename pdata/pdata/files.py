@@ -0,0 +1,78 @@
+# pdata/pdata/files.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Files published atomically, for readers in other processes.
+
+import typing
+import os
+import re
+import contextlib
+import tempfile
+
+@contextlib.contextmanager
+def atomic_write(path: str) -> typing.Iterator[typing.BinaryIO]:
+  '''
+  Write a file atomically: its content is written to a temporary file in the
+  same directory, which is renamed to `path` once complete. Readers therefore
+  never see a partially-written file. If an exception is raised, the
+  temporary file is removed instead.
+
+  .. code:: python
+
+    with files.atomic_write('/var/pdata/snapshots/1184-12.json.gz') as f:
+      f.write(content)
+
+  :param path: path of the file
+
+  :return: context manager of the temporary file, opened for binary writing
+  '''
+  with tempfile.NamedTemporaryFile(dir=os.path.dirname(path), suffix='.tmp',
+      delete=False) as f:
+    try:
+      yield f
+    except BaseException:
+      f.close()
+      os.remove(f.name)
+      raise
+  os.replace(f.name, path)
+
+def publish(path: str, link: str, pattern: typing.Pattern = None) -> None:
+  '''
+  Atomically point a symbolic link to a file in its directory, so that
+  readers following the link see either the previous file or the new one.
+  Other files of the directory matching a pattern (such as the previous
+  versions of the file) are then removed.
+
+  :param path: path of the file
+  :param link: path of the link, in the same directory
+  :param pattern: pattern of the names of files to remove (default: none are
+    removed)
+  '''
+  directory, name = os.path.split(path)
+  temporary = tempfile.mktemp(dir=directory, suffix='.tmp')
+  os.symlink(name, temporary)
+  os.replace(temporary, link)
+
+  if pattern is None:
+    return
+
+  for other in os.listdir(directory):
+    if other != name and pattern.match(other):
+      try:
+        os.remove(os.path.join(directory, other))
+      except FileNotFoundError:
+        pass
+
+def published(link: str) -> typing.Optional[str]:
+  '''
+  Get the name of the file which a link points to (see `publish`).
+
+  :param link: path of the link
+
+  :return: name of the file, or None if there is no link
+  '''
+  try:
+    return os.readlink(link)
+  except FileNotFoundError:
+    return None
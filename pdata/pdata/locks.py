@@ -0,0 +1,237 @@
+# pdata/pdata/locks.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Single-flight locks for data provider tasks.
+
+import typing
+import os
+import re
+import time
+import fcntl
+import uuid
+import datetime
+import contextlib
+
+from django.conf import settings
+from django.db import transaction, IntegrityError
+from django.utils import timezone
+
+from pdata import models
+
+class LockBackend(object):
+  '''
+  Interface for lock backends. A lock is identified by a key, and is held by
+  an owner (a random token per acquisition) until it is released or its lease
+  expires.
+  '''
+  def acquire(self, key: str, owner: str, lease: int) -> bool:
+    '''
+    Attempt to acquire the lock, without blocking.
+
+    :param key: lock identifier
+    :param owner: token identifying the acquirer
+    :param lease: number of seconds after which the lock expires
+
+    :return: whether or not the lock was acquired
+    '''
+    raise NotImplementedError("LockBackend.acquire must be overridden.")
+
+  def release(self, key: str, owner: str) -> None:
+    '''
+    Release the lock, if it is still held by the owner.
+
+    :param key: lock identifier
+    :param owner: token identifying the acquirer
+    '''
+    raise NotImplementedError("LockBackend.release must be overridden.")
+
+class DatabaseLockBackend(LockBackend):
+  '''
+  Locks backed by a `TaskLock` row. These are shared by all workers using the
+  same database.
+  '''
+  def acquire(self, key: str, owner: str, lease: int) -> bool:
+    now = timezone.now()
+    expires_at = now + datetime.timedelta(seconds=lease)
+
+    # Take over an abandoned lock. This is a single conditional update, so
+    # only one run can succeed.
+    taken = (models.TaskLock.objects
+      .filter(key=key, expires_at__lte=now)
+      .update(owner=owner, acquired_at=now, expires_at=expires_at))
+    if taken:
+      return True
+
+    try:
+      with transaction.atomic():
+        models.TaskLock.objects.create(
+          key=key,
+          owner=owner,
+          acquired_at=now,
+          expires_at=expires_at)
+    except IntegrityError:
+      return False
+
+    return True
+
+  def release(self, key: str, owner: str) -> None:
+    models.TaskLock.objects.filter(key=key, owner=owner).delete()
+
+class FileLockBackend(LockBackend):
+  '''
+  Locks backed by lock files in a local directory. These are only shared by
+  workers on the same host.
+
+  A lock file is created exclusively and contains the owner and the lease
+  expiry, so an abandoned lock can be detected and broken. Breaking and
+  releasing a lock read the lock file before removing it, so they hold an
+  exclusive `flock` on a persistent guard file next to it while they do (see
+  `_guard`).
+  '''
+  def __init__(self, directory: str = None) -> None:
+    '''
+    :param directory: directory to store lock files in (default:
+      `settings.PDATA_TASK_LOCK_DIR`)
+    '''
+    self.directory = directory or settings.PDATA_TASK_LOCK_DIR
+
+  def path(self, key: str) -> str:
+    '''
+    Get the path of the lock file for a key.
+
+    :param key: lock identifier
+
+    :return: path to the lock file
+    '''
+    return os.path.join(self.directory,
+      '%s.lock' % re.sub(r'[^\w.=-]', '_', key))
+
+  def acquire(self, key: str, owner: str, lease: int) -> bool:
+    os.makedirs(self.directory, exist_ok=True)
+    path = self.path(key)
+
+    if self._create(path, owner, lease):
+      return True
+
+    with self._guard(path):
+      # The lock is read again once guarded, as another run may have broken
+      # it since.
+      holder = self._read(path)
+      if holder is not None and holder[1] > time.time():
+        return False
+
+      # The lease expired (or the lock was released), so break the lock.
+      # Runs which do not break locks only create the file exclusively, so
+      # at most one run holds it.
+      if holder is not None:
+        os.remove(path)
+      return self._create(path, owner, lease)
+
+  def release(self, key: str, owner: str) -> None:
+    path = self.path(key)
+    with self._guard(path):
+      holder = self._read(path)
+      if holder is not None and holder[0] == owner:
+        os.remove(path)
+
+  @contextlib.contextmanager
+  def _guard(self, path: str) -> typing.Iterator[None]:
+    '''
+    Hold an exclusive lock on the guard file of a lock file, so that no
+    other run breaks or releases the lock at the same time. The guard file
+    is never removed, so that every run locks the same file.
+
+    :param path: path to the lock file
+    '''
+    with open('%s.guard' % path, 'a') as f:
+      fcntl.flock(f, fcntl.LOCK_EX)
+      try:
+        yield
+      finally:
+        fcntl.flock(f, fcntl.LOCK_UN)
+
+  def _create(self, path: str, owner: str, lease: int) -> bool:
+    '''
+    Exclusively create a lock file.
+
+    :return: whether or not the file was created
+    '''
+    try:
+      fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+      return False
+
+    with os.fdopen(fd, 'w') as f:
+      f.write('%s %f' % (owner, time.time() + lease))
+    return True
+
+  def _read(self, path: str) -> typing.Optional[typing.Tuple[str, float]]:
+    '''
+    Read the lock file.
+
+    :return: tuple of (owner, expiry timestamp), or None if the lock file
+      does not exist or is still being written
+    '''
+    try:
+      with open(path) as f:
+        owner, expires_at = f.read().split()
+    except (FileNotFoundError, ValueError):
+      return None
+    return (owner, float(expires_at))
+
+BACKENDS = {
+  'database': DatabaseLockBackend,
+  'file': FileLockBackend,
+  }
+
+def get_backend() -> LockBackend:
+  '''
+  Get the lock backend configured by `settings.PDATA_TASK_LOCK_BACKEND`.
+
+  :return: lock backend
+
+  :raises ValueError: if the configured backend does not exist
+  '''
+  name = settings.PDATA_TASK_LOCK_BACKEND
+  try:
+    return BACKENDS[name]()
+  except KeyError:
+    raise ValueError('Unknown task lock backend: %s' % name)
+
+@contextlib.contextmanager
+def single_flight(
+    key: str,
+    lease: int = None,
+    backend: LockBackend = None
+    ) -> typing.Iterator[bool]:
+  '''
+  Hold the lock for `key` for the duration of the context, if it is not
+  already held. The context is entered regardless, and yields whether or not
+  the lock was acquired:
+
+  .. code:: python
+
+    with single_flight('courses:update_term:term=current') as acquired:
+      if acquired:
+        update_term()
+
+  :param key: lock identifier
+  :param lease: number of seconds after which the lock is considered
+    abandoned (default: `settings.PDATA_TASK_LOCK_LEASE`)
+  :param backend: lock backend (default: the configured backend)
+
+  :return: context manager yielding whether or not the lock was acquired
+  '''
+  if lease is None:
+    lease = settings.PDATA_TASK_LOCK_LEASE
+  if backend is None:
+    backend = get_backend()
+
+  owner = uuid.uuid4().hex
+  acquired = backend.acquire(key, owner, lease)
+  try:
+    yield acquired
+  finally:
+    if acquired:
+      backend.release(key, owner)
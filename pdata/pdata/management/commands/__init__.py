@@ -0,0 +1,5 @@
+# pdata/pdata/management/commands/__init__.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: pdata management commands.
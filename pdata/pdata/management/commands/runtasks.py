@@ -0,0 +1,52 @@
+# pdata/pdata/management/commands/runtasks.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Run data provider tasks on their schedules, without Celery.
+
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from pdata.runner import Runner
+
+class Command(BaseCommand):
+  help = ('Run the tasks of the given datasets (default: all of '
+    'PDATA_DATASETS) on their schedules, in this process.')
+
+  def add_arguments(self, parser) -> None:
+    parser.add_argument('datasets', nargs='*',
+      help='datasets to run the tasks of')
+    parser.add_argument('--workers', type=int, default=4,
+      help='maximum number of tasks to run at once (default: 4)')
+    parser.add_argument('--max-writers', type=int, default=1,
+      help='maximum number of database-writing tasks to run at once '
+        '(default: 1)')
+    parser.add_argument('--reserved-writers', type=int, default=1,
+      help='number of additional database-writing tasks of the '
+        'highest-priority dataset to run at once (default: 1)')
+    parser.add_argument('--processes', action='store_true',
+      help='run tasks in worker processes instead of threads')
+    parser.add_argument('--timeout', type=float, default=None,
+      help='seconds after which a run is abandoned (default: none)')
+    parser.add_argument('--jitter', type=float, default=0,
+      help='maximum seconds to randomly delay each run by (default: 0)')
+
+  def handle(self, *args, **options) -> None:
+    datasets = options['datasets'] or settings.PDATA_DATASETS
+    scheduled = Runner.load(datasets,
+      timeout=options['timeout'],
+      jitter=options['jitter'])
+    runner = Runner(scheduled,
+      workers=options['workers'],
+      max_writers=options['max_writers'],
+      reserved_writers=options['reserved_writers'],
+      processes=options['processes'])
+
+    for sig in (signal.SIGINT, signal.SIGTERM):
+      runner.loop.add_signal_handler(sig, runner.stop)
+
+    for task in scheduled:
+      self.stdout.write('Scheduled %s' % task)
+    runner.run_forever()
@@ -0,0 +1,145 @@
+# pdata/pdata/metrics.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: In-process metric counters, and timing of task runs.
+
+import typing
+import time
+import threading
+import contextlib
+import collections
+
+_lock = threading.Lock()
+_counters = collections.Counter()
+
+#: Holds the run being recorded by the current thread, if any.
+_local = threading.local()
+
+def incr(name: str, value: int = 1, **labels: str) -> None:
+  '''
+  Increment a counter. Counters are identified by their name and labels, so
+  the same name may be tracked separately for different label values.
+
+  .. code:: python
+
+    metrics.incr('pdata_task_skipped_total', source='courses')
+
+  :param name: name of the counter
+  :param value: amount to increment by
+  :param labels: labels further identifying the counter
+  '''
+  key = (name, tuple(sorted(labels.items())))
+  with _lock:
+    _counters[key] += value
+
+def counters() -> typing.Dict[typing.Tuple[str, tuple], int]:
+  '''
+  Get a snapshot of all counters in this process.
+
+  :return: map of (name, labels) to value, where labels is a sorted tuple of
+    (label, value) pairs
+  '''
+  with _lock:
+    return dict(_counters)
+
+def reset() -> None:
+  '''
+  Reset all counters. This is mainly useful in tests.
+  '''
+  with _lock:
+    _counters.clear()
+
+class RunRecorder(object):
+  '''
+  Records the metrics of a single task run: the time spent in each phase
+  (i.e. 'fetch', 'transform', and 'write'), the number of bytes downloaded,
+  and the error that made the run fail, if any.
+
+  Phases may be nested, in which case the time is attributed to the
+  innermost phase only.
+  '''
+  def __init__(self) -> None:
+    self.timings = collections.defaultdict(float)
+    self.bytes_downloaded = 0
+    self.error = None
+    self._phases = [] # Stack of [name, started], innermost last.
+
+  @contextlib.contextmanager
+  def phase(self, name: str) -> typing.Iterator[None]:
+    '''
+    Attribute the time spent in the context to a phase.
+
+    :param name: name of the phase
+    '''
+    now = time.perf_counter()
+    if self._phases:
+      outer = self._phases[-1]
+      self.timings[outer[0]] += now - outer[1]
+    self._phases.append([name, now])
+
+    try:
+      yield
+    finally:
+      now = time.perf_counter()
+      name, started = self._phases.pop()
+      self.timings[name] += now - started
+      if self._phases:
+        self._phases[-1][1] = now
+
+@contextlib.contextmanager
+def recording() -> typing.Iterator[RunRecorder]:
+  '''
+  Record the metrics of a task run in the current thread, for the duration
+  of the context.
+
+  :return: context manager yielding the recorder
+  '''
+  previous = getattr(_local, 'run', None)
+  _local.run = RunRecorder()
+  try:
+    yield _local.run
+  finally:
+    _local.run = previous
+
+def current_run() -> RunRecorder:
+  '''
+  Get the recorder of the task run in the current thread. Outside of a run,
+  a new recorder is returned, so that metrics can be recorded
+  unconditionally.
+
+  :return: run recorder
+  '''
+  return getattr(_local, 'run', None) or RunRecorder()
+
+def phase(name: str) -> typing.ContextManager[None]:
+  '''
+  Attribute the time spent in the context to a phase of the current run.
+
+  .. code:: python
+
+    with metrics.phase('fetch'):
+      response = urllib.request.urlopen(url)
+
+  :param name: name of the phase
+
+  :return: context manager
+  '''
+  return current_run().phase(name)
+
+def add_bytes(count: int) -> None:
+  '''
+  Count downloaded bytes towards the current run.
+
+  :param count: number of bytes
+  '''
+  current_run().bytes_downloaded += count
+
+def fail(error: str) -> None:
+  '''
+  Mark the current run as failed, for failures which the task handles itself
+  rather than raising.
+
+  :param error: description of the error
+  '''
+  current_run().error = error
@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-19 08:47
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdata', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskSchedule',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('interval', models.FloatField()),
+                ('next_run_at', models.DateTimeField()),
+                ('unchanged_runs', models.PositiveIntegerField(default=0)),
+                ('last_changed_at', models.DateTimeField(null=True)),
+            ],
+        ),
+    ]
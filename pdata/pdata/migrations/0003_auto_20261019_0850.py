@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-19 08:50
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdata', '0002_taskschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=100)),
+                ('task', models.CharField(max_length=255)),
+                ('scope', models.CharField(blank=True, max_length=255)),
+                ('outcome', models.PositiveSmallIntegerField(choices=[(1, 'Success'), (2, 'Failure'), (3, 'Skipped')])),
+                ('error', models.TextField(blank=True)),
+                ('started_at', models.DateTimeField(db_index=True)),
+                ('duration', models.FloatField()),
+                ('fetch_time', models.FloatField(default=0)),
+                ('transform_time', models.FloatField(default=0)),
+                ('write_time', models.FloatField(default=0)),
+                ('bytes_downloaded', models.BigIntegerField(default=0)),
+                ('changes', models.TextField(default='{}')),
+            ],
+        ),
+        migrations.AlterIndexTogether(
+            name='taskrun',
+            index_together=set([('source', 'task', 'started_at')]),
+        ),
+    ]
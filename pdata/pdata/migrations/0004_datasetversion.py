@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11 on 2026-10-19 08:58
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('pdata', '0003_auto_20261019_0850'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetVersion',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dataset', models.CharField(max_length=100)),
+                ('scope', models.CharField(blank=True, max_length=255)),
+                ('version', models.BigIntegerField()),
+                ('modified_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='datasetversion',
+            unique_together=set([('dataset', 'scope')]),
+        ),
+    ]
@@ -0,0 +1,125 @@
+# pdata/pdata/models.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Models for pdata's task execution state.
+
+from django.db import models
+
+class TaskLock(models.Model):
+  '''
+  The `TaskLock` model represents a single in-progress run of a data provider
+  task. At most one row exists per key, so creating the row acts as acquiring
+  the lock. A lock whose lease has expired is considered abandoned and may be
+  taken over by another run.
+  '''
+  #: Identifies the task and its arguments (i.e. provider, task, and term).
+  key = models.CharField(max_length=255, unique=True)
+
+  #: Random token identifying the run which holds the lock.
+  owner = models.CharField(max_length=32)
+
+  acquired_at = models.DateTimeField()
+  expires_at = models.DateTimeField()
+
+class TaskSchedule(models.Model):
+  '''
+  The `TaskSchedule` model represents the state of a task with an adaptive
+  schedule (see `pdata.schedules.AdaptiveSchedule`).
+  '''
+  #: Identifies the task and its arguments (i.e. provider, task, and term).
+  key = models.CharField(max_length=255, unique=True)
+
+  #: Current interval between runs, in seconds.
+  interval = models.FloatField()
+  next_run_at = models.DateTimeField()
+
+  #: Number of consecutive runs which detected no change.
+  unchanged_runs = models.PositiveIntegerField(default=0)
+  last_changed_at = models.DateTimeField(null=True)
+
+class TaskRun(models.Model):
+  '''
+  The `TaskRun` model represents a single run of a data provider task, along
+  with the metrics recorded during it.
+  '''
+  source = models.CharField(max_length=100)
+  task = models.CharField(max_length=255)
+
+  #: Keyword arguments of the task (i.e. the term), as in its lock key.
+  scope = models.CharField(max_length=255, blank=True)
+
+  OUTCOME_SUCCESS = 1
+  OUTCOME_FAILURE = 2
+  #: The run was skipped, because a previous run was still in progress.
+  OUTCOME_SKIPPED = 3
+  outcome = models.PositiveSmallIntegerField(choices=(
+    (OUTCOME_SUCCESS, 'Success'),
+    (OUTCOME_FAILURE, 'Failure'),
+    (OUTCOME_SKIPPED, 'Skipped'),
+    ))
+  error = models.TextField(blank=True)
+
+  started_at = models.DateTimeField(db_index=True)
+  duration = models.FloatField()
+
+  #: Seconds spent in each phase of the run.
+  fetch_time = models.FloatField(default=0)
+  transform_time = models.FloatField(default=0)
+  write_time = models.FloatField(default=0)
+
+  bytes_downloaded = models.BigIntegerField(default=0)
+
+  #: JSON-encoded number of objects created, updated, and deleted per model,
+  #: such as {"section": {"created": 0, "updated": 2, "deleted": 0}}.
+  changes = models.TextField(default='{}')
+
+  class Meta:
+    index_together = ('source', 'task', 'started_at')
+
+class DatasetVersion(models.Model):
+  '''
+  The `DatasetVersion` model represents the version of a dataset's data,
+  which is bumped whenever a commit changes it (see `pdata.versions`). Each
+  dataset has a global version, with an empty scope, and may also version
+  parts of its data separately (i.e. per term).
+
+  Versions are allocated from the dataset's global version, so the version
+  of a scope is that of the latest change to it.
+  '''
+  dataset = models.CharField(max_length=100)
+  scope = models.CharField(max_length=255, blank=True)
+
+  version = models.BigIntegerField()
+  modified_at = models.DateTimeField()
+
+  class Meta:
+    unique_together = ('dataset', 'scope')
+
+class Versioned(models.Model):
+  '''
+  The `Versioned` model is the base of models whose rows carry the version
+  of the dataset which last changed them (see `pdata.versions`), so that
+  clients may fetch only the rows changed since a version they have seen.
+  Deleted rows are recorded by `Tombstone`.
+  '''
+  #: Version of the dataset which created or last changed the row, or 0 if
+  #: it predates row versions.
+  version = models.BigIntegerField(default=0, db_index=True)
+
+  class Meta:
+    abstract = True
+
+class Tombstone(models.Model):
+  '''
+  The `Tombstone` model represents the deletion of a row of a `Versioned`
+  model, at a version of its dataset.
+  '''
+  #: Label of the row's model, such as 'courses.section'.
+  model = models.CharField(max_length=100)
+  object_id = models.BigIntegerField()
+
+  version = models.BigIntegerField()
+
+  class Meta:
+    index_together = ('model', 'version')
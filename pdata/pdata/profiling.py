@@ -0,0 +1,291 @@
+# pdata/pdata/profiling.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Per-request profiling of queries, serialization, and rendering.
+
+import typing
+import os
+import re
+import time
+import random
+import logging
+import marshal
+import cProfile
+import contextlib
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.utils import CursorWrapper
+from django.http import HttpRequest, HttpResponse
+
+from pdata import files
+
+LOGGER = logging.getLogger('pdata.profiling')
+
+#: Wraps the execution of a query, as `wrapper(execute, sql, params, many,
+#: context)`, where `execute(sql, params, many, context)` executes it.
+ExecuteWrapper = typing.Callable[..., typing.Any]
+
+class _WrappedCursor(CursorWrapper):
+  '''
+  Cursor whose queries are executed through a wrapper (see
+  `execute_wrapper`).
+  '''
+  def __init__(self, cursor: typing.Any, db: typing.Any,
+      wrapper: ExecuteWrapper) -> None:
+    super().__init__(cursor, db)
+    self.wrapper = wrapper
+
+  def execute(self, sql: str, params: typing.Any = None) -> typing.Any:
+    return self.wrapper(self._execute, sql, params, False,
+      {'connection': self.db, 'cursor': self})
+
+  def executemany(self, sql: str, param_list: typing.Any) -> typing.Any:
+    return self.wrapper(self._execute, sql, param_list, True,
+      {'connection': self.db, 'cursor': self})
+
+  def _execute(self, sql: str, params: typing.Any, many: bool,
+      context: dict) -> typing.Any:
+    if many:
+      return super().executemany(sql, params)
+    return super().execute(sql, params)
+
+@contextlib.contextmanager
+def execute_wrapper(wrapper: ExecuteWrapper) -> typing.Iterator[None]:
+  '''
+  Execute the queries of the current thread's connections through a
+  wrapper, while in the context. This is the equivalent of Django's
+  `connection.execute_wrapper` (which Django 1.11 lacks), and is installed
+  by wrapping the cursors which each connection creates.
+
+  .. code:: python
+
+    def count(execute, sql, params, many, context):
+      queries.append(sql)
+      return execute(sql, params, many, context)
+
+    with profiling.execute_wrapper(count):
+      ...
+
+  :param wrapper: function executing each query (see `ExecuteWrapper`)
+  '''
+  # Connections are per-thread, so other threads' queries are not wrapped.
+  # Wrappers may be nested, so the previous cursor factories are restored.
+  previous = []
+  for connection in connections.all():
+    for make in ('make_cursor', 'make_debug_cursor'):
+      make_cursor = getattr(connection, make)
+      previous.append((connection, make, connection.__dict__.get(make)))
+      setattr(connection, make, lambda cursor, make_cursor=make_cursor,
+          connection=connection: _WrappedCursor(make_cursor(cursor),
+            connection, wrapper))
+
+  try:
+    yield
+  finally:
+    for (connection, make, make_cursor) in reversed(previous):
+      if make_cursor is None:
+        delattr(connection, make)
+      else:
+        setattr(connection, make, make_cursor)
+
+class RequestProfile(object):
+  '''
+  Measurements of a single request: its queries and the time spent in them,
+  in the view outside of them (which, for API views, is mostly
+  serialization), and in rendering the response. Times are in seconds.
+
+  :param sampled: whether to collect a cProfile of the request
+  '''
+  def __init__(self, sampled: bool = False) -> None:
+    self.started = time.perf_counter()
+    self.queries = 0
+    self.db_time = 0.0
+    self.total = None
+
+    self.profiler = cProfile.Profile() if sampled else None
+
+    # Set once the view is called, and once it returns a response which is
+    # rendered afterwards (see `ProfilingMiddleware`).
+    self._view_started = None
+    self._view_db_time = None
+    self.view_time = None
+    self._render_started = None
+    self.render_time = None
+
+  def execute(self, execute: typing.Callable, sql: str, params: typing.Any,
+      many: bool, context: dict) -> typing.Any:
+    '''
+    Execute a query, counting it and its time (see `execute_wrapper`).
+    '''
+    started = time.perf_counter()
+    try:
+      return execute(sql, params, many, context)
+    finally:
+      self.db_time += time.perf_counter() - started
+      self.queries += 1
+
+  def view_started(self) -> None:
+    '''
+    Mark the start of the view.
+    '''
+    self._view_started = time.perf_counter()
+    self._view_db_time = self.db_time
+
+  def view_finished(self) -> None:
+    '''
+    Mark the end of the view, which is the start of rendering its response.
+    '''
+    self._render_started = time.perf_counter()
+    if self._view_started is not None:
+      self.view_time = self._render_started - self._view_started
+
+  def rendered(self, response: HttpResponse) -> None:
+    '''
+    Mark the end of rendering a response.
+
+    :param response: rendered response
+    '''
+    self.render_time = time.perf_counter() - self._render_started
+
+  def finish(self) -> None:
+    '''
+    Mark the end of the request.
+    '''
+    self.total = time.perf_counter() - self.started
+
+  @property
+  def serialize_time(self) -> typing.Optional[float]:
+    '''
+    Time spent in the view outside of queries, or None if the view's
+    response was not rendered separately.
+    '''
+    if self.view_time is None:
+      return None
+    return max(self.view_time - (self.db_time - self._view_db_time), 0)
+
+  def server_timing(self) -> str:
+    '''
+    Format the measurements as a Server-Timing header, such as
+    'db;dur=4.1;desc="3 queries", serialize;dur=2.5, render;dur=0.8,
+    total;dur=9.6' (in milliseconds).
+
+    :return: header value
+    '''
+    metrics = ['db;dur=%.1f;desc="%d queries"' % (self.db_time * 1000,
+      self.queries)]
+    for name, duration in (('serialize', self.serialize_time),
+        ('render', self.render_time), ('total', self.total)):
+      if duration is not None:
+        metrics.append('%s;dur=%.1f' % (name, duration * 1000))
+    return ', '.join(metrics)
+
+class ProfilingMiddleware(object):
+  '''
+  Measures the queries, serialization, and rendering of each request, and
+  reports them in the response's Server-Timing header (see
+  `RequestProfile`). Requests slower than `settings.PDATA_PROFILE_SLOW`
+  seconds are logged, and a cProfile of those of them which were sampled
+  (`settings.PDATA_PROFILE_SAMPLE_RATE` of all requests) is saved (see
+  `save_profile`).
+
+  The middleware is only used if `settings.PDATA_PROFILE` is set, so it adds
+  no overhead otherwise.
+  '''
+  def __init__(self, get_response: typing.Callable) -> None:
+    if not settings.PDATA_PROFILE:
+      raise MiddlewareNotUsed()
+    self.get_response = get_response
+
+  def __call__(self, request: HttpRequest) -> HttpResponse:
+    profile = RequestProfile(
+      sampled=random.random() < settings.PDATA_PROFILE_SAMPLE_RATE)
+    request.profile = profile
+
+    with execute_wrapper(profile.execute):
+      if profile.profiler is not None:
+        profile.profiler.enable()
+      try:
+        response = self.get_response(request)
+      finally:
+        if profile.profiler is not None:
+          profile.profiler.disable()
+    profile.finish()
+
+    response['Server-Timing'] = profile.server_timing()
+    if profile.total >= settings.PDATA_PROFILE_SLOW:
+      self.slow_request(request, profile)
+    return response
+
+  def process_view(self,
+      request: HttpRequest,
+      view: typing.Callable,
+      args: tuple,
+      kwargs: dict
+      ) -> None:
+    request.profile.view_started()
+
+  def process_template_response(self,
+      request: HttpRequest,
+      response: HttpResponse
+      ) -> HttpResponse:
+    # Template (and REST framework) responses are rendered once the view
+    # returns.
+    request.profile.view_finished()
+    response.add_post_render_callback(request.profile.rendered)
+    return response
+
+  def slow_request(self, request: HttpRequest,
+      profile: RequestProfile) -> None:
+    '''
+    Log a slow request, and save its cProfile if it was sampled.
+
+    :param request: request
+    :param profile: measurements of the request
+    '''
+    path = None
+    if profile.profiler is not None:
+      try:
+        path = save_profile(profile.profiler, request)
+      except OSError as e:
+        LOGGER.error('Could not save profile: %s' % str(e))
+
+    LOGGER.warning('Slow request: %s %s took %.0f ms (%d queries, %.0f ms)%s'
+      % (request.method, request.get_full_path(), profile.total * 1000,
+        profile.queries, profile.db_time * 1000,
+        ', profiled in %s' % path if path else ''))
+
+def save_profile(profiler: cProfile.Profile, request: HttpRequest) -> str:
+  '''
+  Save the cProfile of a request to `settings.PDATA_PROFILE_DIR`, which may
+  be read with `pstats.Stats`. Only the latest
+  `settings.PDATA_PROFILE_MAX_FILES` profiles are kept.
+
+  :param profiler: profiler of the request
+  :param request: request
+
+  :return: path of the profile
+  '''
+  directory = settings.PDATA_PROFILE_DIR
+  os.makedirs(directory, exist_ok=True)
+
+  # Names sort by time, so the oldest profiles are the first ones.
+  name = '%d-%s-%s.prof' % (time.time() * 1000, request.method,
+    re.sub(r'[^A-Za-z0-9]+', '_', request.path).strip('_')[:100])
+  path = os.path.join(directory, name)
+
+  profiler.create_stats()
+  with files.atomic_write(path) as f:
+    marshal.dump(profiler.stats, f)
+
+  profiles = sorted(p for p in os.listdir(directory) if p.endswith('.prof'))
+  for old in profiles[:max(len(profiles) - settings.PDATA_PROFILE_MAX_FILES,
+      0)]:
+    try:
+      os.remove(os.path.join(directory, old))
+    except FileNotFoundError:
+      pass
+
+  return path
@@ -0,0 +1,382 @@
+# pdata/pdata/runner.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: In-process scheduler for data provider tasks.
+
+import typing
+import logging
+import asyncio
+import random
+import heapq
+import itertools
+import datetime
+import concurrent.futures
+
+import django
+from celery import schedules as celery_schedules
+from django import db
+from django.apps import apps
+
+import pdata.data
+from pdata import tasks, metrics
+
+LOGGER = logging.getLogger('pdata.runner')
+
+class ScheduledTask(object):
+  '''
+  A data provider task, as scheduled by the `Runner`.
+
+  Tasks are assumed to write to the database, unless their definition sets
+  'writes' to False. The number of writing tasks running at once is limited
+  by the runner.
+  '''
+  def __init__(self,
+      source: str,
+      task_def: dict,
+      timeout: float = None,
+      jitter: float = 0
+      ) -> None:
+    '''
+    :param source: name of the dataset providing the task
+    :param task_def: task definition (see `pdata.data.DataProvider.tasks`)
+    :param timeout: default number of seconds after which a run is abandoned,
+      if the definition has no 'timeout'
+    :param jitter: default maximum number of seconds to randomly delay each
+      run by, if the definition has no 'jitter'
+    '''
+    provider = pdata.data.get_provider(source)
+
+    self.source = source
+    self.name = task_def['task']
+    self.schedule = as_schedule(task_def['schedule'])
+    self.timeout = task_def.get('timeout', timeout)
+    self.jitter = task_def.get('jitter', jitter)
+    self.writes = task_def.get('writes', True)
+    self.priority = provider.priority
+    self.concurrency = provider.concurrency
+
+    #: None until the first run, which is due immediately.
+    self.last_run_at = None
+
+  def __str__(self) -> str:
+    return '%s:%s' % (self.source, self.name)
+
+  def delay(self) -> float:
+    '''
+    Get the number of seconds until the next run is due, including jitter.
+
+    :return: delay until the next run
+    '''
+    remaining = 0
+    if self.last_run_at is not None:
+      remaining = max(0, self.schedule.remaining_estimate(
+        self.last_run_at).total_seconds())
+
+    return remaining + random.uniform(0, self.jitter)
+
+def as_schedule(schedule: typing.Any) -> celery_schedules.schedule:
+  '''
+  Convert a task's 'schedule' to a Celery schedule. As with Celery Beat, the
+  schedule may be a number of seconds, a `datetime.timedelta`, or a Celery
+  schedule (such as a `crontab`).
+
+  :param schedule: schedule to convert
+
+  :return: Celery schedule
+  '''
+  if isinstance(schedule, (int, float)):
+    schedule = datetime.timedelta(seconds=schedule)
+  if isinstance(schedule, datetime.timedelta):
+    schedule = celery_schedules.schedule(schedule)
+  return schedule
+
+class PrioritySemaphore(object):
+  '''
+  Semaphore for coroutines, where waiters with a higher priority acquire it
+  first. Waiters with the same priority acquire it in order.
+
+  Some of its slots may be reserved for waiters of at least a given
+  priority, so that they never wait for lower-priority holders to release
+  it (holders cannot be preempted).
+  '''
+  def __init__(self, value: int, reserved: int = 0,
+      reserved_priority: int = 0) -> None:
+    '''
+    :param value: number of holders allowed at once, including the reserved
+      slots
+    :param reserved: number of slots which only waiters with at least
+      `reserved_priority` may acquire
+    :param reserved_priority: minimum priority of the reserved slots' holders
+    '''
+    self._value = value
+    self._reserved = reserved
+    self._reserved_priority = reserved_priority
+    self._waiters = [] # Heap of (-priority, order, future).
+    self._order = itertools.count()
+
+  def _available(self, priority: int) -> bool:
+    '''
+    Check whether a slot is free for a waiter.
+
+    :param priority: priority of the waiter
+
+    :return: whether it may acquire the semaphore
+    '''
+    if priority >= self._reserved_priority:
+      return self._value > 0
+    return self._value > self._reserved
+
+  async def acquire(self, priority: int = 0) -> None:
+    '''
+    Acquire the semaphore, waiting until it is available.
+
+    :param priority: priority of the waiter
+    '''
+    # Waiters are woken as soon as a slot is free for them, so none of those
+    # waiting can take a slot which is free for this one.
+    if self._available(priority):
+      self._value -= 1
+      return
+
+    future = asyncio.get_event_loop().create_future()
+    heapq.heappush(self._waiters, (-priority, next(self._order), future))
+    try:
+      await future
+    except asyncio.CancelledError:
+      # The semaphore may have been handed over just before cancellation.
+      if future.done() and not future.cancelled():
+        self.release()
+      raise
+
+  def release(self) -> None:
+    '''
+    Release the semaphore, handing it to the highest-priority waiter which
+    may take the freed slot.
+    '''
+    self._value += 1
+    while self._waiters:
+      (priority, _, future) = self._waiters[0]
+      if future.done():
+        heapq.heappop(self._waiters)
+      elif self._available(-priority):
+        heapq.heappop(self._waiters)
+        self._value -= 1
+        future.set_result(None)
+      else:
+        # Lower-priority waiters may not take the slot either.
+        break
+
+def execute(source: str, name: str) -> typing.Any:
+  '''
+  Run a task in a worker thread or process. Database connections are managed
+  as they would be for a request, since each worker has its own connection.
+
+  :param source: name of the dataset providing the task
+  :param name: name of the task
+
+  :return: result of the task
+  '''
+  # Worker processes which are not forked from the runner (i.e. with the
+  # 'spawn' start method) have to set up Django themselves.
+  if not apps.ready:
+    django.setup()
+
+  db.close_old_connections()
+  try:
+    return tasks.run_task(source, name)
+  finally:
+    db.close_old_connections()
+
+class Runner(object):
+  '''
+  Runs data provider tasks on their schedules, without a Celery broker.
+  Scheduling is done in an asyncio event loop, while the tasks themselves
+  (which block on the network and database) run in a bounded pool of worker
+  threads or processes.
+
+  Tasks of different providers run in parallel, subject to three limits:
+
+  - Each provider runs at most `DataProvider.concurrency` tasks at once.
+  - At most `max_writers` tasks which write to the database run at once.
+    Providers with a higher `DataProvider.priority` get to write first.
+  - At most `workers` tasks run at once in total.
+
+  A writing task keeps its slot until its worker finishes, even if the run
+  times out, as the worker cannot be interrupted. Nor can a running task be
+  preempted, so a high-priority task may have to wait for a long,
+  low-priority one to finish. To avoid this, `reserved_writers` more slots
+  are reserved for the tasks of the highest-priority provider (such as
+  courses), if the providers' priorities differ.
+
+  .. code:: python
+
+    runner = Runner(Runner.load(['courses']), workers=2)
+    runner.run_forever()
+  '''
+  def __init__(self,
+      scheduled: typing.List[ScheduledTask],
+      workers: int = 4,
+      max_writers: int = 1,
+      reserved_writers: int = 1,
+      processes: bool = False,
+      loop: asyncio.AbstractEventLoop = None
+      ) -> None:
+    '''
+    :param scheduled: tasks to run
+    :param workers: maximum number of tasks to run at once
+    :param max_writers: maximum number of database-writing tasks to run at
+      once
+    :param reserved_writers: number of additional database-writing tasks of
+      the highest-priority provider to run at once
+    :param processes: whether to run tasks in worker processes, rather than
+      threads, so that CPU-bound work is not serialized by the GIL
+    :param loop: event loop to run in (default: the current event loop)
+    '''
+    self.scheduled = scheduled
+    self.loop = loop or asyncio.get_event_loop()
+    self.processes = processes
+    self.executor = (concurrent.futures.ProcessPoolExecutor(workers)
+      if processes else concurrent.futures.ThreadPoolExecutor(workers))
+    self._futures = []
+
+    priorities = {t.priority for t in scheduled}
+    if len(priorities) < 2:
+      reserved_writers = 0
+    self.writers = PrioritySemaphore(max_writers + reserved_writers,
+      reserved=reserved_writers, reserved_priority=max(priorities, default=0))
+
+    #: Maps each provider to the semaphore limiting its concurrency. These
+    #: are created in the event loop, as they are bound to it.
+    self.provider_limits = {}
+
+  @staticmethod
+  def load(
+      sources: typing.List[str],
+      timeout: float = None,
+      jitter: float = 0
+      ) -> typing.List[ScheduledTask]:
+    '''
+    Load the tasks of the given datasets from the provider registry.
+
+    :param sources: names of the datasets
+    :param timeout: default timeout for each task (see `ScheduledTask`)
+    :param jitter: default jitter for each task (see `ScheduledTask`)
+
+    :return: scheduled tasks
+    '''
+    return [ScheduledTask(source, task_def, timeout, jitter)
+      for source in sources
+      for task_def in pdata.data.get_provider(source).tasks]
+
+  async def run_once(self, task: ScheduledTask) -> typing.Any:
+    '''
+    Run a task once, in the worker pool.
+
+    :param task: task to run
+
+    :return: result of the task, or None if it failed or timed out
+    '''
+    task.last_run_at = task.schedule.now()
+
+    provider_limit = self.provider_limits.get(task.source)
+    if provider_limit is None:
+      provider_limit = asyncio.Semaphore(task.concurrency)
+      self.provider_limits[task.source] = provider_limit
+
+    await provider_limit.acquire()
+    if task.writes:
+      try:
+        await self.writers.acquire(task.priority)
+      except asyncio.CancelledError:
+        provider_limit.release()
+        raise
+
+    def release(future: typing.Optional[asyncio.Future] = None) -> None:
+      if task.writes:
+        self.writers.release()
+      provider_limit.release()
+
+    try:
+      future = self.loop.run_in_executor(self.executor,
+        execute, task.source, task.name)
+    except Exception:
+      release()
+      raise
+
+    # The limits are held until the worker finishes, rather than until the
+    # run is abandoned, so they hold even when tasks time out.
+    future.add_done_callback(release)
+    return await self._wait(task, future)
+
+  async def _wait(self, task: ScheduledTask,
+      future: asyncio.Future) -> typing.Any:
+    '''
+    Wait for a task's run in the worker pool to finish.
+
+    :param task: task being run
+    :param future: future of the run
+
+    :return: result of the task, or None if it failed or timed out
+    '''
+    try:
+      # The run is shielded, as cancelling it would not stop the worker.
+      return await asyncio.wait_for(asyncio.shield(future), task.timeout)
+    except asyncio.TimeoutError:
+      # The worker cannot be interrupted, so it is left to finish on its own,
+      # holding on to the task's limits; the task's lock prevents another run
+      # from overlapping it.
+      LOGGER.error('%s timed out after %s seconds' % (task, task.timeout))
+      metrics.incr('pdata_task_timeout_total',
+        source=task.source, task=task.name)
+    except asyncio.CancelledError:
+      raise
+    except Exception:
+      LOGGER.exception('%s failed' % task)
+      metrics.incr('pdata_task_failed_total',
+        source=task.source, task=task.name)
+
+    return None
+
+  async def schedule(self, task: ScheduledTask) -> None:
+    '''
+    Run a task on its schedule, forever.
+
+    :param task: task to run
+    '''
+    while True:
+      await asyncio.sleep(task.delay())
+      await self.run_once(task)
+
+  async def run(self) -> None:
+    '''
+    Run all tasks on their schedules, until stopped.
+    '''
+    if self.processes:
+      # Worker processes are forked on the first run, and must not share the
+      # runner's database connections.
+      db.connections.close_all()
+
+    self._futures = [asyncio.ensure_future(self.schedule(t))
+      for t in self.scheduled]
+
+    try:
+      await asyncio.gather(*self._futures)
+    except asyncio.CancelledError:
+      pass
+
+  def stop(self) -> None:
+    '''
+    Stop scheduling tasks. Runs which are in progress are allowed to finish.
+    '''
+    for future in self._futures:
+      future.cancel()
+
+  def run_forever(self) -> None:
+    '''
+    Run all tasks on their schedules in the event loop, until stopped.
+    '''
+    try:
+      self.loop.run_until_complete(self.run())
+    finally:
+      self.executor.shutdown(wait=True)
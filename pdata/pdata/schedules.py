@@ -0,0 +1,143 @@
+# pdata/pdata/schedules.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Adaptive scheduling of data provider tasks.
+
+import typing
+import datetime
+
+from django.utils import timezone
+
+from pdata import models
+
+#: A calendar window, as an inclusive (start, end) pair of dates.
+Window = typing.Tuple[datetime.date, datetime.date]
+
+class AdaptiveSchedule(object):
+  '''
+  Schedule which adapts the interval between runs of a task to how often its
+  data changes. Every run which detects no change multiplies the interval by
+  `backoff`, up to `max_interval`; a run which detects a change resets it to
+  `min_interval`. During any of the calendar windows, the task always runs
+  every `min_interval` seconds.
+
+  The task itself is still scheduled every `min_interval` seconds, and runs
+  which are not yet due are skipped when executed (see
+  `pdata.tasks.run_task`). To use it, include it in the task definition:
+
+  .. code:: python
+
+    {
+      'task': 'example.update',
+      'schedule': 60,
+      'adaptive': AdaptiveSchedule(60, 3600, windows=registration_periods),
+      }
+
+  A task reports whether it detected a change through its return value (see
+  `has_changes`).
+  '''
+  def __init__(self,
+      min_interval: float,
+      max_interval: float,
+      backoff: float = 2,
+      windows: typing.Callable[[], typing.Iterable[Window]] = None
+      ) -> None:
+    '''
+    :param min_interval: shortest interval between runs, in seconds
+    :param max_interval: longest interval between runs, in seconds
+    :param backoff: factor to increase the interval by after each run which
+      detected no change
+    :param windows: function returning the calendar windows during which the
+      task should run as often as possible
+    '''
+    self.min_interval = min_interval
+    self.max_interval = max_interval
+    self.backoff = backoff
+    self.windows = windows
+
+  def in_window(self, date: datetime.date) -> bool:
+    '''
+    Check whether a date falls within any of the calendar windows.
+
+    :param date: date to check
+
+    :return: whether or not the date is within a window
+    '''
+    if self.windows is None:
+      return False
+
+    return any(start <= date <= end for (start, end) in self.windows())
+
+  def next_interval(self, interval: float, changed: bool) -> float:
+    '''
+    Compute the interval until the next run.
+
+    :param interval: interval before the current run
+    :param changed: whether or not the current run detected a change
+
+    :return: interval until the next run, in seconds
+    '''
+    if changed:
+      return self.min_interval
+
+    return min(self.max_interval, interval * self.backoff)
+
+  def is_due(self, key: str) -> bool:
+    '''
+    Check whether the task is due to run.
+
+    :param key: task identifier (i.e. its lock key)
+
+    :return: whether or not the task should run now
+    '''
+    if self.in_window(timezone.localdate()):
+      return True
+
+    state = models.TaskSchedule.objects.filter(key=key).first()
+    return state is None or state.next_run_at <= timezone.now()
+
+  def record(self, key: str, changed: bool) -> float:
+    '''
+    Record a run of the task, and schedule the next one.
+
+    :param key: task identifier (i.e. its lock key)
+    :param changed: whether or not the run detected a change
+
+    :return: interval until the next run, in seconds
+    '''
+    now = timezone.now()
+    state, _ = models.TaskSchedule.objects.get_or_create(
+      key=key,
+      defaults={'interval': self.min_interval, 'next_run_at': now})
+
+    if self.in_window(timezone.localdate()):
+      state.interval = self.min_interval
+    else:
+      state.interval = self.next_interval(state.interval, changed)
+
+    if changed:
+      state.unchanged_runs = 0
+      state.last_changed_at = now
+    else:
+      state.unchanged_runs += 1
+
+    state.next_run_at = now + datetime.timedelta(seconds=state.interval)
+    state.save()
+    return state.interval
+
+def has_changes(result: typing.Any) -> bool:
+  '''
+  Check whether the result of a task reports any change. Tasks report changes
+  as the number of objects changed per model, such as
+  {'section': {'created': 0, 'updated': 2}}. Any other result (such as None,
+  when the data could not be fetched) reports no change.
+
+  :param result: result of the task
+
+  :return: whether or not the task changed any data
+  '''
+  if not isinstance(result, dict):
+    return False
+
+  return any(any(counts.values()) for counts in result.values())
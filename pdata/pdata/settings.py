@@ -22,7 +22,9 @@ TESTING = (ENV == 'test' or
   (len(sys.argv) >= 2 and sys.argv[1] == 'test'))
 
 ### Application Definition
-INSTALLED_APPS = []
+INSTALLED_APPS = [
+  'pdata',
+]
 
 PDATA_DATASETS = [
   'courses',
@@ -30,6 +32,7 @@ PDATA_DATASETS = [
 INSTALLED_APPS.extend(PDATA_DATASETS)
 
 MIDDLEWARE = [
+  'pdata.profiling.ProfilingMiddleware',
   'django.middleware.security.SecurityMiddleware',
   'django.middleware.common.CommonMiddleware',
 ]
@@ -58,6 +61,117 @@ CELERYBEAT_SCHEDULER = 'djcelery.schedulers.DatabaseScheduler'
 # imported
 # CELERYBEAT_SCHEDULE = utils.load_celery_tasks(PDATA_DATASETS)
 
+### Task Execution
+#: Local directory for runtime state (file locks, generated files, etc.).
+PDATA_VAR_DIR = os.getenv('PDATA_VAR_DIR', os.path.join(BASE_DIR, 'var'))
+
+#: Backend used to prevent overlapping runs of the same task. Either
+#: 'database' (a lock row, shared by all hosts) or 'file' (a lock file, for
+#: single-host deployments).
+PDATA_TASK_LOCK_BACKEND = os.getenv('PDATA_TASK_LOCK_BACKEND', 'database')
+PDATA_TASK_LOCK_DIR = os.path.join(PDATA_VAR_DIR, 'locks')
+
+#: Number of seconds after which a task's lock is considered abandoned (i.e.
+#: the worker holding it died) and may be taken over by another run.
+PDATA_TASK_LOCK_LEASE = int(os.getenv('PDATA_TASK_LOCK_LEASE', 600))
+
+#: Number of days for which the metrics of each task run are kept.
+PDATA_TASK_RUN_RETENTION = int(os.getenv('PDATA_TASK_RUN_RETENTION', 30))
+
+### Caches
+#: Rendered API responses are cached in the 'responses' cache. By default,
+#: this is an in-process LRU cache, but any Django cache backend (such as
+#: 'django.core.cache.backends.filebased.FileBasedCache', or memcached) may
+#: be used instead.
+CACHES = {
+  'default': {
+    'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+  },
+  'responses': {
+    'BACKEND': os.getenv('PDATA_RESPONSE_CACHE_BACKEND',
+      'pdata.cache.LRUCache'),
+    'LOCATION': os.getenv('PDATA_RESPONSE_CACHE_LOCATION', 'responses'),
+    'TIMEOUT': int(os.getenv('PDATA_RESPONSE_CACHE_TIMEOUT', 60 * 60)),
+    'OPTIONS': {
+      'MAX_ENTRIES': int(os.getenv('PDATA_RESPONSE_CACHE_MAX_ENTRIES', 1000)),
+      'MAX_SIZE': int(os.getenv('PDATA_RESPONSE_CACHE_MAX_SIZE',
+        64 * 1024 * 1024)),
+    },
+  },
+}
+
+### Profiling
+#: Whether requests are profiled (see `pdata.profiling.ProfilingMiddleware`).
+#: When disabled, the middleware is removed from the chain.
+PDATA_PROFILE = os.getenv('PDATA_PROFILE', 'false').lower() in ('1', 'true')
+
+#: Seconds after which a request is logged as slow, and fraction of requests
+#: which are profiled with cProfile, whose profile is saved if they are slow.
+PDATA_PROFILE_SLOW = float(os.getenv('PDATA_PROFILE_SLOW', 1))
+PDATA_PROFILE_SAMPLE_RATE = float(os.getenv('PDATA_PROFILE_SAMPLE_RATE',
+  0.1))
+
+#: Directory of the saved profiles, of which only the latest
+#: `PDATA_PROFILE_MAX_FILES` are kept.
+PDATA_PROFILE_DIR = os.path.join(PDATA_VAR_DIR, 'profiles')
+PDATA_PROFILE_MAX_FILES = int(os.getenv('PDATA_PROFILE_MAX_FILES', 100))
+
+### REST Framework
+#: The API is public and read-only, so requests are not authenticated (which
+#: would require django.contrib.auth), and only JSON is rendered.
+REST_FRAMEWORK = {
+  'DEFAULT_AUTHENTICATION_CLASSES': [],
+  'DEFAULT_PERMISSION_CLASSES': [],
+  'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+  'UNAUTHENTICATED_USER': None,
+}
+
+### Courses API
+#: Default and maximum number of results per page of list endpoints.
+COURSES_PAGE_SIZE = int(os.getenv('COURSES_PAGE_SIZE', 100))
+COURSES_MAX_PAGE_SIZE = int(os.getenv('COURSES_MAX_PAGE_SIZE', 1000))
+#: Seconds for which clients may reuse responses before revalidating them.
+COURSES_CACHE_MAX_AGE = int(os.getenv('COURSES_CACHE_MAX_AGE', 60))
+#: Cache (in CACHES) in which responses are cached on the server, or None to
+#: disable server-side caching.
+COURSES_RESPONSE_CACHE = (os.getenv('COURSES_RESPONSE_CACHE', 'responses')
+  or None)
+#: Backend of the course search endpoint: 'fts5' (an SQLite full-text index,
+#: maintained by the sync pipeline), 'memory' (an in-process inverted index,
+#: for other databases), or 'auto' to use FTS5 where it is available.
+COURSES_SEARCH_BACKEND = os.getenv('COURSES_SEARCH_BACKEND', 'auto')
+
+#: Seconds for which the timetable endpoint searches for timetables, after
+#: which its results are truncated.
+COURSES_TIMETABLE_TIMEOUT = float(os.getenv('COURSES_TIMETABLE_TIMEOUT', 10))
+
+#: Number of rows read at once by exports of a semester's data.
+COURSES_EXPORT_CHUNK_SIZE = int(os.getenv('COURSES_EXPORT_CHUNK_SIZE', 2000))
+
+#: Directory of the snapshots of each semester's catalog, which are written
+#: after it is synced, or None to disable them.
+COURSES_SNAPSHOT_DIR = os.getenv('COURSES_SNAPSHOT_DIR',
+  os.path.join(PDATA_VAR_DIR, 'snapshots')) or None
+
+#: Directory of the binary index of the catalog, which is shared by every
+#: process through mmap (see `courses.catalog`), or None to disable it.
+COURSES_CATALOG_INDEX_DIR = os.getenv('COURSES_CATALOG_INDEX_DIR',
+  os.path.join(PDATA_VAR_DIR, 'catalog')) or None
+
+#: Seconds for which changes to sections are kept in their feed, and seconds
+#: between reads of new changes by the feed server (see `courses.feedserver`).
+COURSES_FEED_RETENTION = int(os.getenv('COURSES_FEED_RETENTION',
+  7 * 24 * 60 * 60))
+COURSES_FEED_POLL_INTERVAL = float(os.getenv('COURSES_FEED_POLL_INTERVAL', 1))
+
+#: Seconds between the samples of the enrollment history of sections which
+#: are kept once their semester has ended for
+#: `COURSES_HISTORY_DOWNSAMPLE_AFTER` days (see `courses.history.downsample`).
+COURSES_HISTORY_RESOLUTION = int(os.getenv('COURSES_HISTORY_RESOLUTION',
+  60 * 60))
+COURSES_HISTORY_DOWNSAMPLE_AFTER = int(os.getenv(
+  'COURSES_HISTORY_DOWNSAMPLE_AFTER', 30))
+
 ### Test settings
 if TESTING:
   LOGGING = {}
@@ -65,3 +179,7 @@ if TESTING:
 
   # Allow test datasets to be imported.
   sys.path.append(os.path.join(BASE_DIR, 'pdata', 'tests'))
+
+  # Tests which write files enable them in a temporary directory.
+  COURSES_SNAPSHOT_DIR = None
+  COURSES_CATALOG_INDEX_DIR = None
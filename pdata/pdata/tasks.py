@@ -0,0 +1,189 @@
+# pdata/pdata/tasks.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Execution of data provider tasks.
+
+import typing
+import logging
+import json
+import datetime
+import importlib
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+import pdata.data
+from pdata import locks, metrics, schedules, models
+
+#: Name of the Celery task which executes all data provider tasks.
+DISPATCH_TASK = 'pdata.tasks.run'
+
+#: Keys of a task definition which are handled by pdata when running the task,
+#: rather than by the scheduler.
+TASK_OPTIONS = ('task', 'args', 'kwargs', 'lease', 'adaptive', 'timeout',
+  'jitter', 'writes')
+
+LOGGER = logging.getLogger('pdata.tasks')
+
+def get_task(source: str, name: str) -> dict:
+  '''
+  Get a task definition from a data provider.
+
+  :param source: name of the dataset providing the task
+  :param name: name of the task, as given in the definition
+
+  :return: task definition
+
+  :raises KeyError: if the provider does not define the task
+  '''
+  for task_def in pdata.data.get_provider(source).tasks:
+    if task_def['task'] == name:
+      return task_def
+
+  raise KeyError('%s does not define the task %s' % (source, name))
+
+def resolve(name: str) -> typing.Callable:
+  '''
+  Resolve a task name (i.e. 'courses.data.update_term') to the function it
+  refers to.
+
+  :param name: dotted path of the function
+
+  :return: task function
+  '''
+  module_name, func_name = name.rsplit('.', 1)
+  return getattr(importlib.import_module(module_name), func_name)
+
+def task_scope(task_def: dict) -> str:
+  '''
+  Get the scope of a task, which identifies the data it updates by its
+  keyword arguments (such as the term). For example, 'term=current'.
+
+  :param task_def: task definition
+
+  :return: scope of the task
+  '''
+  return ','.join('%s=%s' % (k, v)
+    for k, v in sorted(task_def.get('kwargs', {}).items()))
+
+def lock_key(source: str, task_def: dict) -> str:
+  '''
+  Get the single-flight lock key for a task. Runs of the same task with the
+  same scope share a key.
+
+  :param source: name of the dataset providing the task
+  :param task_def: task definition
+
+  :return: lock key
+  '''
+  return '%s:%s:%s' % (source, task_def['task'], task_scope(task_def))
+
+def record_run(
+    source: str,
+    task_def: dict,
+    outcome: int,
+    started_at: datetime.datetime,
+    run: metrics.RunRecorder = None,
+    result: typing.Any = None
+    ) -> models.TaskRun:
+  '''
+  Record a run of a task, and prune runs of the task which are older than
+  `settings.PDATA_TASK_RUN_RETENTION` days.
+
+  :param source: name of the dataset providing the task
+  :param task_def: task definition
+  :param outcome: outcome of the run (i.e. `models.TaskRun.OUTCOME_SUCCESS`)
+  :param started_at: time at which the run started
+  :param run: metrics recorded during the run
+  :param result: result of the task, which reports its changes (see
+    `pdata.schedules.has_changes`)
+
+  :return: recorded run
+  '''
+  run = run or metrics.RunRecorder()
+  now = timezone.now()
+
+  models.TaskRun.objects.filter(
+    source=source,
+    task=task_def['task'],
+    started_at__lt=now - datetime.timedelta(
+      days=settings.PDATA_TASK_RUN_RETENTION)
+    ).delete()
+
+  return models.TaskRun.objects.create(
+    source=source,
+    task=task_def['task'],
+    scope=task_scope(task_def),
+    outcome=outcome,
+    error=run.error or '',
+    started_at=started_at,
+    duration=(now - started_at).total_seconds(),
+    fetch_time=run.timings['fetch'],
+    transform_time=run.timings['transform'],
+    write_time=run.timings['write'],
+    bytes_downloaded=run.bytes_downloaded,
+    changes=json.dumps(result if isinstance(result, dict) else {}))
+
+def run_task(source: str, name: str) -> typing.Any:
+  '''
+  Run a data provider task. The run is skipped if a previous run of the same
+  task (with the same arguments) is still in progress; as the task runs on a
+  schedule, the skipped run is picked up by the next scheduled one.
+
+  The lease of the lock defaults to `settings.PDATA_TASK_LOCK_LEASE`, and can
+  be set per-task with a 'lease' key in the task definition.
+
+  If the task definition has an 'adaptive' schedule (see
+  `pdata.schedules.AdaptiveSchedule`), runs which are not yet due are skipped
+  as well, and the task's result determines when the next run is due.
+
+  Every run which is not deferred by its schedule is recorded as a
+  `models.TaskRun`, along with the metrics recorded by the task (see
+  `pdata.metrics.phase`).
+
+  :param source: name of the dataset providing the task
+  :param name: name of the task, as given in the definition
+
+  :return: result of the task, or None if the run was skipped
+  '''
+  task_def = get_task(source, name)
+  func = resolve(task_def['task'])
+  key = lock_key(source, task_def)
+
+  started_at = timezone.now()
+
+  with locks.single_flight(key, lease=task_def.get('lease')) as acquired:
+    if not acquired:
+      LOGGER.info('Skipping %s: previous run still in progress' % key)
+      metrics.incr('pdata_task_skipped_total', source=source, task=name)
+      record_run(source, task_def, models.TaskRun.OUTCOME_SKIPPED, started_at)
+      return None
+
+    adaptive = task_def.get('adaptive')
+    if adaptive is not None and not adaptive.is_due(key):
+      metrics.incr('pdata_task_deferred_total', source=source, task=name)
+      return None
+
+    with metrics.recording() as run:
+      try:
+        result = func(*task_def.get('args', ()), **task_def.get('kwargs', {}))
+      except Exception as e:
+        run.error = repr(e)
+        record_run(source, task_def, models.TaskRun.OUTCOME_FAILURE,
+          started_at, run)
+        raise
+
+    record_run(source, task_def,
+      (models.TaskRun.OUTCOME_FAILURE if run.error
+        else models.TaskRun.OUTCOME_SUCCESS),
+      started_at, run, result)
+
+    if adaptive is not None:
+      interval = adaptive.record(key, schedules.has_changes(result))
+      LOGGER.debug('Next run of %s in %d seconds' % (key, interval))
+
+    return result
+
+run = shared_task(name=DISPATCH_TASK, ignore_result=True)(run_task)
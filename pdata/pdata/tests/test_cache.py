@@ -0,0 +1,136 @@
+# pdata/pdata/tests/test_cache.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the caching of responses.
+
+import time
+import threading
+import unittest.mock
+
+from django.test import SimpleTestCase, RequestFactory, override_settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from pdata import cache, metrics
+
+CACHES = {
+  'test': {
+    'BACKEND': 'pdata.cache.LRUCache',
+    'LOCATION': 'test',
+    'OPTIONS': {'MAX_ENTRIES': 3},
+    },
+  }
+
+@override_settings(CACHES=CACHES)
+class TestLRUCache(SimpleTestCase):
+  '''
+  Test the `cache.LRUCache` backend.
+  '''
+  def setUp(self):
+    self.cache = caches['test']
+    self.cache.clear()
+
+  def test_evicts_least_recently_used(self):
+    for key in ('a', 'b', 'c'):
+      self.cache.set(key, key)
+    self.cache.get('a')
+    self.cache.set('d', 'd')
+
+    self.assertIsNone(self.cache.get('b'))
+    for key in ('a', 'c', 'd'):
+      self.assertEqual(self.cache.get(key), key)
+
+  def test_max_size(self):
+    c = cache.LRUCache('test-size', {'OPTIONS': {'MAX_SIZE': 2500}})
+    self.addCleanup(c.clear)
+
+    c.set('a', b'a' * 1000)
+    c.set('b', b'b' * 1000)
+    self.assertLessEqual(c.size, 2500)
+    c.set('c', b'c' * 1000)
+
+    self.assertLessEqual(c.size, 2500)
+    self.assertFalse(c.has_key('a'))
+    self.assertTrue(c.has_key('c'))
+
+  def test_expiry(self):
+    self.cache.set('a', 1, timeout=10)
+    with unittest.mock.patch('time.time', return_value=time.time() + 20):
+      self.assertIsNone(self.cache.get('a'))
+    self.assertEqual(self.cache.size, 0)
+
+  def test_add(self):
+    self.assertTrue(self.cache.add('a', 1))
+    self.assertFalse(self.cache.add('a', 2))
+    self.cache.delete('a')
+    self.assertTrue(self.cache.add('a', 3))
+    self.assertEqual(self.cache.get('a'), 3)
+
+@override_settings(CACHES=CACHES)
+class TestCachedResponse(SimpleTestCase):
+  '''
+  Test the `cache.cached_response` function.
+  '''
+  def setUp(self):
+    caches['test'].clear()
+    metrics.reset()
+    self.request = RequestFactory().get('/data/', {'page': 1})
+    self.key = cache.response_key(self.request, 'v1')
+
+  def test_hit(self):
+    view = unittest.mock.Mock(return_value=HttpResponse(b'data',
+      content_type='application/json'))
+
+    cache.cached_response('test', self.key, view, self.request)
+    response = cache.cached_response('test', self.key, view, self.request)
+
+    self.assertEqual(view.call_count, 1)
+    self.assertEqual(response.content, b'data')
+    self.assertEqual(response['Content-Type'], 'application/json')
+    self.assertEqual(metrics.counters(), {
+      ('pdata_response_cache_hits_total', (('cache', 'test'),)): 1,
+      ('pdata_response_cache_misses_total', (('cache', 'test'),)): 1,
+      })
+
+  def test_unsuccessful_not_cached(self):
+    view = unittest.mock.Mock(return_value=HttpResponse(status=404))
+
+    cache.cached_response('test', self.key, view, self.request)
+    cache.cached_response('test', self.key, view, self.request)
+    self.assertEqual(view.call_count, 2)
+
+  def test_single_flight(self):
+    '''
+    Concurrent misses compute the response once.
+    '''
+    calls = []
+
+    def view(request):
+      calls.append(request)
+      time.sleep(0.2)
+      return HttpResponse(b'data')
+
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(
+        cache.cached_response('test', self.key, view, self.request)))
+      for _ in range(4)]
+    for thread in threads:
+      thread.start()
+    for thread in threads:
+      thread.join()
+
+    self.assertEqual(len(calls), 1)
+    self.assertEqual([r.content for r in responses], [b'data'] * 4)
+
+  def test_lock_timeout(self):
+    '''
+    Requests stop waiting for a response being computed elsewhere after the
+    lock's timeout.
+    '''
+    caches['test'].add(self.key + ':lock', True)
+    view = unittest.mock.Mock(return_value=HttpResponse(b'data'))
+
+    response = cache.cached_response('test', self.key, view, self.request,
+      lock_timeout=0.1)
+    self.assertEqual(response.content, b'data')
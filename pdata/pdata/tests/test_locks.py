@@ -0,0 +1,132 @@
+# pdata/pdata/tests/test_locks.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for single-flight locks.
+
+import os
+import time
+import shutil
+import tempfile
+import datetime
+import threading
+
+from django.test import TestCase, SimpleTestCase
+from django.utils import timezone
+
+from pdata import locks, models
+
+class LockBackendTestBase(object):
+  '''
+  Tests which every lock backend must pass. Subclasses set `self.backend`.
+  '''
+  def test_acquire(self):
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+
+  def test_acquire_held(self):
+    '''
+    A held lock cannot be acquired by another owner.
+    '''
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+    self.assertFalse(self.backend.acquire('a', 'owner2', 60))
+
+  def test_acquire_independent_keys(self):
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+    self.assertTrue(self.backend.acquire('b', 'owner2', 60))
+
+  def test_release(self):
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+    self.backend.release('a', 'owner1')
+    self.assertTrue(self.backend.acquire('a', 'owner2', 60))
+
+  def test_release_other_owner(self):
+    '''
+    Releasing a lock held by another owner has no effect.
+    '''
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+    self.backend.release('a', 'owner2')
+    self.assertFalse(self.backend.acquire('a', 'owner2', 60))
+
+  def test_acquire_expired(self):
+    '''
+    A lock whose lease expired can be taken over.
+    '''
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+    self.expire('a')
+    self.assertTrue(self.backend.acquire('a', 'owner2', 60))
+    self.assertFalse(self.backend.acquire('a', 'owner3', 60))
+
+  def test_single_flight(self):
+    with locks.single_flight('a', backend=self.backend) as acquired:
+      self.assertTrue(acquired)
+
+      with locks.single_flight('a', backend=self.backend) as acquired:
+        self.assertFalse(acquired)
+
+    # Released on exit.
+    with locks.single_flight('a', backend=self.backend) as acquired:
+      self.assertTrue(acquired)
+
+class TestDatabaseLockBackend(TestCase, LockBackendTestBase):
+  '''
+  Test the `locks.DatabaseLockBackend`.
+  '''
+  def setUp(self):
+    self.backend = locks.DatabaseLockBackend()
+
+  def expire(self, key: str) -> None:
+    models.TaskLock.objects.filter(key=key).update(
+      expires_at=timezone.now() - datetime.timedelta(seconds=1))
+
+class TestFileLockBackend(SimpleTestCase, LockBackendTestBase):
+  '''
+  Test the `locks.FileLockBackend`.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.backend = locks.FileLockBackend(self.directory)
+
+  def tearDown(self):
+    shutil.rmtree(self.directory)
+
+  def expire(self, key: str) -> None:
+    path = self.backend.path(key)
+    with open(path) as f:
+      owner, _ = f.read().split()
+    with open(path, 'w') as f:
+      f.write('%s %f' % (owner, time.time() - 1))
+
+  def test_path_sanitized(self):
+    path = self.backend.path('courses:update/term:term=current')
+    self.assertEqual(os.path.dirname(path), self.directory)
+
+  def test_concurrent_break(self):
+    '''
+    A run which read an expired lock does not break it once another run has
+    broken and taken it over.
+    '''
+    self.assertTrue(self.backend.acquire('a', 'owner1', 60))
+    self.expire('a')
+
+    read = threading.Event()
+    read_lock = self.backend._read
+    def slow_read(path):
+      # The second run reads the expired lock, then waits for the first one
+      # to attempt to break it.
+      holder = read_lock(path)
+      if threading.current_thread() is breaker and not read.is_set():
+        read.set()
+        time.sleep(0.2)
+      return holder
+    self.backend._read = slow_read
+
+    acquired = {}
+    breaker = threading.Thread(target=lambda: acquired.update(
+      owner3=self.backend.acquire('a', 'owner3', 60)))
+    breaker.start()
+    self.assertTrue(read.wait(5))
+    acquired['owner2'] = self.backend.acquire('a', 'owner2', 60)
+    breaker.join()
+
+    self.assertEqual(acquired, {'owner2': False, 'owner3': True})
+    self.assertEqual(read_lock(self.backend.path('a'))[0], 'owner3')
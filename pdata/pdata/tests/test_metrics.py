@@ -0,0 +1,158 @@
+# pdata/pdata/tests/test_metrics.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for task run metrics and the metrics endpoints.
+
+import json
+import datetime
+import unittest.mock
+
+from django.test import TestCase, SimpleTestCase
+from django.utils import timezone
+
+from pdata import metrics, tasks, locks, models
+from example_dataset import data
+
+class TestRunRecorder(SimpleTestCase):
+  '''
+  Test the `metrics.RunRecorder` class.
+  '''
+  def test_nested_phases(self):
+    '''
+    Time spent in a nested phase only counts towards the nested phase.
+    '''
+    run = metrics.RunRecorder()
+    clock = iter([0, 1, 4, 10])
+
+    with unittest.mock.patch('time.perf_counter', lambda: next(clock)):
+      with run.phase('transform'):
+        with run.phase('write'):
+          pass
+
+    self.assertEqual(dict(run.timings), {'transform': 7, 'write': 3})
+
+  def test_outside_run(self):
+    '''
+    Metrics recorded outside of a run are discarded.
+    '''
+    metrics.add_bytes(10)
+    with metrics.recording() as run:
+      metrics.add_bytes(20)
+      metrics.fail('error')
+    metrics.add_bytes(10)
+
+    self.assertEqual(run.bytes_downloaded, 20)
+    self.assertEqual(run.error, 'error')
+    self.assertEqual(metrics.current_run().bytes_downloaded, 0)
+
+class TestTaskRuns(TestCase):
+  '''
+  Test the recording of task runs by `tasks.run_task`, and the endpoints
+  exposing them.
+  '''
+  NAME = 'example_dataset.tasks.refresh'
+  CHANGES = {'course': {'created': 1, 'updated': 2, 'deleted': 0}}
+
+  def setUp(self):
+    metrics.reset()
+
+  def refresh(self):
+    '''
+    Example task, which downloads data and reports its changes.
+    '''
+    metrics.add_bytes(1024)
+    with metrics.phase('fetch'):
+      pass
+    return self.CHANGES
+
+  def run_refresh(self, **kwargs):
+    with unittest.mock.patch(self.NAME, **kwargs):
+      return tasks.run_task('example_dataset', self.NAME)
+
+  def test_success(self):
+    self.run_refresh(side_effect=self.refresh)
+
+    run = models.TaskRun.objects.get()
+    self.assertEqual(run.source, 'example_dataset')
+    self.assertEqual(run.task, self.NAME)
+    self.assertEqual(run.outcome, models.TaskRun.OUTCOME_SUCCESS)
+    self.assertEqual(run.bytes_downloaded, 1024)
+    self.assertGreater(run.fetch_time, 0)
+    self.assertEqual(json.loads(run.changes), self.CHANGES)
+
+  def test_failure_raised(self):
+    with self.assertRaises(ValueError):
+      self.run_refresh(side_effect=ValueError('bad data'))
+
+    run = models.TaskRun.objects.get()
+    self.assertEqual(run.outcome, models.TaskRun.OUTCOME_FAILURE)
+    self.assertIn('bad data', run.error)
+
+  def test_failure_handled(self):
+    self.run_refresh(side_effect=lambda: metrics.fail('could not fetch'))
+
+    run = models.TaskRun.objects.get()
+    self.assertEqual(run.outcome, models.TaskRun.OUTCOME_FAILURE)
+    self.assertEqual(run.error, 'could not fetch')
+
+  def test_skipped(self):
+    key = tasks.lock_key('example_dataset',
+      tasks.get_task('example_dataset', self.NAME))
+    with locks.single_flight(key):
+      self.run_refresh()
+
+    run = models.TaskRun.objects.get()
+    self.assertEqual(run.outcome, models.TaskRun.OUTCOME_SKIPPED)
+
+  def test_retention(self):
+    self.run_refresh()
+    models.TaskRun.objects.update(
+      started_at=timezone.now() - datetime.timedelta(days=31))
+
+    self.run_refresh()
+    self.assertEqual(models.TaskRun.objects.count(), 1)
+
+  def test_prometheus_metrics(self):
+    self.run_refresh(side_effect=self.refresh)
+    self.run_refresh(side_effect=self.refresh)
+    metrics.incr('pdata_task_deferred_total', source='example_dataset')
+
+    response = self.client.get('/metrics/')
+    self.assertEqual(response.status_code, 200)
+    self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    labels = ('source="example_dataset",task="%s",scope=""' % self.NAME)
+    lines = response.content.decode().splitlines()
+    self.assertIn('# TYPE pdata_task_runs gauge', lines)
+    self.assertIn('pdata_task_runs{%s,outcome="success"} 2' % labels, lines)
+    run = models.TaskRun.objects.latest('started_at')
+    self.assertIn('# TYPE pdata_task_last_phase_seconds gauge', lines)
+    for (phase, seconds) in (('fetch', run.fetch_time),
+        ('write', run.write_time), ('total', run.duration)):
+      self.assertIn('pdata_task_last_phase_seconds{%s,phase="%s"} %s' % (
+        labels, phase, seconds), lines)
+    self.assertIn('pdata_task_last_bytes_downloaded{%s} 1024' % labels,
+      lines)
+    self.assertIn('pdata_task_last_changes{%s,model="course",'
+      'operation="updated"} 2' % labels, lines)
+    self.assertIn(
+      'pdata_task_deferred_total{source="example_dataset"} 1', lines)
+
+  def test_run_history(self):
+    self.run_refresh(side_effect=self.refresh)
+    with self.assertRaises(ValueError):
+      self.run_refresh(side_effect=ValueError('bad data'))
+
+    response = self.client.get('/metrics/runs/', {'limit': 1})
+    self.assertEqual(response.status_code, 200)
+
+    runs = response.json()['runs']
+    self.assertEqual(len(runs), 1)
+    self.assertEqual(runs[0]['outcome'], 'failure')
+
+    response = self.client.get('/metrics/runs/', {'source': 'other'})
+    self.assertEqual(response.json()['runs'], [])
+
+    response = self.client.get('/metrics/runs/', {'limit': 'all'})
+    self.assertEqual(response.status_code, 400)
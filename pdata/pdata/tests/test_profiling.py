@@ -0,0 +1,98 @@
+# pdata/pdata/tests/test_profiling.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the profiling of requests.
+
+import os
+import re
+import shutil
+import pstats
+import tempfile
+import unittest.mock
+
+from django.test import TestCase, override_settings
+from django.db import connection
+
+from pdata import models, profiling
+
+class TestExecuteWrapper(TestCase):
+  '''
+  Test the `profiling.execute_wrapper` context manager.
+  '''
+  def test_wraps_queries(self):
+    queries = []
+    def wrapper(execute, sql, params, many, context):
+      queries.append((sql, many))
+      return execute(sql, params, many, context)
+
+    with profiling.execute_wrapper(wrapper):
+      self.assertEqual(models.TaskLock.objects.count(), 0)
+      with profiling.execute_wrapper(wrapper):
+        models.TaskLock.objects.exists()
+      list(models.TaskLock.objects.all())
+    models.TaskLock.objects.exists()
+
+    # Nested wrappers each see the query.
+    self.assertEqual(len(queries), 4)
+    self.assertTrue(all('pdata_tasklock' in sql for (sql, _) in queries))
+    self.assertNotIn('make_cursor', connection.__dict__)
+
+@override_settings(PDATA_PROFILE=True, PDATA_PROFILE_SLOW=60,
+  PDATA_PROFILE_SAMPLE_RATE=0)
+class TestProfilingMiddleware(TestCase):
+  '''
+  Test the `profiling.ProfilingMiddleware` middleware.
+  '''
+  def setUp(self):
+    self.directory = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, self.directory)
+
+  def timings(self, response) -> dict:
+    return {m.group(1): m.group(2) for m in re.finditer(
+      r'(\w+);dur=([\d.]+)', response['Server-Timing'])}
+
+  def test_server_timing(self):
+    response = self.client.get('/courses/semesters/')
+    self.assertEqual(response.status_code, 200)
+    self.assertEqual(set(self.timings(response)),
+      {'db', 'serialize', 'render', 'total'})
+    self.assertRegex(response['Server-Timing'], r'desc="[1-9]\d* queries"')
+
+    # Responses which are not rendered separately only report their queries.
+    response = self.client.get('/metrics/runs/')
+    self.assertEqual(set(self.timings(response)), {'db', 'total'})
+
+  @override_settings(PDATA_PROFILE=False)
+  def test_disabled(self):
+    response = self.client.get('/courses/semesters/')
+    self.assertNotIn('Server-Timing', response)
+
+  def test_slow_requests(self):
+    with override_settings(PDATA_PROFILE_SLOW=0, PDATA_PROFILE_SAMPLE_RATE=1,
+        PDATA_PROFILE_DIR=self.directory, PDATA_PROFILE_MAX_FILES=2), \
+        unittest.mock.patch.object(profiling.LOGGER, 'warning') as warning:
+      for _ in range(3):
+        self.client.get('/courses/semesters/')
+
+    self.assertEqual(warning.call_count, 3)
+    self.assertIn('Slow request: GET /courses/semesters/',
+      warning.call_args[0][0])
+
+    # Only the latest profiles are kept, and they may be read by pstats.
+    profiles = sorted(os.listdir(self.directory))
+    self.assertEqual(len(profiles), 2)
+    self.assertIn(os.path.join(self.directory, profiles[-1]),
+      warning.call_args[0][0])
+    self.assertTrue(profiles[-1].endswith('-GET-courses_semesters.prof'))
+    stats = pstats.Stats(os.path.join(self.directory, profiles[-1]))
+    self.assertTrue(stats.total_calls)
+
+  def test_unsampled(self):
+    with override_settings(PDATA_PROFILE_SLOW=0,
+        PDATA_PROFILE_DIR=self.directory), \
+        unittest.mock.patch.object(profiling.LOGGER, 'warning') as warning:
+      self.client.get('/courses/semesters/')
+
+    self.assertEqual(warning.call_count, 1)
+    self.assertEqual(os.listdir(self.directory), [])
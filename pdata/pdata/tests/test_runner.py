@@ -0,0 +1,310 @@
+# pdata/pdata/tests/test_runner.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for the in-process task scheduler.
+
+import time
+import shutil
+import tempfile
+import asyncio
+import datetime
+import threading
+import unittest.mock
+
+from django.test import SimpleTestCase, override_settings
+from celery.schedules import crontab
+
+from pdata import runner, metrics
+from example_dataset import data
+
+class TestRunner(SimpleTestCase):
+  '''
+  Test the `runner.Runner` class.
+  '''
+  NAME = 'example_dataset.tasks.refresh'
+
+  def setUp(self):
+    metrics.reset()
+    self.loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(self.loop)
+
+  def tearDown(self):
+    self.loop.close()
+    asyncio.set_event_loop(None)
+
+  def make_runner(self, count: int = 1, **task_def) -> runner.Runner:
+    '''
+    Create a runner for the example refresh task.
+
+    :param count: number of copies of the task to schedule
+    :param task_def: task definition options
+
+    :return: runner
+    '''
+    task_def.setdefault('task', self.NAME)
+    task_def.setdefault('schedule', 60)
+    return runner.Runner(
+      [runner.ScheduledTask('example_dataset', task_def)
+        for _ in range(count)],
+      workers=count,
+      loop=self.loop)
+
+  def max_concurrent_runs(self, r: runner.Runner,
+      sequential: bool = False) -> int:
+    '''
+    Run all of a runner's tasks once, at the same time.
+
+    :param r: runner
+    :param sequential: whether to start each run once the previous one has
+      returned, instead
+
+    :return: maximum number of tasks that were executing at once
+    '''
+    lock = threading.Lock()
+    state = {'running': 0, 'max': 0}
+
+    def run_task(*args):
+      with lock:
+        state['running'] += 1
+        state['max'] = max(state['max'], state['running'])
+      time.sleep(0.05)
+      with lock:
+        state['running'] -= 1
+
+    with unittest.mock.patch('pdata.tasks.run_task', side_effect=run_task):
+      if sequential:
+        for t in r.scheduled:
+          self.loop.run_until_complete(r.run_once(t))
+      else:
+        self.loop.run_until_complete(asyncio.gather(
+          *(r.run_once(t) for t in r.scheduled)))
+      r.executor.shutdown(wait=True)
+
+    return state['max']
+
+  def test_as_schedule(self):
+    self.assertEqual(runner.as_schedule(60).run_every,
+      datetime.timedelta(seconds=60))
+    self.assertEqual(
+      runner.as_schedule(datetime.timedelta(minutes=1)).run_every,
+      datetime.timedelta(seconds=60))
+    self.assertEqual(runner.as_schedule(crontab(minute=0)), crontab(minute=0))
+
+  def test_load(self):
+    scheduled = runner.Runner.load(['example_dataset'], timeout=5, jitter=1)
+    self.assertEqual([str(t) for t in scheduled], [
+      'example_dataset:example_dataset.tasks.refresh',
+      'example_dataset:example_dataset.tasks.purge',
+      ])
+    self.assertEqual(scheduled[0].timeout, 5)
+    self.assertEqual(scheduled[0].jitter, 1)
+
+  def test_delay(self):
+    '''
+    The first run is due immediately, and later runs follow the schedule
+    within the jitter.
+    '''
+    task = runner.ScheduledTask('example_dataset',
+      {'task': self.NAME, 'schedule': 60, 'jitter': 5})
+    self.assertLessEqual(task.delay(), 5)
+
+    task.last_run_at = task.schedule.now()
+    self.assertGreater(task.delay(), 55)
+    self.assertLessEqual(task.delay(), 65)
+
+  def test_run_on_schedule(self):
+    r = self.make_runner(schedule=0.01)
+    self.loop.call_later(0.2, r.stop)
+
+    with unittest.mock.patch('pdata.tasks.run_task') as run_task:
+      r.run_forever()
+
+    self.assertGreater(run_task.call_count, 1)
+    run_task.assert_called_with('example_dataset', self.NAME)
+
+  def test_run_once_timeout(self):
+    r = self.make_runner(timeout=0.01)
+
+    with unittest.mock.patch('pdata.tasks.run_task',
+        side_effect=lambda *args: time.sleep(0.1)):
+      result = self.loop.run_until_complete(r.run_once(r.scheduled[0]))
+    r.executor.shutdown(wait=True)
+
+    self.assertIsNone(result)
+    self.assertEqual(metrics.counters(), {
+      ('pdata_task_timeout_total', (
+        ('source', 'example_dataset'), ('task', self.NAME))): 1,
+      })
+
+  def test_run_once_failed(self):
+    r = self.make_runner()
+
+    with unittest.mock.patch('pdata.tasks.run_task',
+        side_effect=ValueError('failed')):
+      result = self.loop.run_until_complete(r.run_once(r.scheduled[0]))
+
+    self.assertIsNone(result)
+    self.assertEqual(metrics.counters(), {
+      ('pdata_task_failed_total', (
+        ('source', 'example_dataset'), ('task', self.NAME))): 1,
+      })
+
+  def test_provider_concurrency(self):
+    self.assertEqual(self.max_concurrent_runs(
+      self.make_runner(count=3, writes=False)), 1)
+
+    with unittest.mock.patch.object(data.ExampleDataProvider,
+        'concurrency', 3):
+      self.assertEqual(self.max_concurrent_runs(
+        self.make_runner(count=3, writes=False)), 3)
+
+  def test_max_writers(self):
+    with unittest.mock.patch.object(data.ExampleDataProvider,
+        'concurrency', 3):
+      self.assertEqual(self.max_concurrent_runs(
+        self.make_runner(count=3)), 1)
+
+  def test_timeout_holds_writer(self):
+    '''
+    A run which times out keeps its writer slot until its worker finishes.
+    '''
+    with unittest.mock.patch.object(data.ExampleDataProvider,
+        'concurrency', 2):
+      r = self.make_runner(count=2)
+      r.scheduled[0].timeout = 0.01
+      self.assertEqual(self.max_concurrent_runs(r, sequential=True), 1)
+
+    self.assertEqual(metrics.counters(), {
+      ('pdata_task_timeout_total', (
+        ('source', 'example_dataset'), ('task', self.NAME))): 1,
+      })
+
+  def test_reserved_writers(self):
+    '''
+    The highest-priority provider's tasks do not wait for lower-priority
+    writers.
+    '''
+    started = threading.Event()
+
+    def run_task(source, name):
+      # Low-priority runs wait for the high-priority one to start.
+      if name == self.NAME:
+        return started.wait(0.2)
+      started.set()
+
+    def run(**kwargs):
+      started.clear()
+      scheduled = [runner.ScheduledTask('example_dataset',
+        {'task': name, 'schedule': 60})
+        for name in (self.NAME, self.NAME, 'example_dataset.tasks.purge')]
+      scheduled[-1].priority = 10
+      r = runner.Runner(scheduled, workers=3, loop=self.loop, **kwargs)
+
+      async def main():
+        # Runs start in order (unlike with `asyncio.gather`), so the
+        # low-priority ones are started first.
+        runs = [asyncio.ensure_future(r.run_once(t)) for t in r.scheduled]
+        return [await run for run in runs]
+
+      with unittest.mock.patch('pdata.tasks.run_task', side_effect=run_task):
+        results = self.loop.run_until_complete(main())
+      r.executor.shutdown(wait=True)
+      return results
+
+    with unittest.mock.patch.object(data.ExampleDataProvider,
+        'concurrency', 3):
+      self.assertEqual(run(), [True, True, None])
+      # Without a reserved slot, the first run holds on to the only one.
+      self.assertEqual(run(reserved_writers=0), [False, True, None])
+
+  @override_settings(PDATA_TASK_LOCK_BACKEND='file')
+  def test_processes(self):
+    directory = tempfile.mkdtemp()
+    self.addCleanup(shutil.rmtree, directory)
+
+    # Worker processes are forked, so they inherit the patch; runs are not
+    # recorded, as the test database is not shared with them.
+    with self.settings(PDATA_TASK_LOCK_DIR=directory), \
+        unittest.mock.patch('pdata.tasks.record_run'):
+      r = runner.Runner(
+        [runner.ScheduledTask('example_dataset',
+          {'task': self.NAME, 'schedule': 60})],
+        processes=True,
+        loop=self.loop)
+      result = self.loop.run_until_complete(r.run_once(r.scheduled[0]))
+      r.executor.shutdown(wait=True)
+
+    self.assertIsNone(result)
+    self.assertEqual(metrics.counters(), {})
+
+class TestPrioritySemaphore(SimpleTestCase):
+  '''
+  Test the `runner.PrioritySemaphore` class.
+  '''
+  def setUp(self):
+    self.loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(self.loop)
+
+  def tearDown(self):
+    self.loop.close()
+    asyncio.set_event_loop(None)
+
+  def test_priority_order(self):
+    semaphore = runner.PrioritySemaphore(1)
+    order = []
+
+    async def waiter(priority):
+      await semaphore.acquire(priority)
+      order.append(priority)
+      semaphore.release()
+
+    async def main():
+      await semaphore.acquire()
+      waiters = [asyncio.ensure_future(waiter(p)) for p in (0, 5, 1, 5)]
+      await asyncio.sleep(0)
+      semaphore.release()
+      await asyncio.gather(*waiters)
+
+    self.loop.run_until_complete(main())
+    self.assertEqual(order, [5, 5, 1, 0])
+
+  def test_cancelled_waiter(self):
+    semaphore = runner.PrioritySemaphore(1)
+
+    async def main():
+      await semaphore.acquire()
+      cancelled = asyncio.ensure_future(semaphore.acquire(10))
+      await asyncio.sleep(0)
+      cancelled.cancel()
+      semaphore.release()
+
+      # The cancelled waiter does not hold on to the semaphore.
+      await asyncio.wait_for(semaphore.acquire(), 1)
+
+    self.loop.run_until_complete(main())
+
+  def test_reserved(self):
+    semaphore = runner.PrioritySemaphore(2, reserved=1, reserved_priority=10)
+    order = []
+
+    async def waiter(priority):
+      await semaphore.acquire(priority)
+      order.append(priority)
+
+    async def main():
+      await semaphore.acquire()
+      low = asyncio.ensure_future(waiter(0))
+      await asyncio.sleep(0)
+      self.assertEqual(order, [])
+
+      # The reserved slot is free for high-priority waiters only.
+      await asyncio.wait_for(waiter(10), 1)
+      semaphore.release()
+      await asyncio.sleep(0)
+      self.assertEqual(order, [10])
+      semaphore.release()
+      await asyncio.wait_for(low, 1)
+
+    self.loop.run_until_complete(main())
+    self.assertEqual(order, [10, 0])
@@ -0,0 +1,120 @@
+# pdata/pdata/tests/test_schedules.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for adaptive task schedules.
+
+import datetime
+import unittest.mock
+
+from django.test import TestCase, SimpleTestCase
+from django.utils import timezone
+
+from pdata import schedules, tasks, models
+
+class TestAdaptiveSchedule(SimpleTestCase):
+  '''
+  Test the interval computation of `schedules.AdaptiveSchedule`.
+  '''
+  def test_next_interval_backoff(self):
+    schedule = schedules.AdaptiveSchedule(60, 300)
+    self.assertEqual(schedule.next_interval(60, False), 120)
+    self.assertEqual(schedule.next_interval(120, False), 240)
+    self.assertEqual(schedule.next_interval(240, False), 300)
+
+  def test_next_interval_changed(self):
+    schedule = schedules.AdaptiveSchedule(60, 300)
+    self.assertEqual(schedule.next_interval(240, True), 60)
+
+  def test_in_window(self):
+    schedule = schedules.AdaptiveSchedule(60, 300, windows=lambda: [
+      (datetime.date(2018, 2, 5), datetime.date(2018, 2, 19))])
+
+    self.assertTrue(schedule.in_window(datetime.date(2018, 2, 5)))
+    self.assertTrue(schedule.in_window(datetime.date(2018, 2, 19)))
+    self.assertFalse(schedule.in_window(datetime.date(2018, 2, 20)))
+    self.assertFalse(schedules.AdaptiveSchedule(60, 300).in_window(
+      datetime.date(2018, 2, 5)))
+
+  def test_has_changes(self):
+    self.assertTrue(schedules.has_changes({
+      'course': {'created': 0, 'updated': 0},
+      'section': {'created': 0, 'updated': 1},
+      }))
+    self.assertFalse(schedules.has_changes({
+      'course': {'created': 0, 'updated': 0},
+      }))
+    self.assertFalse(schedules.has_changes({}))
+    self.assertFalse(schedules.has_changes(None))
+
+class TestAdaptiveRunTask(TestCase):
+  '''
+  Test `tasks.run_task` with an adaptively-scheduled task.
+  '''
+  NAME = 'example_dataset.tasks.refresh'
+
+  def run_with_result(self, result, windows=None):
+    '''
+    Run the example refresh task with an adaptive schedule.
+
+    :param result: result that the task returns
+    :param windows: calendar windows of the schedule
+
+    :return: mock of the task function
+    '''
+    task_def = {
+      'task': self.NAME,
+      'adaptive': schedules.AdaptiveSchedule(60, 600, windows=windows),
+      }
+
+    with unittest.mock.patch('pdata.tasks.get_task', return_value=task_def), \
+        unittest.mock.patch(self.NAME, return_value=result) as refresh:
+      tasks.run_task('example_dataset', self.NAME)
+
+    return refresh
+
+  def state(self) -> models.TaskSchedule:
+    return models.TaskSchedule.objects.get()
+
+  def make_due(self) -> None:
+    models.TaskSchedule.objects.update(next_run_at=timezone.now())
+
+  def test_backoff(self):
+    '''
+    Runs which detect no change are spaced out further and further.
+    '''
+    self.run_with_result({}).assert_called_once_with()
+    self.assertEqual(self.state().interval, 120)
+    self.assertEqual(self.state().unchanged_runs, 1)
+
+    # Not due yet.
+    self.run_with_result({}).assert_not_called()
+
+    self.make_due()
+    self.run_with_result({}).assert_called_once_with()
+    self.assertEqual(self.state().interval, 240)
+
+  def test_changed(self):
+    '''
+    A run which detects a change resets the interval.
+    '''
+    self.run_with_result({})
+    self.make_due()
+    self.run_with_result({})
+
+    self.make_due()
+    self.run_with_result({'course': {'created': 1, 'updated': 0}})
+    self.assertEqual(self.state().interval, 60)
+    self.assertEqual(self.state().unchanged_runs, 0)
+    self.assertIsNotNone(self.state().last_changed_at)
+
+  def test_window(self):
+    '''
+    During a window, the task runs every time regardless of changes.
+    '''
+    today = timezone.localdate()
+    windows = lambda: [(today, today)]
+
+    self.run_with_result({}, windows)
+    self.assertEqual(self.state().interval, 60)
+    self.run_with_result({}, windows).assert_called_once_with()
@@ -0,0 +1,65 @@
+# pdata/pdata/tests/test_tasks.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for data provider task execution.
+
+import unittest.mock
+
+from django.test import TestCase
+
+from pdata import tasks, locks, metrics
+from example_dataset import data
+
+class TestRunTask(TestCase):
+  '''
+  Test the `tasks.run_task` function.
+  '''
+  def setUp(self):
+    metrics.reset()
+
+  def test_get_task_missing(self):
+    with self.assertRaises(KeyError):
+      tasks.get_task('example_dataset', 'example_dataset.tasks.missing')
+
+  def test_run(self):
+    with unittest.mock.patch('example_dataset.tasks.refresh') as refresh:
+      refresh.return_value = 'refreshed'
+      result = tasks.run_task('example_dataset',
+        'example_dataset.tasks.refresh')
+
+    self.assertEqual(result, 'refreshed')
+    refresh.assert_called_once_with()
+
+  def test_run_skipped(self):
+    '''
+    A run is skipped while a previous run of the same task holds the lock,
+    and the skip is counted.
+    '''
+    task_def = tasks.get_task('example_dataset',
+      'example_dataset.tasks.refresh')
+    key = tasks.lock_key('example_dataset', task_def)
+
+    with unittest.mock.patch('example_dataset.tasks.refresh') as refresh:
+      with locks.single_flight(key) as acquired:
+        self.assertTrue(acquired)
+        result = tasks.run_task('example_dataset',
+          'example_dataset.tasks.refresh')
+
+    self.assertIsNone(result)
+    refresh.assert_not_called()
+    self.assertEqual(metrics.counters(), {
+      ('pdata_task_skipped_total', (
+        ('source', 'example_dataset'),
+        ('task', 'example_dataset.tasks.refresh'))): 1,
+      })
+
+  def test_lock_key_scope(self):
+    '''
+    The lock key includes the task's keyword arguments.
+    '''
+    key = tasks.lock_key('courses', {
+      'task': 'courses.data.update_term',
+      'kwargs': {'term': 1184},
+      })
+    self.assertEqual(key, 'courses:courses.data.update_term:term=1184')
@@ -20,9 +20,11 @@ class TestLoadCeleryTasks(SimpleTestCase):
     tasks = utils.load_celery_tasks(['example_dataset'])
     self.assertEquals(tasks, {
       'example_dataset.data:example_dataset-tasks-refresh': {
-        'task': 'example_dataset.tasks.refresh',
+        'task': 'pdata.tasks.run',
+        'args': ('example_dataset', 'example_dataset.tasks.refresh'),
         'schedule': crontab(minute=0)},
       'example_dataset.data:example_dataset-tasks-purge': {
-        'task': 'example_dataset.tasks.purge',
+        'task': 'pdata.tasks.run',
+        'args': ('example_dataset', 'example_dataset.tasks.purge'),
         'schedule': crontab(hour=0, minute=0)}
       })
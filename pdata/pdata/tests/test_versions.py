@@ -0,0 +1,71 @@
+# pdata/pdata/tests/test_versions.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Tests for dataset versions and conditional requests.
+
+from django.test import TestCase, RequestFactory
+from django.http import HttpResponse
+
+from pdata import versions
+
+class TestVersions(TestCase):
+  '''
+  Test the `versions.bump` and `versions.get` functions.
+  '''
+  def test_unversioned(self):
+    self.assertIsNone(versions.get('example_dataset'))
+
+  def test_bump(self):
+    self.assertEqual(versions.bump('example_dataset'), 1)
+    self.assertEqual(versions.bump('example_dataset', scopes=['a']), 2)
+    self.assertEqual(versions.bump('example_dataset', scopes=['b']), 3)
+
+    self.assertEqual(versions.get('example_dataset').version, 3)
+    self.assertEqual(versions.get('example_dataset', 'a').version, 2)
+    self.assertEqual(versions.get('example_dataset', 'b').version, 3)
+    self.assertIsNone(versions.get('example_dataset', 'c'))
+
+  def test_reserve(self):
+    # The version row is created, so that it may be locked.
+    self.assertEqual(versions.reserve('example_dataset'), 1)
+    self.assertEqual(versions.get('example_dataset').version, 0)
+    self.assertEqual(versions.bump('example_dataset'), 1)
+    self.assertEqual(versions.reserve('example_dataset'), 2)
+
+  def test_datasets_independent(self):
+    versions.bump('example_dataset')
+    self.assertEqual(versions.bump('other_dataset'), 1)
+
+class TestConditional(TestCase):
+  '''
+  Test the `versions.conditional` decorator.
+  '''
+  def setUp(self):
+    self.factory = RequestFactory()
+    self.calls = 0
+
+    @versions.conditional('example_dataset',
+      scope=lambda request: request.GET.get('scope', ''), max_age=30)
+    def view(request):
+      self.calls += 1
+      return HttpResponse('data')
+
+    self.view = view
+
+  def test_scope(self):
+    versions.bump('example_dataset', scopes=['a'])
+    response = self.view(self.factory.get('/', {'scope': 'a'}))
+    versions.bump('example_dataset', scopes=['b'])
+
+    # Changes to other scopes do not modify the response.
+    cached = self.view(self.factory.get('/', {'scope': 'a'},
+      HTTP_IF_NONE_MATCH=response['ETag']))
+    self.assertEqual(cached.status_code, 304)
+    self.assertEqual(self.calls, 1)
+
+    modified = self.view(self.factory.get('/',
+      HTTP_IF_NONE_MATCH=response['ETag']))
+    self.assertEqual(modified.status_code, 200)
+    self.assertEqual(modified['ETag'], '"example_dataset-2"')
+    self.assertEqual(modified['Cache-Control'], 'public, max-age=30')
@@ -6,6 +6,10 @@
 
 from django.conf.urls import url, include
 
+from pdata import views
+
 urlpatterns = [
   url(r'^courses/', include('courses.urls', namespace='courses')),
+  url(r'^metrics/$', views.prometheus_metrics, name='metrics'),
+  url(r'^metrics/runs/$', views.run_history, name='run-history'),
 ]
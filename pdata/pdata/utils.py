@@ -8,17 +8,28 @@ import typing
 
 import sys
 
-from django.db import models
+from django.db import models, router
+from django.db.models.deletion import Collector
 
 import pdata.data
+from pdata import metrics
 
 def load_celery_tasks(sources: typing.List[str]) -> dict:
   '''
   Load Celery tasks from the provided sources. Tasks are loaded from any
   `data.DataProvider` class that is imported and included in sources.
 
+  Every task is scheduled through the `pdata.tasks.run` dispatcher, which
+  guards against overlapping runs of the same task (see
+  `pdata.tasks.run_task`). Options of the task definition which are not
+  handled by pdata (such as 'schedule') are passed on to Celery.
+
   :return: loaded tasks
   '''
+  # Imported here because the tasks require the Django apps to be loaded,
+  # while this module is imported by the settings.
+  from pdata import tasks as pdata_tasks
+
   tasks = {}
   for source in sources:
     dataset_def = pdata.data.get_provider(source)
@@ -28,7 +39,12 @@ def load_celery_tasks(sources: typing.List[str]) -> dict:
         source=dataset_def.__class__.__module__,
         # Turn dataset.func into dataset-func
         name=t['task'].replace('.', '-'))
-      tasks[task_name] = t
+
+      entry = {k: v for k, v in t.items()
+        if k not in pdata_tasks.TASK_OPTIONS}
+      entry['task'] = pdata_tasks.DISPATCH_TASK
+      entry['args'] = (source, t['task'])
+      tasks[task_name] = entry
 
   return tasks
 
@@ -37,6 +53,7 @@ def bulk_upsert(
   hash_data: typing.Callable[[typing.Dict[str, typing.Any]], int],
   expected: typing.Iterable[typing.Dict[str, typing.Any]],
   delete: bool = False,
+  version: int = None,
   ) -> typing.Dict[str, typing.Set[str]]:
   '''
   Bulk upsert objects. The queryset `q` is used to retrieve the existing
@@ -50,20 +67,53 @@ def bulk_upsert(
   `bulk_upsert` in a `transaction.atomic` context if you require it to be
   atomic.
 
-  For N existing objects (to update) and M objects to create, this performs
-  N+2 database queries. In comparison, Django's `update_or_create` performs
-  2(N+M) queries. More simply, `bulk_upsert` requires O(N+2) queries where N
-  is the length of expected data set.
+  Existing objects are only saved if at least one of their fields differs
+  from the expected values, so for N changed objects and M objects to create,
+  this performs N+2 database queries. In comparison, Django's
+  `update_or_create` performs 2(N+M) queries. More simply, `bulk_upsert`
+  requires O(N+2) queries where N is the length of expected data set.
+
+  If `version` is given and the model is versioned (see
+  `pdata.models.Versioned`), created and changed objects are tagged with it,
+  while unchanged objects keep their version. Deleted objects, including
+  those deleted along with them by cascades, are recorded as tombstones.
 
   :param q: queryset to retrieve existing objects
   :param hash_data: hash a dictionary representation of an object to a unique
     value (this will generally be some unique value in the object itself)
   :param expected: set of expected objects (represented as dictionaries) to
     upsert
+  :param delete: whether or not to delete existing objects which are not
+    expected
+  :param version: version of the dataset made by the change (see
+    `pdata.versions.reserve`), or None to leave row versions unchanged
+
+  :return: set of unique values for each of: created, updated, unchanged,
+    deleted
+  '''
+  # All of the time is attributed to writing, as the queries dominate it.
+  with metrics.phase('write'):
+    return _bulk_upsert(q, hash_data, expected, delete, version)
 
-  :return: set of unique values for each of: created, updated
+def _bulk_upsert(
+  q: typing.Type[models.query.QuerySet],
+  hash_data: typing.Callable[[typing.Dict[str, typing.Any]], int],
+  expected: typing.Iterable[typing.Dict[str, typing.Any]],
+  delete: bool,
+  version: typing.Optional[int],
+  ) -> typing.Dict[str, typing.Set[str]]:
+  '''
+  Perform the upsert described in `bulk_upsert`.
   '''
+  # Imported here because the models require the Django apps to be loaded,
+  # while this module is imported by the settings.
+  from pdata.models import Versioned
+
   model_t = q.model
+  if version is not None and issubclass(model_t, Versioned):
+    versioned = {'version': version}
+  else:
+    versioned = {}
 
   obj_map = {} # Maps hashes to objects
   dict_map = {} # Maps hashes to dicts, each corresponding to an object.
@@ -78,24 +128,91 @@ def bulk_upsert(
   # Add in the expected values.
   expected_map = {hash_data(d): d for d in expected}
   expected_hashes = frozenset(expected_map.keys())
-  dict_map.update(expected_map)
 
   # Operations to perform, and objects on which to perform them.
-  to_update = expected_hashes & existing_hashes
+  to_update = set()
+  unchanged = set()
   to_create = expected_hashes - existing_hashes
+  to_delete = (existing_hashes - expected_hashes) if delete else frozenset()
+
+  # Update each changed object individually.
+  for o in expected_hashes & existing_hashes:
+    if not _has_changed(model_t, dict_map[o], expected_map[o]):
+      unchanged.add(o)
+      continue
 
-  # Update each object individually.
-  for o in to_update:
     obj = obj_map[o]
-    for k, v in dict_map[o].items():
+    for k, v in dict(expected_map[o], **versioned).items():
       setattr(obj, k, v)
     obj.save()
+    to_update.add(o)
 
   # Bulk insert newly-created objects.
   model_t.objects.bulk_create(
-    map(lambda o: model_t(**dict_map[o]), to_create))
+    map(lambda o: model_t(**expected_map[o], **versioned), to_create))
+
+  # Bulk delete objects which are no longer expected.
+  if to_delete:
+    deleted = model_t.objects.filter(
+      pk__in=[obj_map[o].pk for o in to_delete])
+    if version is None:
+      deleted.delete()
+    else:
+      _delete_versioned(deleted, version)
 
   return {
     'created': to_create,
     'updated': to_update,
+    'unchanged': unchanged,
+    'deleted': to_delete,
     }
+
+def _delete_versioned(q: models.query.QuerySet, version: int) -> None:
+  '''
+  Delete objects, recording a tombstone for each versioned object deleted,
+  including those deleted by cascades.
+
+  :param q: queryset of the objects to delete
+  :param version: version of the dataset made by the deletion
+  '''
+  from pdata.models import Versioned, Tombstone
+
+  collector = Collector(using=router.db_for_write(q.model))
+  collector.collect(q)
+
+  # Objects are either collected, or deleted in bulk by a queryset when
+  # nothing else depends on them.
+  deleted = [(model_t, [obj.pk for obj in objs])
+    for (model_t, objs) in collector.data.items()]
+  deleted.extend((fast.model, list(fast.values_list('pk', flat=True)))
+    for fast in collector.fast_deletes)
+
+  Tombstone.objects.bulk_create(Tombstone(model=model_t._meta.label_lower,
+      object_id=pk, version=version)
+    for (model_t, pks) in deleted if issubclass(model_t, Versioned)
+    for pk in pks)
+  collector.delete()
+
+def _has_changed(
+  model_t: typing.Type[models.Model],
+  existing: typing.Dict[str, typing.Any],
+  expected: typing.Dict[str, typing.Any],
+  ) -> bool:
+  '''
+  Check whether an existing object differs from its expected values. The
+  expected values are converted to their Python types first (i.e. a date
+  string to a `datetime.date`), so that they compare equal to the values
+  loaded from the database.
+
+  :param model_t: model of the object
+  :param existing: field values of the existing object
+  :param expected: expected field values
+
+  :return: whether or not any expected value differs from the existing one
+  '''
+  for k, v in expected.items():
+    field = model_t._meta.get_field(k)
+    if field.to_python(v) != existing[k]:
+      return True
+
+  return False
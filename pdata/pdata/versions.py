@@ -0,0 +1,251 @@
+# pdata/pdata/versions.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Versions of datasets' data, and conditional requests based on
+#              them.
+
+import typing
+import functools
+import threading
+
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from pdata import models
+from pdata.cache import cached_response, response_key
+
+def bump(dataset: str, scopes: typing.Iterable[str] = ()) -> int:
+  '''
+  Bump the version of a dataset, after a change to its data. This should be
+  called in the transaction which makes the change, so that the new version
+  is committed along with it.
+
+  .. code:: python
+
+    with transaction.atomic():
+      ... # Update the term's data.
+      versions.bump('courses', scopes=[str(term.term_id)])
+
+  :param dataset: name of the dataset
+  :param scopes: parts of the dataset which changed (i.e. terms); each of
+    them is set to the new version
+
+  :return: new global version of the dataset
+  '''
+  now = timezone.now()
+
+  with transaction.atomic():
+    latest, _ = (models.DatasetVersion.objects
+      .select_for_update()
+      .get_or_create(dataset=dataset, scope='',
+        defaults={'version': 0, 'modified_at': now}))
+    latest.version += 1
+    latest.modified_at = now
+    latest.save()
+
+    for scope in scopes:
+      models.DatasetVersion.objects.update_or_create(
+        dataset=dataset,
+        scope=scope,
+        defaults={'version': latest.version, 'modified_at': now})
+
+  return latest.version
+
+def reserve(dataset: str) -> int:
+  '''
+  Get the version which the next `bump` of a dataset allocates, so that the
+  rows written before it may be tagged with it (see `pdata.models.Versioned`).
+  The dataset's version is locked until the transaction ends, so no other
+  transaction may allocate it first. As with `bump`, this should be called
+  in the transaction which makes the change.
+
+  :param dataset: name of the dataset
+
+  :return: next version of the dataset
+  '''
+  # The row is created first, as locking a row which does not exist yet
+  # would not keep another transaction from reserving the same version.
+  models.DatasetVersion.objects.get_or_create(dataset=dataset, scope='',
+    defaults={'version': 0, 'modified_at': timezone.now()})
+  latest = (models.DatasetVersion.objects
+    .select_for_update()
+    .get(dataset=dataset, scope=''))
+  return latest.version + 1
+
+def deleted(
+    model_t: typing.Type[models.Versioned],
+    since: int
+    ) -> typing.List[int]:
+  '''
+  Get the rows of a model deleted after a version of its dataset.
+
+  :param model_t: versioned model
+  :param since: version of the dataset
+
+  :return: primary keys of the deleted rows, in the order of their deletion
+  '''
+  return list(models.Tombstone.objects
+    .filter(model=model_t._meta.label_lower, version__gt=since)
+    .order_by('version', 'id')
+    .values_list('object_id', flat=True))
+
+def restore(
+    model_t: typing.Type[models.Versioned],
+    pks: typing.Iterable[int]
+    ) -> None:
+  '''
+  Forget the deletion of rows which were recreated with the same primary
+  keys, so that they are no longer listed as deleted (their recreation is
+  listed instead, by their versions).
+
+  :param model_t: versioned model
+  :param pks: primary keys of the recreated rows
+  '''
+  models.Tombstone.objects.filter(model=model_t._meta.label_lower,
+    object_id__in=list(pks)).delete()
+
+def get(dataset: str, scope: str = '') -> typing.Optional[
+    models.DatasetVersion]:
+  '''
+  Get the current version of a dataset.
+
+  :param dataset: name of the dataset
+  :param scope: part of the dataset (default: the whole dataset)
+
+  :return: version, or None if the dataset (or scope) has never changed
+  '''
+  return (models.DatasetVersion.objects
+    .filter(dataset=dataset, scope=scope)
+    .first())
+
+def etag(version: models.DatasetVersion) -> str:
+  '''
+  Get the entity tag of responses generated from a version of a dataset.
+
+  :param version: version of the dataset
+
+  :return: quoted entity tag, such as '"courses-12"'
+  '''
+  return '"%s-%d"' % (version.dataset, version.version)
+
+def conditional(
+    dataset: str,
+    scope: typing.Callable[[HttpRequest], str] = None,
+    max_age: int = 0,
+    cache: str = None
+    ) -> typing.Callable[[typing.Callable], typing.Callable]:
+  '''
+  Decorate a view whose responses only depend on a dataset's data, so that
+  they are tagged with its version. Responses have ETag and Last-Modified
+  headers, and conditional requests for the current version are answered
+  with 304 (Not Modified) without calling the view. All responses have a
+  Cache-Control header allowing clients to reuse them for `max_age`
+  seconds.
+
+  The version is read before the view's data, so a response is never tagged
+  with a newer version than the data it contains.
+
+  If `cache` is set, successful responses are also cached on the server,
+  keyed on the request's path, query string, and the version (see
+  `pdata.cache.cached_response`). Changes to the data bump the version, so
+  cached responses are never served once they are out of date.
+
+  .. code:: python
+
+    @versions.conditional('courses', max_age=60)
+    def view(request):
+      ...
+
+  :param dataset: name of the dataset
+  :param scope: function returning the part of the dataset which a request
+    depends on (default: the whole dataset)
+  :param max_age: seconds for which clients may reuse responses
+  :param cache: name of the cache (in `settings.CACHES`) to cache responses
+    in (default: responses are not cached)
+
+  :return: view decorator
+  '''
+  def decorator(view: typing.Callable) -> typing.Callable:
+    @functools.wraps(view)
+    def wrapper(request: HttpRequest, *args, **kwargs) -> HttpResponse:
+      current = get(dataset, scope(request) if scope else '')
+
+      if current is None:
+        response = view(request, *args, **kwargs)
+      else:
+        compute = view
+        if cache is not None and request.method in ('GET', 'HEAD'):
+          key = response_key(request, '%s:%s' % (etag(current).strip('"'),
+            current.modified_at.timestamp()))
+          compute = functools.partial(cached_response, cache, key, view)
+
+        response = condition(
+          etag_func=lambda *args, **kwargs: etag(current),
+          last_modified_func=lambda *args, **kwargs: current.modified_at,
+          )(compute)(request, *args, **kwargs)
+
+      if request.method in ('GET', 'HEAD'):
+        patch_cache_control(response, public=True, max_age=max_age)
+      return response
+
+    return wrapper
+  return decorator
+
+class VersionedIndex(object):
+  '''
+  In-process index of a dataset's data (such as a search index), which is
+  built on first use and rebuilt once the dataset changes. An index may be
+  built separately for each scope of the dataset (i.e. each term), in which
+  case it is only rebuilt when that scope changes.
+
+  .. code:: python
+
+    def build(scope: str) -> dict:
+      ...
+
+    index = VersionedIndex('courses', build)
+    index.get().lookup(...)
+
+  :param dataset: name of the dataset
+  :param build: function building the index of a scope ('' for the whole
+    dataset)
+  '''
+  def __init__(self,
+      dataset: str,
+      build: typing.Callable[[str], typing.Any]
+      ) -> None:
+    self.dataset = dataset
+    self.build = build
+    self._lock = threading.Lock()
+    # Map of scope to (version key, index).
+    self._indexes = {}
+
+  def get(self, scope: str = '') -> typing.Any:
+    '''
+    Get the index of the current version of a scope, building it if needed.
+    Concurrent callers wait for a single build.
+
+    :param scope: scope of the dataset (default: the whole dataset)
+
+    :return: index
+    '''
+    current = get(self.dataset, scope)
+    key = (current.version, current.modified_at) if current else None
+
+    with self._lock:
+      built = self._indexes.get(scope)
+      if built is None or built[0] != key:
+        built = (key, self.build(scope))
+        self._indexes[scope] = built
+      return built[1]
+
+  def clear(self) -> None:
+    '''
+    Discard all built indexes.
+    '''
+    with self._lock:
+      self._indexes.clear()
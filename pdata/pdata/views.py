@@ -0,0 +1,191 @@
+# pdata/pdata/views.py
+# pdata
+# Author: Rushy Panchal
+# Date: October 19th, 2026
+# Description: Metrics endpoints for data provider task runs.
+
+import typing
+import json
+
+from django.db.models import Count
+from django.http import HttpRequest, HttpResponse, JsonResponse
+from django.views.decorators.http import require_GET
+
+from pdata import metrics, models
+
+#: Content type of the Prometheus text exposition format.
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+#: Maximum number of runs returned by the history endpoint.
+MAX_RUNS = 1000
+
+def _format_labels(labels: typing.Iterable[typing.Tuple[str, typing.Any]]
+    ) -> str:
+  '''
+  Format metric labels in the Prometheus text format.
+
+  :param labels: (label, value) pairs
+
+  :return: formatted labels, such as '{source="courses"}'
+  '''
+  escaped = ('%s="%s"' % (k, str(v)
+      .replace('\\', '\\\\')
+      .replace('"', '\\"')
+      .replace('\n', '\\n'))
+    for k, v in labels)
+  return '{%s}' % ','.join(escaped)
+
+class _Exposition(object):
+  '''
+  Builds a response in the Prometheus text format.
+  '''
+  def __init__(self) -> None:
+    self.lines = []
+
+  def metric(self, name: str, kind: str, description: str) -> None:
+    '''
+    Start a new metric.
+
+    :param name: name of the metric
+    :param kind: type of the metric (i.e. 'counter' or 'gauge')
+    :param description: help text of the metric
+    '''
+    self.lines.append('# HELP %s %s' % (name, description))
+    self.lines.append('# TYPE %s %s' % (name, kind))
+
+  def sample(self,
+      name: str,
+      labels: typing.Iterable[typing.Tuple[str, typing.Any]],
+      value: float
+      ) -> None:
+    '''
+    Add a sample of the current metric.
+
+    :param name: name of the sample (generally, that of the metric)
+    :param labels: (label, value) pairs of the sample
+    :param value: value of the sample
+    '''
+    self.lines.append('%s%s %s' % (name, _format_labels(labels), value))
+
+  def render(self) -> str:
+    return '\n'.join(self.lines) + '\n'
+
+@require_GET
+def prometheus_metrics(request: HttpRequest) -> HttpResponse:
+  '''
+  Expose metrics of task runs, as well as this process's counters, in the
+  Prometheus text format.
+
+  The run metrics are computed from all `TaskRun`s which are retained, and
+  from the latest successful run of each task. Since old runs are pruned,
+  the number of retained runs may go down, so it is a gauge rather than a
+  counter.
+  '''
+  exposition = _Exposition()
+  outcomes = dict(models.TaskRun._meta.get_field('outcome').choices)
+
+  exposition.metric('pdata_task_runs', 'gauge',
+    'Number of retained task runs, by outcome.')
+  runs = (models.TaskRun.objects
+    .values_list('source', 'task', 'scope', 'outcome')
+    .annotate(count=Count('id'))
+    .order_by('source', 'task', 'scope', 'outcome'))
+  for (source, task, scope, outcome, count) in runs:
+    exposition.sample('pdata_task_runs', (
+      ('source', source),
+      ('task', task),
+      ('scope', scope),
+      ('outcome', outcomes[outcome].lower())), count)
+
+  succeeded = (models.TaskRun.objects
+    .filter(outcome=models.TaskRun.OUTCOME_SUCCESS)
+    .values_list('source', 'task', 'scope')
+    .distinct()
+    .order_by('source', 'task', 'scope'))
+  latest = [models.TaskRun.objects
+      .filter(source=source, task=task, scope=scope,
+        outcome=models.TaskRun.OUTCOME_SUCCESS)
+      .latest('started_at')
+    for (source, task, scope) in succeeded]
+
+  exposition.metric('pdata_task_last_success_timestamp_seconds', 'gauge',
+    'Start time of the latest successful run of each task.')
+  for run in latest:
+    exposition.sample('pdata_task_last_success_timestamp_seconds',
+      _run_labels(run), run.started_at.timestamp())
+
+  exposition.metric('pdata_task_last_phase_seconds', 'gauge',
+    'Time spent in each phase of the latest successful run of each task.')
+  for run in latest:
+    for phase, seconds in (('fetch', run.fetch_time),
+        ('transform', run.transform_time), ('write', run.write_time),
+        ('total', run.duration)):
+      exposition.sample('pdata_task_last_phase_seconds', _run_labels(run) + (
+        ('phase', phase),), seconds)
+
+  exposition.metric('pdata_task_last_bytes_downloaded', 'gauge',
+    'Bytes downloaded by the latest successful run of each task.')
+  for run in latest:
+    exposition.sample('pdata_task_last_bytes_downloaded', _run_labels(run),
+      run.bytes_downloaded)
+
+  exposition.metric('pdata_task_last_changes', 'gauge',
+    'Objects changed by the latest successful run of each task.')
+  for run in latest:
+    for model, counts in sorted(json.loads(run.changes).items()):
+      for operation, count in sorted(counts.items()):
+        exposition.sample('pdata_task_last_changes', _run_labels(run) + (
+          ('model', model), ('operation', operation)), count)
+
+  counters = metrics.counters()
+  for name in sorted(set(name for (name, _) in counters)):
+    exposition.metric(name, 'counter',
+      'Counted by this process since it started.')
+    for (counter, labels), value in sorted(counters.items()):
+      if counter == name:
+        exposition.sample(name, labels, value)
+
+  return HttpResponse(exposition.render(),
+    content_type=PROMETHEUS_CONTENT_TYPE)
+
+def _run_labels(run: models.TaskRun) -> typing.Tuple[typing.Tuple[str, str]]:
+  '''
+  Get the labels identifying a run's task.
+
+  :param run: task run
+
+  :return: (label, value) pairs
+  '''
+  return (('source', run.source), ('task', run.task), ('scope', run.scope))
+
+@require_GET
+def run_history(request: HttpRequest) -> JsonResponse:
+  '''
+  List task runs and their metrics, latest first. Runs may be filtered with
+  the 'source' and 'task' query parameters, and the number of runs is set
+  with 'limit' (default: 100, at most `MAX_RUNS`).
+  '''
+  runs = models.TaskRun.objects.order_by('-started_at')
+  for param in ('source', 'task'):
+    if param in request.GET:
+      runs = runs.filter(**{param: request.GET[param]})
+
+  try:
+    limit = min(int(request.GET.get('limit', 100)), MAX_RUNS)
+  except ValueError:
+    return JsonResponse({'error': 'limit must be an integer'}, status=400)
+
+  return JsonResponse({'runs': [{
+      'source': run.source,
+      'task': run.task,
+      'scope': run.scope,
+      'outcome': run.get_outcome_display().lower(),
+      'error': run.error,
+      'started_at': run.started_at.isoformat(),
+      'duration': run.duration,
+      'fetch_time': run.fetch_time,
+      'transform_time': run.transform_time,
+      'write_time': run.write_time,
+      'bytes_downloaded': run.bytes_downloaded,
+      'changes': json.loads(run.changes),
+      } for run in runs[:max(limit, 0)]]})